@@ -21,6 +21,7 @@ from sentry import analytics, features, options
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.actor import ActorSerializer, ActorSerializerResponse
 from sentry.db.models.query import create_or_update
+from sentry.grouping.ingest import grouphash_cache
 from sentry.hybridcloud.rpc import coerce_id_from
 from sentry.integrations.tasks.kick_off_status_syncs import kick_off_status_syncs
 from sentry.issues.grouptype import GroupCategory
@@ -108,9 +109,10 @@ def handle_discard(
             else:
                 groups_to_delete[group.project_id].append(group)
 
-                GroupHash.objects.filter(group=group).update(
-                    group=None, group_tombstone_id=tombstone.id
-                )
+                with grouphash_cache.invalidating(GroupHash.objects.filter(group=group)):
+                    GroupHash.objects.filter(group=group).update(
+                        group=None, group_tombstone_id=tombstone.id
+                    )
 
     for project in projects:
         delete_group_list(
@@ -0,0 +1,146 @@
+"""
+Concurrent loading of the data that serializers need for `get_attrs`.
+
+Serializers like `StreamGroupSerializerSnuba` fetch several independent things from Snuba (seen
+stats, the unhandled flag, TSDB stats...) and used to do so one after the other. `AttributeLoader`
+runs each fetch as soon as the fetches it depends on are done, in a thread pool shared by the
+process, while the calling thread goes on with its Postgres queries. The latency of `get_attrs`
+then approaches that of its slowest fetch rather than the sum of all of them.
+
+Fetches must not query Postgres themselves: serializers resolve whatever they need from it before
+adding them. The lookups Snuba queries still make (projects, environment names...) read rows which
+aren't changed by the request, with connections of the pool's threads that are closed once each
+fetch is done. Those connections can't see what the calling thread hasn't committed, so loading
+inside a transaction is never concurrent.
+
+Loading is concurrent only when ``api.serializers.concurrent-attrs.enabled`` is set. Otherwise
+each fetch runs in the calling thread as soon as it is added, just like it used to.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import sentry_sdk
+import sentry_sdk.scope
+from django.db import connections
+
+from sentry import options
+
+_loader_pool = ThreadPoolExecutor(max_workers=20, thread_name_prefix="attribute-loader")
+
+atexit.register(_loader_pool.shutdown, False)
+
+
+class AttributeLoadTimeout(Exception):
+    pass
+
+
+def _in_transaction() -> bool:
+    return any(
+        connection.in_atomic_block for connection in connections.all(initialized_only=True)
+    )
+
+
+class AttributeLoader:
+    def __init__(self, timeout: float | None = None) -> None:
+        if timeout is None:
+            timeout = options.get("api.serializers.concurrent-attrs.timeout-seconds")
+        self.deadline = time.monotonic() + timeout
+        self.concurrent = (
+            options.get("api.serializers.concurrent-attrs.enabled") and not _in_transaction()
+        )
+        self._futures: dict[str, Future[Any]] = {}
+
+    def add(self, key: str, func: Callable[..., Any], depends_on: Sequence[str] = ()) -> None:
+        """
+        Loads `key` by calling `func` with the values of the keys it `depends_on`, as positional
+        arguments, once they are loaded. If any of those fails to load, `key` fails the same way.
+        """
+        assert key not in self._futures, f"{key} is already being loaded"
+        dependencies = [self._futures[dependency] for dependency in depends_on]
+        future: Future[Any] = Future()
+        self._futures[key] = future
+
+        if not self.concurrent:
+            self._run(future, key, func, dependencies)
+            return
+
+        isolation_scope = sentry_sdk.get_isolation_scope()
+        current_scope = sentry_sdk.get_current_scope()
+
+        def submit() -> None:
+            _loader_pool.submit(
+                self._run_in_scope,
+                isolation_scope,
+                current_scope,
+                future,
+                key,
+                func,
+                dependencies,
+            )
+
+        pending = [dependency for dependency in dependencies if not dependency.done()]
+        if not pending:
+            submit()
+            return
+
+        # Submit once the last dependency is done, from whichever thread completes it
+        lock = threading.Lock()
+        remaining = [len(pending)]
+
+        def on_dependency_done(_: Future[Any]) -> None:
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            submit()
+
+        for dependency in pending:
+            dependency.add_done_callback(on_dependency_done)
+
+    def get(self, key: str) -> Any:
+        """
+        Returns the value of `key`, waiting for it to be loaded. Raises `AttributeLoadTimeout` if
+        that doesn't happen before the deadline of the loader.
+        """
+        try:
+            return self._futures[key].result(max(self.deadline - time.monotonic(), 0))
+        except TimeoutError:
+            raise AttributeLoadTimeout(f"Loading {key} exceeded the deadline")
+
+    @staticmethod
+    def _run(
+        future: Future[Any], key: str, func: Callable[..., Any], dependencies: list[Future[Any]]
+    ) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            args = [dependency.result() for dependency in dependencies]
+            with sentry_sdk.start_span(op="serialize.load_attr", name=key):
+                future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+
+    @classmethod
+    def _run_in_scope(
+        cls,
+        isolation_scope: sentry_sdk.Scope,
+        current_scope: sentry_sdk.Scope,
+        future: Future[Any],
+        key: str,
+        func: Callable[..., Any],
+        dependencies: list[Future[Any]],
+    ) -> None:
+        try:
+            with sentry_sdk.scope.use_isolation_scope(isolation_scope):
+                with sentry_sdk.scope.use_scope(current_scope):
+                    cls._run(future, key, func, dependencies)
+        finally:
+            # Django opens a connection per thread, which would otherwise linger in the pool
+            connections.close_all()
@@ -0,0 +1,131 @@
+"""
+Batched and memoized lookups shared by all the serializers involved in serializing a response.
+
+`serialize` batches the lookups of a serializer across the objects it serializes, but not across
+serializers: nested serializers (users, teams...) make their own queries, often once per parent
+object, and the same users are fetched again by every serializer that shows them. A `DataLoader`
+instead collects the keys that serializers ask for and resolves them in as few ``IN`` queries as
+possible, remembering the results for the rest of the scope.
+
+The outermost call to `serialize` opens a scope, which nested calls share. Endpoints which call
+`serialize` several times can share one scope between all of them with `loader_scope`. Outside of
+any scope, loaders still batch but remember nothing.
+
+Parent serializers can `prime` the keys their children will need from `get_attrs`, so that the
+first child to `load` them fetches all of them at once::
+
+    def get_attrs(self, item_list, user, **kwargs):
+        get_user_loader().prime(item.owner_id for item in item_list)
+        ...
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+from collections.abc import Callable, Generator, Hashable, Iterable, Mapping
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from sentry.utils import metrics
+
+if TYPE_CHECKING:
+    from sentry.models.team import Team
+    from sentry.users.services.user.model import RpcUser
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_loaders: contextvars.ContextVar[dict[str, DataLoader[Any, Any]] | None] = contextvars.ContextVar(
+    "serializer_loaders", default=None
+)
+
+
+class DataLoader(Generic[K, V]):
+    def __init__(self, name: str, batch_load: Callable[[list[K]], Mapping[K, V]]) -> None:
+        self.name = name
+        self.batch_load = batch_load
+        # Keys which don't exist are remembered as `None`
+        self._cache: dict[K, V | None] = {}
+        self._pending: set[K] = set()
+
+    def prime(self, keys: Iterable[K]) -> None:
+        """
+        Makes the next lookup also fetch `keys`, unless they are already known.
+        """
+        self._pending.update(key for key in keys if key not in self._cache)
+
+    def load_many(self, keys: Iterable[K]) -> dict[K, V]:
+        """
+        Returns the values of those of `keys` which exist, fetching the ones which aren't known yet
+        together with all the primed ones.
+        """
+        keys = list(keys)
+        self.prime(keys)
+        if self._pending:
+            to_load = list(self._pending)
+            self._pending.clear()
+            loaded = self.batch_load(to_load)
+            for key in to_load:
+                self._cache[key] = loaded.get(key)
+            metrics.incr(
+                "api.serializers.dataloader.miss", amount=len(to_load), tags={"name": self.name}
+            )
+
+        rv = {}
+        for key in keys:
+            value = self._cache[key]
+            if value is not None:
+                rv[key] = value
+        return rv
+
+    def load(self, key: K) -> V | None:
+        return self.load_many([key]).get(key)
+
+
+@contextlib.contextmanager
+def loader_scope() -> Generator[None, None, None]:
+    """
+    Shares the loaders and everything they've loaded until the outermost scope is exited.
+    """
+    if _loaders.get() is not None:
+        yield
+        return
+
+    token = _loaders.set({})
+    try:
+        yield
+    finally:
+        _loaders.reset(token)
+
+
+def get_loader(name: str, batch_load: Callable[[list[K]], Mapping[K, V]]) -> DataLoader[K, V]:
+    """
+    Returns the loader called `name` of the current scope, which resolves its keys with
+    `batch_load`.
+    """
+    loaders = _loaders.get()
+    if loaders is None:
+        return DataLoader(name, batch_load)
+    if name not in loaders:
+        loaders[name] = DataLoader(name, batch_load)
+    return loaders[name]
+
+
+def _load_users(user_ids: list[int]) -> dict[int, RpcUser]:
+    from sentry.users.services.user.service import user_service
+
+    return {user.id: user for user in user_service.get_many_by_id(ids=user_ids)}
+
+
+def _load_teams(team_ids: list[int]) -> dict[int, Team]:
+    from sentry.models.team import Team
+
+    return Team.objects.in_bulk(team_ids)
+
+
+def get_user_loader() -> DataLoader[int, RpcUser]:
+    return get_loader("users", _load_users)
+
+
+def get_team_loader() -> DataLoader[int, Team]:
+    return get_loader("teams", _load_teams)
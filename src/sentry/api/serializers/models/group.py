@@ -6,7 +6,7 @@ from abc import ABC, abstractmethod
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timedelta, timezone
-from typing import Any, Protocol, TypedDict, TypeGuard
+from typing import Any, NamedTuple, Protocol, TypedDict, TypeGuard
 
 import sentry_sdk
 from django.conf import settings
@@ -15,6 +15,8 @@ from django.db.models import Min, prefetch_related_objects
 
 from sentry import features, tagstore
 from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers.attribute_loader import AttributeLoader
+from sentry.api.serializers.dataloader import get_team_loader, get_user_loader
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.api.serializers.models.plugin import is_plugin_deprecated
 from sentry.app import env
@@ -156,6 +158,21 @@ def is_seen_stats(o: object) -> TypeGuard[SeenStats]:
     return isinstance(o, dict) and "times_seen" in o
 
 
+class SeenStatsParams(NamedTuple):
+    """
+    What the seen stats fetches need from Postgres, resolved before they are added to the
+    `AttributeLoader` so that they don't query Postgres from its threads.
+    """
+
+    organization_id: int
+    # The environment of `GroupSerializer`, unless `environment_missing`
+    environment: Environment | None = None
+    environment_missing: bool = False
+    # The first time each group was seen in the environments of `GroupSerializerSnuba`, if its
+    # seen stats don't get it from Snuba
+    environment_first_seen: Mapping[int, datetime] | None = None
+
+
 class GroupSerializerBase(Serializer, ABC):
     def __init__(
         self,
@@ -177,20 +194,52 @@ class GroupSerializerBase(Serializer, ABC):
             if g.user_id:
                 all_user_ids[g.user_id].add(g.group_id)
 
-        for team in Team.objects.filter(id__in=all_team_ids.keys()):
+        for team in get_team_loader().load_many(all_team_ids.keys()).values():
             for group_id in all_team_ids[team.id]:
                 result[group_id] = team
 
-        user_ids = list(all_user_ids.keys())
-        if user_ids:
-            for user in user_service.get_many_by_id(ids=user_ids):
-                for group_id in all_user_ids[user.id]:
-                    result[group_id] = user
+        for user in get_user_loader().load_many(all_user_ids.keys()).values():
+            for group_id in all_user_ids[user.id]:
+                result[group_id] = user
 
         return result
 
+    def _create_attr_loader(
+        self, item_list: Sequence[Group], user: User | RpcUser | AnonymousUser
+    ) -> AttributeLoader:
+        # The fetches must not load projects or organizations from the loader's threads
+        prefetch_related_objects(item_list, "project__organization")
+        attr_loader = AttributeLoader()
+        self._add_attr_loads(attr_loader, item_list, user)
+        return attr_loader
+
+    def _add_attr_loads(
+        self,
+        attr_loader: AttributeLoader,
+        item_list: Sequence[Group],
+        user: User | RpcUser | AnonymousUser,
+    ) -> None:
+        """
+        Adds the fetches of `get_attrs` which don't need its Postgres queries to `attr_loader`, so
+        that they run while those are made. Whatever they need from Postgres is resolved here.
+        """
+        organization_id = item_list[0].project.organization_id if item_list else None
+        seen_stats_params = self._get_seen_stats_params(item_list)
+        attr_loader.add(
+            "seen_stats", lambda: self._get_seen_stats(item_list, user, seen_stats_params)
+        )
+        attr_loader.add(
+            "snuba_stats",
+            lambda seen_stats: self._get_group_snuba_stats(item_list, seen_stats, organization_id),
+            depends_on=["seen_stats"],
+        )
+
     def get_attrs(
-        self, item_list: Sequence[Group], user: User | RpcUser | AnonymousUser, **kwargs: Any
+        self,
+        item_list: Sequence[Group],
+        user: User | RpcUser | AnonymousUser,
+        attr_loader: AttributeLoader | None = None,
+        **kwargs: Any,
     ) -> dict[Group, dict[str, Any]]:
         GroupMeta.objects.populate_cache(item_list)
 
@@ -198,6 +247,9 @@ class GroupSerializerBase(Serializer, ABC):
         # making unnecessary queries.
         prefetch_related_objects(item_list, "project__organization")
 
+        if attr_loader is None:
+            attr_loader = self._create_attr_loader(item_list, user)
+
         if user.is_authenticated and item_list:
             bookmarks = set(
                 GroupBookmark.objects.filter(user_id=user.id, group__in=item_list).values_list(
@@ -242,7 +294,7 @@ class GroupSerializerBase(Serializer, ABC):
             GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
         )
 
-        seen_stats = self._get_seen_stats(item_list, user)
+        seen_stats = attr_loader.get("seen_stats")
 
         organization_id_list = list({item.project.organization_id for item in item_list})
         # if no groups, then we can't proceed but this seems to be a valid use case
@@ -270,7 +322,7 @@ class GroupSerializerBase(Serializer, ABC):
         ):
             merge_list_dictionaries(annotations_by_group_id, annotations_by_group)
 
-        snuba_stats = self._get_group_snuba_stats(item_list, seen_stats)
+        snuba_stats = attr_loader.get("snuba_stats")
 
         result = {}
         for item in item_list:
@@ -376,13 +428,13 @@ class GroupSerializerBase(Serializer, ABC):
 
     @abstractmethod
     def _seen_stats_error(
-        self, error_issue_list: Sequence[Group], user
+        self, error_issue_list: Sequence[Group], user, params: SeenStatsParams
     ) -> Mapping[Group, SeenStats]:
         pass
 
     @abstractmethod
     def _seen_stats_generic(
-        self, generic_issue_list: Sequence[Group], user
+        self, generic_issue_list: Sequence[Group], user, params: SeenStatsParams
     ) -> Mapping[Group, SeenStats]:
         pass
 
@@ -458,7 +510,14 @@ class GroupSerializerBase(Serializer, ABC):
             status_label = "unresolved"
         return status_details, status_label
 
-    def _get_seen_stats(self, item_list: Sequence[Group], user) -> Mapping[Group, SeenStats] | None:
+    def _get_seen_stats_params(self, item_list: Sequence[Group]) -> SeenStatsParams | None:
+        if self._collapse("stats") or not item_list:
+            return None
+        return SeenStatsParams(organization_id=item_list[0].project.organization_id)
+
+    def _get_seen_stats(
+        self, item_list: Sequence[Group], user, params: SeenStatsParams | None
+    ) -> Mapping[Group, SeenStats] | None:
         """
         Returns a dictionary keyed by item that includes:
             - times_seen
@@ -466,10 +525,7 @@ class GroupSerializerBase(Serializer, ABC):
             - last_seen
             - user_count
         """
-        if self._collapse("stats"):
-            return None
-
-        if not item_list:
+        if params is None:
             return None
 
         # partition the item_list by type
@@ -479,16 +535,21 @@ class GroupSerializerBase(Serializer, ABC):
         ]
 
         # bulk query for the seen_stats by type
-        error_stats = (self._seen_stats_error(error_issues, user) if error_issues else {}) or {}
+        error_stats = (
+            self._seen_stats_error(error_issues, user, params) if error_issues else {}
+        ) or {}
         generic_stats = (
-            self._seen_stats_generic(generic_issues, user) if generic_issues else {}
+            self._seen_stats_generic(generic_issues, user, params) if generic_issues else {}
         ) or {}
         agg_stats = {**error_stats, **generic_stats}
         # combine results back
         return {group: agg_stats[group] for group in item_list if group in agg_stats}
 
     def _get_group_snuba_stats(
-        self, item_list: Sequence[Group], seen_stats: Mapping[Group, SeenStats] | None
+        self,
+        item_list: Sequence[Group],
+        seen_stats: Mapping[Group, SeenStats] | None,
+        organization_id: int | None,
     ):
         if self._collapse("unhandled") and len(item_list) > 0:
             return None
@@ -526,9 +587,7 @@ class GroupSerializerBase(Serializer, ABC):
                 start=start,
                 orderby="group_id",
                 referrer="group.unhandled-flag",
-                tenant_ids=(
-                    {"organization_id": item_list[0].project.organization_id} if item_list else None
-                ),
+                tenant_ids={"organization_id": organization_id} if organization_id else None,
             )
             for x in rv["data"]:
                 unhandled[x["group_id"]] = x["unhandled"]
@@ -794,18 +853,29 @@ class GroupSerializer(GroupSerializerBase):
         GroupSerializerBase.__init__(self, collapse=collapse, expand=expand)
         self.environment_func = environment_func if environment_func is not None else lambda: None
 
-    def _seen_stats_error(self, item_list, user) -> Mapping[Group, SeenStats]:
+    def _get_seen_stats_params(self, item_list: Sequence[Group]) -> SeenStatsParams | None:
+        params = super()._get_seen_stats_params(item_list)
+        if params is None:
+            return None
+        try:
+            return params._replace(environment=self.environment_func())
+        except Environment.DoesNotExist:
+            return params._replace(environment_missing=True)
+
+    def _seen_stats_error(self, item_list, user, params) -> Mapping[Group, SeenStats]:
         return self.__seen_stats_impl(
             item_list,
+            params,
             tagstore.backend.get_groups_user_counts,
             tagstore.backend.get_group_list_tag_value,
         )
 
     def _seen_stats_generic(
-        self, generic_issue_list: Sequence[Group], user
+        self, generic_issue_list: Sequence[Group], user, params: SeenStatsParams
     ) -> Mapping[Group, SeenStats]:
         return self.__seen_stats_impl(
             generic_issue_list,
+            params,
             tagstore.backend.get_generic_groups_user_counts,
             tagstore.backend.get_generic_group_list_tag_value,
         )
@@ -813,22 +883,22 @@ class GroupSerializer(GroupSerializerBase):
     def __seen_stats_impl(
         self,
         issue_list: Sequence[Group],
+        params: SeenStatsParams,
         user_counts_func: _GroupUserCountsFunc,
         environment_seen_stats_func: _EnvironmentSeenStatsFunc,
     ) -> Mapping[Group, SeenStats]:
         if not issue_list:
             return {}
-        try:
-            environment = self.environment_func()
-        except Environment.DoesNotExist:
+        if params.environment_missing:
             return {
                 item: {"times_seen": 0, "first_seen": None, "last_seen": None, "user_count": 0}
                 for item in issue_list
             }
 
+        environment = params.environment
         project_id = issue_list[0].project_id
         item_ids = [g.id for g in issue_list]
-        tenant_ids = {"organization_id": issue_list[0].project.organization_id}
+        tenant_ids = {"organization_id": params.organization_id}
         user_counts: Mapping[int, int] = user_counts_func(
             [project_id],
             item_ids,
@@ -1022,8 +1092,31 @@ class GroupSerializerSnuba(GroupSerializerBase):
                         conditions.append(new_condition)
         self.conditions = conditions
 
+    def _uses_environment_first_seen(self) -> bool:
+        """
+        Whether the seen stats take the first seen times of the environments from Postgres rather
+        than from Snuba.
+        """
+        return not (self.start or self.end or self.conditions)
+
+    def _get_seen_stats_params(self, item_list: Sequence[Group]) -> SeenStatsParams | None:
+        params = super()._get_seen_stats_params(item_list)
+        if params is None or not self.environment_ids or not self._uses_environment_first_seen():
+            return params
+        return params._replace(
+            environment_first_seen={
+                ge["group_id"]: ge["first_seen__min"]
+                for ge in GroupEnvironment.objects.filter(
+                    group_id__in=[item.id for item in item_list],
+                    environment_id__in=self.environment_ids,
+                )
+                .values("group_id")
+                .annotate(Min("first_seen"))
+            }
+        )
+
     def _seen_stats_error(
-        self, error_issue_list: Sequence[Group], user
+        self, error_issue_list: Sequence[Group], user, params: SeenStatsParams
     ) -> Mapping[Group, SeenStats]:
         return self._parse_seen_stats_results(
             self._execute_error_seen_stats_query(
@@ -1032,14 +1125,15 @@ class GroupSerializerSnuba(GroupSerializerBase):
                 end=self.end,
                 conditions=self.conditions,
                 environment_ids=self.environment_ids,
+                organization_id=params.organization_id,
             ),
             error_issue_list,
             bool(self.start or self.end or self.conditions),
-            self.environment_ids,
+            params.environment_first_seen,
         )
 
     def _seen_stats_generic(
-        self, generic_issue_list: Sequence[Group], user
+        self, generic_issue_list: Sequence[Group], user, params: SeenStatsParams
     ) -> Mapping[Group, SeenStats]:
         return self._parse_seen_stats_results(
             self._execute_generic_seen_stats_query(
@@ -1048,15 +1142,21 @@ class GroupSerializerSnuba(GroupSerializerBase):
                 end=self.end,
                 conditions=self.conditions,
                 environment_ids=self.environment_ids,
+                organization_id=params.organization_id,
             ),
             generic_issue_list,
             bool(self.start or self.end or self.conditions),
-            self.environment_ids,
+            params.environment_first_seen,
         )
 
     @staticmethod
     def _execute_error_seen_stats_query(
-        item_list, start=None, end=None, conditions=None, environment_ids=None
+        item_list,
+        start=None,
+        end=None,
+        conditions=None,
+        environment_ids=None,
+        organization_id=None,
     ):
         project_ids = list({item.project_id for item in item_list})
         group_ids = [item.id for item in item_list]
@@ -1079,14 +1179,17 @@ class GroupSerializerSnuba(GroupSerializerBase):
             filter_keys=filters,
             aggregations=aggregations,
             referrer="serializers.GroupSerializerSnuba._execute_error_seen_stats_query",
-            tenant_ids=(
-                {"organization_id": item_list[0].project.organization_id} if item_list else None
-            ),
+            tenant_ids={"organization_id": organization_id} if organization_id else None,
         )
 
     @staticmethod
     def _execute_generic_seen_stats_query(
-        item_list, start=None, end=None, conditions=None, environment_ids=None
+        item_list,
+        start=None,
+        end=None,
+        conditions=None,
+        environment_ids=None,
+        organization_id=None,
     ):
         project_ids = list({item.project_id for item in item_list})
         group_ids = [item.id for item in item_list]
@@ -1108,14 +1211,12 @@ class GroupSerializerSnuba(GroupSerializerBase):
             filter_keys=filters,
             aggregations=aggregations,
             referrer="serializers.GroupSerializerSnuba._execute_generic_seen_stats_query",
-            tenant_ids=(
-                {"organization_id": item_list[0].project.organization_id} if item_list else None
-            ),
+            tenant_ids={"organization_id": organization_id} if organization_id else None,
         )
 
     @staticmethod
     def _parse_seen_stats_results(
-        result, item_list, use_result_first_seen_times_seen, environment_ids=None
+        result, item_list, use_result_first_seen_times_seen, environment_first_seen=None
     ):
         seen_data = {
             issue["group_id"]: fix_tag_value_data(
@@ -1129,16 +1230,8 @@ class GroupSerializerSnuba(GroupSerializerBase):
             first_seen = {item_id: value["first_seen"] for item_id, value in seen_data.items()}
             times_seen = {item_id: value["times_seen"] for item_id, value in seen_data.items()}
         else:
-            if environment_ids:
-                first_seen = {
-                    ge["group_id"]: ge["first_seen__min"]
-                    for ge in GroupEnvironment.objects.filter(
-                        group_id__in=[item.id for item in item_list],
-                        environment_id__in=environment_ids,
-                    )
-                    .values("group_id")
-                    .annotate(Min("first_seen"))
-                }
+            if environment_first_seen is not None:
+                first_seen = environment_first_seen
             else:
                 first_seen = {item.id: item.first_seen for item in item_list}
             times_seen = {item.id: item.times_seen for item in item_list}
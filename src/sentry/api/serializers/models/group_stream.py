@@ -11,6 +11,7 @@ from django.utils import timezone
 
 from sentry import features, release_health, tsdb
 from sentry.api.serializers import serialize
+from sentry.api.serializers.attribute_loader import AttributeLoader
 from sentry.api.serializers.models.group import (
     BaseGroupSerializerResponse,
     GroupAnnotation,
@@ -19,6 +20,7 @@ from sentry.api.serializers.models.group import (
     GroupSerializerSnuba,
     GroupStatusDetailsResponseOptional,
     SeenStats,
+    SeenStatsParams,
     is_seen_stats,
     snuba_tsdb,
 )
@@ -258,6 +260,7 @@ class _SeenStatsFunc(Protocol):
         end=None,
         conditions=None,
         environment_ids=None,
+        organization_id=None,
     ) -> Mapping[str, Any]: ...
 
 
@@ -348,16 +351,44 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
         self.stats_period_start = stats_period_start
         self.stats_period_end = stats_period_end
 
+    def _add_attr_loads(
+        self,
+        attr_loader: AttributeLoader,
+        item_list: Sequence[Group],
+        user: User | RpcUser | AnonymousUser,
+    ) -> None:
+        super()._add_attr_loads(attr_loader, item_list, user)
+
+        if self.stats_period and not self._collapse("stats"):
+            partial_get_stats = functools.partial(
+                self.get_stats,
+                item_list=item_list,
+                user=user,
+                stats_query_args=GroupStatsQueryArgs(
+                    self.stats_period, self.stats_period_start, self.stats_period_end
+                ),
+                environment_ids=self.environment_ids,
+            )
+            attr_loader.add("stats", partial_get_stats)
+            if self.conditions and not self._collapse("filtered"):
+                attr_loader.add(
+                    "filtered_stats", lambda: partial_get_stats(conditions=self.conditions)
+                )
+
     def get_attrs(
         self,
         item_list: Sequence[Group],
         user: User | RpcUser | AnonymousUser,
+        attr_loader: AttributeLoader | None = None,
         **kwargs: Any,
     ) -> dict[Group, dict[str, Any]]:
+        if attr_loader is None:
+            attr_loader = self._create_attr_loader(item_list, user)
+
         if not self._collapse("base"):
-            attrs = super().get_attrs(item_list, user)
+            attrs = super().get_attrs(item_list, user, attr_loader=attr_loader)
         else:
-            seen_stats = self._get_seen_stats(item_list, user)
+            seen_stats = attr_loader.get("seen_stats")
 
             attrs = {item: {} for item in item_list}
             if seen_stats is not None:
@@ -366,7 +397,7 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
                         attrs[item].update(stats_dct)
 
             if len(item_list) > 0:
-                unhandled_stats = self._get_group_snuba_stats(item_list, seen_stats)
+                unhandled_stats = attr_loader.get("snuba_stats")
 
                 if unhandled_stats is not None:
                     for item in item_list:
@@ -375,18 +406,9 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
                         )
 
         if self.stats_period and not self._collapse("stats"):
-            partial_get_stats = functools.partial(
-                self.get_stats,
-                item_list=item_list,
-                user=user,
-                stats_query_args=GroupStatsQueryArgs(
-                    self.stats_period, self.stats_period_start, self.stats_period_end
-                ),
-                environment_ids=self.environment_ids,
-            )
-            stats = partial_get_stats()
+            stats = attr_loader.get("stats")
             filtered_stats = (
-                partial_get_stats(conditions=self.conditions)
+                attr_loader.get("filtered_stats")
                 if self.conditions and not self._collapse("filtered")
                 else None
             )
@@ -590,19 +612,29 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             )
         return results
 
+    def _uses_environment_first_seen(self) -> bool:
+        return super()._uses_environment_first_seen() or bool(
+            (self.start or self.end) and not self._collapse("lifetime")
+        )
+
     def _seen_stats_error(
-        self, error_issue_list: Sequence[Group], user
+        self, error_issue_list: Sequence[Group], user, params: SeenStatsParams
     ) -> Mapping[Group, SeenStats]:
-        return self.__seen_stats_impl(error_issue_list, self._execute_error_seen_stats_query)
+        return self.__seen_stats_impl(
+            error_issue_list, params, self._execute_error_seen_stats_query
+        )
 
     def _seen_stats_generic(
-        self, generic_issue_list: Sequence[Group], user
+        self, generic_issue_list: Sequence[Group], user, params: SeenStatsParams
     ) -> Mapping[Group, SeenStats]:
-        return self.__seen_stats_impl(generic_issue_list, self._execute_generic_seen_stats_query)
+        return self.__seen_stats_impl(
+            generic_issue_list, params, self._execute_generic_seen_stats_query
+        )
 
     def __seen_stats_impl(
         self,
         error_issue_list: Sequence[Group],
+        params: SeenStatsParams,
         seen_stats_func: _SeenStatsFunc,
     ) -> Mapping[Any, SeenStats]:
         partial_execute_seen_stats_query = functools.partial(
@@ -611,19 +643,20 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             environment_ids=self.environment_ids,
             start=self.start,
             end=self.end,
+            organization_id=params.organization_id,
         )
         time_range_result = self._parse_seen_stats_results(
             partial_execute_seen_stats_query(),
             error_issue_list,
             self.start or self.end or self.conditions,
-            self.environment_ids,
+            params.environment_first_seen,
         )
         filtered_result = (
             self._parse_seen_stats_results(
                 partial_execute_seen_stats_query(conditions=self.conditions),
                 error_issue_list,
                 self.start or self.end or self.conditions,
-                self.environment_ids,
+                params.environment_first_seen,
             )
             if self.conditions and not self._collapse("filtered")
             else None
@@ -634,7 +667,7 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
                     partial_execute_seen_stats_query(start=None, end=None),
                     error_issue_list,
                     False,
-                    self.environment_ids,
+                    params.environment_first_seen,
                 )
                 if self.start or self.end
                 else time_range_result
@@ -6,6 +6,7 @@ from django.contrib.auth.models import AnonymousUser
 
 from sentry import roles
 from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers.dataloader import get_user_loader
 from sentry.integrations.models.external_actor import ExternalActor
 from sentry.models.organizationmember import OrganizationMember
 from sentry.users.models.user import User
@@ -56,9 +57,7 @@ class OrganizationMemberSerializer(Serializer):
                 if organization_member.inviter_id
             }
         )
-        inviters_by_id: Mapping[int, RpcUser] = {
-            u.id: u for u in user_service.get_many_by_id(ids=inviters_set)
-        }
+        inviters_by_id: Mapping[int, RpcUser] = get_user_loader().load_many(inviters_set)
 
         external_users_map = defaultdict(list)
         if "externalUsers" in self.expand:
@@ -2,9 +2,10 @@ from collections import defaultdict
 from collections.abc import Sequence
 from typing import Any, TypeVar
 
+from sentry.api.serializers.dataloader import get_team_loader
 from sentry.models.organizationmember import OrganizationMember
 from sentry.models.organizationmemberteam import OrganizationMemberTeam
-from sentry.models.team import Team, TeamStatus
+from sentry.models.team import TeamStatus
 
 TeamData = TypeVar("TeamData")
 DictOfMembers = dict[Any, list[TeamData]]
@@ -22,8 +23,7 @@ def get_teams_by_organization_member_id(
         ).values_list("organizationmember_id", "team_id", "role")
     )
     team_ids = {team_id for (_om_id, team_id, _role) in organization_member_tuples}
-    teams = Team.objects.filter(id__in=team_ids)
-    teams_by_id = {team.id: team for team in teams}
+    teams_by_id = get_team_loader().load_many(team_ids)
 
     result_teams = defaultdict(list)
     result_teams_with_roles = defaultdict(list)
@@ -4,13 +4,13 @@ from typing import Any
 from django.contrib.auth.models import AnonymousUser
 
 from sentry.api.serializers import Serializer, register
+from sentry.api.serializers.dataloader import get_user_loader
 from sentry.models.organizationmemberinvite import (
     OrganizationMemberInvite,
     OrganizationMemberInviteResponse,
 )
 from sentry.users.models.user import User
 from sentry.users.services.user.model import RpcUser
-from sentry.users.services.user.service import user_service
 
 
 @register(OrganizationMemberInvite)
@@ -22,9 +22,7 @@ class OrganizationMemberInviteSerializer(Serializer):
         **kwargs: Any,
     ) -> MutableMapping[OrganizationMemberInvite, MutableMapping[str, Any]]:
         inviters_set = sorted({omi.inviter_id for omi in item_list if omi.inviter_id})
-        inviters_by_id: Mapping[int, RpcUser] = {
-            u.id: u for u in user_service.get_many_by_id(ids=inviters_set)
-        }
+        inviters_by_id: Mapping[int, RpcUser] = get_user_loader().load_many(inviters_set)
         attrs: MutableMapping[OrganizationMemberInvite, MutableMapping[str, Any]] = {}
         for item in item_list:
             if item.inviter_id is not None:
@@ -10,6 +10,7 @@ from django.db.models import Max, Prefetch, Q, prefetch_related_objects
 from rest_framework import serializers
 
 from sentry.api.serializers import Serializer, register
+from sentry.api.serializers.dataloader import get_user_loader
 from sentry.constants import ObjectStatus
 from sentry.db.models.manager.base_query_set import BaseQuerySet
 from sentry.models.environment import Environment
@@ -20,7 +21,6 @@ from sentry.models.rulesnooze import RuleSnooze
 from sentry.sentry_apps.models.sentry_app_installation import prepare_ui_component
 from sentry.sentry_apps.services.app.model import RpcSentryAppComponentContext
 from sentry.users.services.user import RpcUser
-from sentry.users.services.user.service import user_service
 from sentry.workflow_engine.models import (
     AlertRuleWorkflow,
     DataCondition,
@@ -121,13 +121,23 @@ class RuleSerializer(Serializer):
             ).select_related("rule")
         )
 
-        users = {
-            u.id: u
-            for u in user_service.get_many_by_id(
-                ids=[ra.user_id for ra in ras if ra.user_id is not None]
-            )
+        rule_snooze_lookup = {
+            snooze["rule_id"]: {"user_id": snooze["user_id"], "owner_id": snooze["owner_id"]}
+            for snooze in RuleSnooze.objects.filter(
+                Q(user_id=user.id) | Q(user_id=None),
+                rule__in=[item.id for item in item_list],
+            ).values("rule_id", "user_id", "owner_id")
         }
 
+        user_loader = get_user_loader()
+        # `serialize` shows who created each snooze, fetch them together with the creators
+        user_loader.prime(
+            snooze["owner_id"]
+            for snooze in rule_snooze_lookup.values()
+            if snooze["owner_id"] is not None
+        )
+        users = user_loader.load_many(ra.user_id for ra in ras if ra.user_id is not None)
+
         for rule_activity in ras:
             if rule_activity.user_id is None:
                 creator = None
@@ -223,14 +233,6 @@ class RuleSerializer(Serializer):
             if disable_date:
                 result[rule]["disable_date"] = disable_date
 
-        rule_snooze_lookup = {
-            snooze["rule_id"]: {"user_id": snooze["user_id"], "owner_id": snooze["owner_id"]}
-            for snooze in RuleSnooze.objects.filter(
-                Q(user_id=user.id) | Q(user_id=None),
-                rule__in=[item.id for item in item_list],
-            ).values("rule_id", "user_id", "owner_id")
-        }
-
         for rule in item_list:
             snooze = rule_snooze_lookup.get(rule.id, None)
             if snooze:
@@ -291,7 +293,7 @@ class RuleSerializer(Serializer):
             if user.id == snooze.get("owner_id"):
                 created_by = "You"
             elif owner_id := snooze.get("owner_id"):
-                creator = user_service.get_user(owner_id)
+                creator = get_user_loader().load(owner_id)
                 if creator:
                     created_by = creator.get_display_name()
 
@@ -319,12 +321,9 @@ class WorkflowEngineRuleSerializer(Serializer):
         self.project_slug = project_slug
 
     def _fetch_workflow_users(self, item_list: Sequence[Workflow]) -> dict[int, RpcUser]:
-        return {
-            user.id: user
-            for user in user_service.get_many_by_id(
-                ids=[item.created_by_id for item in item_list if item.created_by_id is not None]
-            )
-        }
+        return get_user_loader().load_many(
+            item.created_by_id for item in item_list if item.created_by_id is not None
+        )
 
     def _fetch_workflow_projects(
         self, item_list: Sequence[Workflow]
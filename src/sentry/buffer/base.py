@@ -1,9 +1,14 @@
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 from django.db.models import Expression, F
+from django.db.models.signals import post_save
 
 from sentry.db import models
+from sentry.db.models.query import update_many_from_values
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils.services import Service
@@ -11,6 +16,30 @@ from sentry.utils.services import Service
 BufferField = models.Model | str | int
 
 
+@dataclass(frozen=True)
+class BufferedIncr:
+    """
+    A single flushed buffer entry, i.e. the arguments of one `Buffer.process` call.
+    """
+
+    model: type[models.Model]
+    columns: dict[str, int]
+    filters: dict[str, Any]
+    extra: dict[str, Any] | None = None
+    signal_only: bool | None = None
+
+    def get_pk(self) -> int | None:
+        """
+        Returns the primary key this entry targets, if it is addressed by primary key alone.
+        """
+        if len(self.filters) != 1:
+            return None
+        ((key, value),) = self.filters.items()
+        if key not in ("id", "pk") or not isinstance(value, int):
+            return None
+        return value
+
+
 class Buffer(Service):
     """
     Buffers act as temporary stores for counters. The default implementation is just a passthru and
@@ -198,3 +227,68 @@ class Buffer(Service):
             created=created,
             sender=model,
         )
+
+    def process_many(self, incrs: Sequence[BufferedIncr]) -> None:
+        """
+        Applies many flushed buffer entries at once.
+
+        Entries addressed by primary key are coalesced by model and written with a single
+        multi-row UPDATE per model. Everything else (signal-only entries, entries with
+        composite filters and rows that need to be created) goes through `process` one by one,
+        so the end result is the same as calling `process` for every entry.
+        """
+        from sentry.models.group import Group
+
+        rows_by_model: dict[
+            type[models.Model], dict[int, tuple[dict[str, int], dict[str, Any]]]
+        ] = defaultdict(dict)
+        bulk_incrs: dict[type[models.Model], dict[int, BufferedIncr]] = defaultdict(dict)
+        fallback: list[BufferedIncr] = []
+
+        for incr in incrs:
+            pk = incr.get_pk()
+            extra = incr.extra or {}
+            if (
+                incr.signal_only
+                or pk is None
+                or pk in bulk_incrs[incr.model]
+                or not incr.columns.keys().isdisjoint(extra.keys())
+                or not (incr.columns or extra)
+            ):
+                fallback.append(incr)
+                continue
+            rows_by_model[incr.model][pk] = (incr.columns, extra)
+            bulk_incrs[incr.model][pk] = incr
+
+        for model, rows in rows_by_model.items():
+            updated = set(update_many_from_values(model, rows))
+
+            if model is Group:
+                # Mirror `group.update()` in `process`, which keeps the group cache warm by
+                # firing `post_save`.
+                for group in Group.objects.filter(id__in=updated):
+                    columns, extra = rows[group.id]
+                    post_save.send_robust(
+                        sender=Group,
+                        instance=group,
+                        created=False,
+                        update_fields=[*columns.keys(), *extra.keys()],
+                    )
+
+            for pk, incr in bulk_incrs[model].items():
+                if pk not in updated and model is not Group:
+                    # The row doesn't exist yet; `process` knows how to create it. Deleted groups
+                    # are skipped, just like in `process`.
+                    fallback.append(incr)
+                    continue
+                buffer_incr_complete.send_robust(
+                    model=model,
+                    columns=incr.columns,
+                    filters=incr.filters,
+                    extra=incr.extra,
+                    created=False,
+                    sender=model,
+                )
+
+        for incr in fallback:
+            self.process(incr.model, incr.columns, incr.filters, incr.extra, incr.signal_only)
@@ -0,0 +1,217 @@
+"""
+Process-local pre-aggregation of buffer increments.
+
+Every `Buffer.incr` against the Redis buffer costs a round-trip, even if the same group is
+incremented hundreds of times within a single consumer batch. `CoalescingBuffer` sits in front of
+the configured buffer backend and folds increments for the same ``(model, filters, signal_only)``
+key together in memory: ``columns`` deltas are summed and ``extra`` values are merged with the same
+last-write-wins semantics the Redis buffer applies. The folded increments are forwarded to the
+backend once a size or age threshold is reached, and at every Kafka commit of consumers that enable
+it (see `flush_before_commit`).
+
+Crash-loss semantics: increments that are held locally are lost if the process dies before they are
+flushed. When flushing is tied to commits this only affects messages whose offsets have not been
+committed yet, so they are re-consumed and counted again after a restart. Increments which are
+flushed because of the size or age thresholds may be forwarded before the corresponding offsets are
+committed; a crash right after such a flush leads to those messages being counted twice, which is
+the same at-least-once behavior the buffer has without this layer. Counters read back through
+`Buffer.get` (e.g. pending ``times_seen``) lag behind by at most ``max_age`` seconds.
+
+This layer is opt-in per consumer through the ``buffer.coalescing.consumers`` option, and only
+makes sense for consumers that call `buffer_incr` in the consumer process itself and commit once
+per batch rather than once per message.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from collections.abc import Hashable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from arroyo.types import Commit, Partition
+
+from sentry import options
+from sentry.buffer.base import BufferField
+from sentry.db import models
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingIncr:
+    model: type[models.Model]
+    filters: dict[str, BufferField]
+    signal_only: bool | None
+    columns: dict[str, int] = field(default_factory=dict)
+    extra: dict[str, Any] = field(default_factory=dict)
+    calls: int = 0
+
+
+def _make_key(
+    model: type[models.Model], filters: dict[str, BufferField], signal_only: bool | None
+) -> Hashable:
+    return (
+        model,
+        tuple(sorted((k, v.pk if isinstance(v, models.Model) else v) for k, v in filters.items())),
+        bool(signal_only),
+    )
+
+
+class CoalescingBuffer:
+    """
+    Sums buffer increments in memory and forwards them to the buffer backend in bulk.
+
+    Thread-safe, so it can be shared by the worker threads of a consumer.
+    """
+
+    def __init__(self, max_keys: int, max_age: float) -> None:
+        assert max_keys > 0
+        self.max_keys = max_keys
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, _PendingIncr] = {}
+        self._last_flush = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def incr(
+        self,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, BufferField],
+        extra: dict[str, Any] | None = None,
+        signal_only: bool | None = None,
+    ) -> None:
+        """
+        Same interface as `Buffer.incr`.
+        """
+        key = _make_key(model, filters, signal_only)
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _PendingIncr(model, dict(filters), signal_only)
+            for column, amount in columns.items():
+                pending.columns[column] = pending.columns.get(column, 0) + amount
+            if extra:
+                pending.extra.update(extra)
+            pending.calls += 1
+
+            should_flush = (
+                len(self._pending) >= self.max_keys
+                or time.monotonic() - self._last_flush >= self.max_age
+            )
+
+        metrics.incr("buffer.coalescing.incr", tags={"model": model.__name__})
+
+        if should_flush:
+            self.flush(reason="threshold")
+
+    def maybe_flush(self) -> None:
+        """
+        Flushes if the age threshold has been reached.
+        """
+        if self._pending and time.monotonic() - self._last_flush >= self.max_age:
+            self.flush(reason="threshold")
+
+    def flush(self, reason: str = "manual") -> None:
+        """
+        Forwards all pending increments to the buffer backend.
+
+        Increments are taken out of the local buffer before they are forwarded, so if the backend
+        raises, the increments which were not forwarded yet are dropped (and counted in
+        ``buffer.coalescing.dropped``) and the error is re-raised to the caller.
+        """
+        from sentry import buffer
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+
+        if not pending:
+            return
+
+        flushed = 0
+        calls = sum(p.calls for p in pending.values())
+        try:
+            with metrics.timer("buffer.coalescing.flush", tags={"reason": reason}):
+                for p in pending.values():
+                    buffer.backend.incr(
+                        p.model,
+                        p.columns,
+                        p.filters,
+                        extra=p.extra or None,
+                        signal_only=p.signal_only,
+                    )
+                    flushed += 1
+        finally:
+            if flushed < len(pending):
+                metrics.incr("buffer.coalescing.dropped", amount=len(pending) - flushed)
+            metrics.distribution("buffer.coalescing.flushed-keys", flushed)
+            metrics.distribution("buffer.coalescing.incrs-per-key", calls / len(pending))
+
+
+_local_buffer: CoalescingBuffer | None = None
+
+
+def get_local_buffer() -> CoalescingBuffer | None:
+    return _local_buffer
+
+
+def enable_local_buffer(consumer_name: str) -> CoalescingBuffer | None:
+    """
+    Enables the local buffer for this process if ``consumer_name`` opted into it through the
+    ``buffer.coalescing.consumers`` option. Returns the active local buffer, if any.
+    """
+    global _local_buffer
+
+    if consumer_name not in options.get("buffer.coalescing.consumers"):
+        return None
+
+    if _local_buffer is None:
+        _local_buffer = CoalescingBuffer(
+            max_keys=options.get("buffer.coalescing.max-keys"),
+            max_age=options.get("buffer.coalescing.max-age-seconds"),
+        )
+        # Best effort: a graceful shutdown should not lose anything.
+        atexit.register(flush_local_buffer)
+        logger.info("buffer.coalescing.enabled", extra={"consumer": consumer_name})
+
+    return _local_buffer
+
+
+def disable_local_buffer() -> None:
+    global _local_buffer
+
+    if _local_buffer is not None:
+        _local_buffer.flush(reason="disable")
+    _local_buffer = None
+
+
+def flush_local_buffer() -> None:
+    if _local_buffer is not None:
+        _local_buffer.flush(reason="commit")
+
+
+def flush_before_commit(commit: Commit) -> Commit:
+    """
+    Wraps an arroyo `Commit` so that the local buffer is flushed before any offsets are handed to
+    it. If the flush fails the offsets are not committed.
+
+    Arroyo also calls `Commit` without offsets on every poll; those calls only flush if the age
+    threshold has been reached, so that increments don't linger while the consumer is idle.
+    """
+
+    def _commit(offsets: Mapping[Partition, int], force: bool = False) -> None:
+        if offsets:
+            flush_local_buffer()
+        elif _local_buffer is not None:
+            _local_buffer.maybe_flush()
+        commit(offsets, force)
+
+    return _commit
@@ -13,7 +13,8 @@ import rb
 from django.utils.encoding import force_bytes, force_str
 from rediscluster import RedisCluster
 
-from sentry.buffer.base import Buffer, BufferField
+from sentry import options
+from sentry.buffer.base import Buffer, BufferedIncr, BufferField
 from sentry.db import models
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils import json, metrics
@@ -513,8 +514,14 @@ class RedisBuffer(Buffer):
         if not lock_key:
             return
 
+        # In bulk flush mode every `process_incr` task drains many keys at once, see
+        # `_process_batch_incr`.
+        incr_batch_size = self.incr_batch_size
+        if options.get("buffer.bulk-flush.enabled"):
+            incr_batch_size = max(incr_batch_size, options.get("buffer.bulk-flush.batch-size"))
+
         pending_buffers_router = redis_buffer_router.create_pending_buffers_router(
-            incr_batch_size=self.incr_batch_size
+            incr_batch_size=incr_batch_size
         )
 
         def _generate_process_incr_kwargs(model_key: str | None) -> dict[str, Any]:
@@ -613,6 +620,10 @@ class RedisBuffer(Buffer):
             batch_keys = [key]
 
         if batch_keys is not None:
+            if len(batch_keys) > 1 and options.get("buffer.bulk-flush.enabled"):
+                self._process_batch_incr(batch_keys)
+                return
+
             for key in batch_keys:
                 self._process_single_incr(key)
 
@@ -651,29 +662,117 @@ class RedisBuffer(Buffer):
                 logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            model = import_string(force_str(values.pop("m")))
-
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._base_process(model, incr_values, filters, extra_values, signal_only)
+            incr = self._load_buffered_incr(values)
+            self._base_process(incr.model, incr.columns, incr.filters, incr.extra, incr.signal_only)
         finally:
             client.delete(lock_key)
+
+    def _load_buffered_incr(self, values: dict[str, Any]) -> BufferedIncr:
+        """
+        Decodes the contents of a buffer hash as written by `incr`.
+        """
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return BufferedIncr(model, incr_values, filters, extra_values, signal_only)
+
+    def _get_batch_pipelines(self, keys: list[str]) -> list[tuple[Pipeline, list[str]]]:
+        """
+        Returns non-transactional pipelines covering all of `keys`, together with the keys each
+        pipeline is responsible for. For rb clusters there is one pipeline per host so that the
+        per-host pending set is updated on the same host as the buffered key.
+        """
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            return [(self.cluster.pipeline(transaction=False), keys)]
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            router = self.cluster.get_router()
+            keys_by_host: dict[int, list[str]] = {}
+            for key in keys:
+                keys_by_host.setdefault(router.get_host_for_key(key), []).append(key)
+            return [
+                (self.cluster.get_local_client(host_id).pipeline(transaction=False), host_keys)
+                for host_id, host_keys in keys_by_host.items()
+            ]
+        else:
+            raise AssertionError("unreachable")
+
+    def _process_batch_incr(self, keys: list[str]) -> None:
+        """
+        Bulk counterpart of `_process_single_incr`: locks, reads and clears all `keys` with a
+        handful of pipelined round-trips and applies them through `Buffer.process_many`, which
+        coalesces them into one multi-row UPDATE per model.
+        """
+        start = time()
+        lock_keys = {key: self._make_lock_key(key) for key in keys}
+
+        locked: list[str] = []
+        for pipe, pipe_keys in self._get_batch_pipelines(list(lock_keys.values())):
+            for lock_key in pipe_keys:
+                pipe.set(lock_key, "1", nx=True, ex=10)
+            locked.extend(
+                lock_key for lock_key, acquired in zip(pipe_keys, pipe.execute()) if acquired
+            )
+
+        acquired_locks = set(locked)
+        locked_keys = [key for key in keys if lock_keys[key] in acquired_locks]
+        if len(locked_keys) < len(keys):
+            metrics.incr(
+                "buffer.revoked",
+                amount=len(keys) - len(locked_keys),
+                tags={"reason": "locked"},
+                skip_internal=False,
+            )
+
+        try:
+            incrs: list[BufferedIncr] = []
+            for pipe, pipe_keys in self._get_batch_pipelines(locked_keys):
+                for key in pipe_keys:
+                    pipe.hgetall(key)
+                    pipe.zrem(self.pending_key, key)
+                    pipe.delete(key)
+                for key, values in zip(pipe_keys, pipe.execute()[::3]):
+                    values = {force_str(k): v for k, v in values.items()}
+                    if not values:
+                        metrics.incr(
+                            "buffer.revoked", tags={"reason": "empty"}, skip_internal=False
+                        )
+                        logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+                        continue
+                    incrs.append(self._load_buffered_incr(values))
+
+            self._base_process_many(incrs)
+        finally:
+            for pipe, pipe_keys in self._get_batch_pipelines(locked):
+                for lock_key in pipe_keys:
+                    pipe.delete(lock_key)
+                pipe.execute()
+
+        duration = max(time() - start, 1e-6)
+        metrics.distribution("buffer.bulk-flush.keys", len(keys))
+        metrics.distribution("buffer.bulk-flush.rows", len(incrs))
+        metrics.distribution("buffer.bulk-flush.keys-per-second", len(keys) / duration)
+        metrics.distribution("buffer.bulk-flush.rows-per-second", len(incrs) / duration)
+        metrics.distribution("buffer.bulk-flush.duration", duration, unit="second")
+
+    def _base_process_many(self, incrs: list[BufferedIncr]) -> None:
+        return super().process_many(incrs)
@@ -433,7 +433,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
                 ["--flusher-processes", "flusher_processes"],
                 default=1,
                 type=int,
-                help="Maximum number of processes for the span flusher. Defaults to 1.",
+                help="Maximum number of processes for the span flusher. 0 runs one process per CPU core. Defaults to 1.",
             ),
         ],
     },
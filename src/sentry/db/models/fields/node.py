@@ -122,11 +122,21 @@ class NodeData(MutableMapping[str, Any]):
             currently only {"unprocessed": {...}} is added for reprocessing.
             See documentation of nodestore.
         """
+        to_write = self.get_subkeys_to_save(subkeys)
+        if to_write is not None:
+            nodestore.backend.set_subkeys(self.id, to_write)
+
+    def get_subkeys_to_save(self, subkeys=None):
+        """
+        Returns what `save` would write to nodestore, so that multiple nodes
+        can be written at once with `nodestore.backend.set_subkeys_multi`.
+        Returns `None` if there is nothing to save.
+        """
 
         # We never loaded any data for reading or writing, so there
         # is nothing to save.
         if self._node_data is None:
-            return
+            return None
 
         # We can't put our wrappers into the nodestore, so we need to
         # ensure that the data is converted into a plain old dict
@@ -136,5 +146,4 @@ class NodeData(MutableMapping[str, Any]):
 
         subkeys = subkeys or {}
         subkeys[None] = to_write
-
-        nodestore.backend.set_subkeys(self.id, subkeys)
+        return subkeys
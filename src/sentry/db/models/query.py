@@ -2,10 +2,11 @@ from __future__ import annotations
 
 import itertools
 import operator
+from collections.abc import Mapping
 from functools import reduce
 from typing import TYPE_CHECKING, Any, Literal
 
-from django.db import IntegrityError, router, transaction
+from django.db import IntegrityError, connections, router, transaction
 from django.db.models import F, Model, Q
 from django.db.models.expressions import BaseExpression, CombinedExpression, Value
 from django.db.models.fields import Field
@@ -19,8 +20,12 @@ if TYPE_CHECKING:
 __all__ = (
     "create_or_update",
     "update",
+    "update_many_from_values",
 )
 
+# Maximum number of bind parameters in a single Postgres statement
+MAX_QUERY_PARAMS = 65535
+
 COMBINED_EXPRESSION_CALLBACKS = {
     CombinedExpression.ADD: operator.add,
     CombinedExpression.SUB: operator.sub,
@@ -176,6 +181,106 @@ def create_or_update(
     return affected, False
 
 
+def update_many_from_values(
+    model: type[Model],
+    rows: Mapping[int, tuple[Mapping[str, int], Mapping[str, Any]]],
+    using: str | None = None,
+) -> list[int]:
+    """
+    Applies per-row increments and overwrites to many rows of ``model`` with a
+    single ``UPDATE ... FROM (VALUES ...)`` statement.
+
+    ``rows`` maps a primary key to ``(columns, values)``, where ``columns`` are
+    added to the existing column values (like ``F(column) + amount``) and
+    ``values`` overwrite them. Columns which are not present for a given row
+    are left untouched, while an explicit ``None`` sets the column to NULL.
+    Rows which do not exist are not created.
+
+    Returns the primary keys of the rows which were updated.
+
+    >>> update_many_from_values(Group, {
+    >>>     1: ({'times_seen': 3}, {'last_seen': timezone.now()}),
+    >>>     2: ({'times_seen': 1}, {}),
+    >>> })
+    """
+    if not rows:
+        return []
+
+    if not using:
+        using = router.db_for_write(model)
+
+    connection = connections[using]
+    qn = connection.ops.quote_name
+
+    pk_field = model._meta.pk
+    assert pk_field is not None
+    incr_keys = sorted({key for columns, _ in rows.values() for key in columns})
+    value_keys = sorted({key for _, values in rows.values() for key in values})
+    incr_fields = [_get_field(model, key) for key in incr_keys]
+    value_fields = [_get_field(model, key) for key in value_keys]
+    fields = [pk_field, *incr_fields, *value_fields]
+    if len({field.column for field in fields}) != len(fields):
+        raise ValueError("A column cannot be both incremented and overwritten.")
+    if len(fields) == 1:
+        raise ValueError("Nothing to update.")
+
+    # Overwritten columns carry a flag telling whether the row sets them at
+    # all, so that an explicit NULL can be told apart from an untouched column.
+    set_columns = [f"_set_{field.column}" for field in value_fields]
+
+    # Every placeholder is cast explicitly so that rows which leave a column
+    # untouched (NULL) don't break type inference of the VALUES list.
+    row_sql = "({})".format(
+        ", ".join(
+            [f"%s::{field.db_type(connection)}" for field in fields]
+            + ["%s::boolean"] * len(set_columns)
+        )
+    )
+    row_params = len(fields) + len(set_columns)
+    params: list[Any] = []
+    for pk, (columns, values) in rows.items():
+        params.append(pk_field.get_db_prep_value(pk, connection))
+        for key in incr_keys:
+            params.append(columns.get(key, 0))
+        for key, field in zip(value_keys, value_fields):
+            if key in values:
+                params.append(field.get_db_prep_save(values[key], connection))
+            else:
+                params.append(None)
+        params.extend(key in values for key in value_keys)
+
+    assignments = [f"{qn(f.column)} = t.{qn(f.column)} + v.{qn(f.column)}" for f in incr_fields]
+    assignments.extend(
+        f"{qn(f.column)} = CASE WHEN v.{qn(set_column)} "
+        f"THEN v.{qn(f.column)} ELSE t.{qn(f.column)} END"
+        for f, set_column in zip(value_fields, set_columns)
+    )
+    table = qn(model._meta.db_table)
+    pk_column = qn(pk_field.column)
+    set_sql = ", ".join(assignments)
+    columns_sql = ", ".join([qn(field.column) for field in fields] + [qn(c) for c in set_columns])
+
+    # Postgres caps the number of bind parameters of a single statement.
+    chunk_size = MAX_QUERY_PARAMS // row_params
+    updated: list[int] = []
+    with connection.cursor() as cursor:
+        for offset in range(0, len(rows), chunk_size):
+            chunk_rows = min(chunk_size, len(rows) - offset)
+            values_sql = ", ".join([row_sql] * chunk_rows)
+            cursor.execute(
+                f"""
+                UPDATE {table} AS t
+                SET {set_sql}
+                FROM (VALUES {values_sql}) AS v ({columns_sql})
+                WHERE t.{pk_column} = v.{pk_column}
+                RETURNING t.{pk_column}
+                """,
+                params[offset * row_params : (offset + chunk_rows) * row_params],
+            )
+            updated.extend(row[0] for row in cursor.fetchall())
+    return updated
+
+
 def in_iexact(column: str, values: Any) -> Q:
     """Operator to test if any of the given values are (case-insensitive)
     matching to values in the given column."""
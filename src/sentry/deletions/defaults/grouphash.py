@@ -1,3 +1,6 @@
+from collections import defaultdict
+from collections.abc import Sequence
+
 from sentry.deletions.base import BaseRelation, ModelDeletionTask, ModelRelation
 from sentry.models.grouphash import GroupHash
 
@@ -9,3 +12,14 @@ class GroupHashDeletionTask(ModelDeletionTask[GroupHash]):
         return [
             ModelRelation(GroupHashMetadata, {"grouphash_id": instance.id}),
         ]
+
+    def delete_instance_bulk(self, instance_list: Sequence[GroupHash]) -> None:
+        from sentry.grouping.ingest import grouphash_cache
+
+        super().delete_instance_bulk(instance_list)
+
+        hashes_by_project = defaultdict(list)
+        for instance in instance_list:
+            hashes_by_project[instance.project_id].append(instance.hash)
+        for project_id, hashes in hashes_by_project.items():
+            grouphash_cache.invalidate(project_id, hashes)
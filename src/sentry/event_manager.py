@@ -25,6 +25,7 @@ from sentry import (
     eventstream,
     eventtypes,
     features,
+    nodestore,
     options,
     quotas,
     reprocessing2,
@@ -1035,6 +1036,7 @@ def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
 
 def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
     inserted_time = datetime.now(timezone.utc).timestamp()
+    to_write = {}
     for job in jobs:
         # Write the event to Nodestore
         subkeys = {}
@@ -1061,7 +1063,12 @@ def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
                 usage_type=UsageUnit.BYTES,
             )
         job["event"].data["nodestore_insert"] = inserted_time
-        job["event"].data.save(subkeys=subkeys)
+        node_data = job["event"].data.get_subkeys_to_save(subkeys=subkeys)
+        if node_data is not None:
+            to_write[job["event"].data.id] = node_data
+
+    # Write all events in as few round-trips to the backend as possible.
+    nodestore.backend.set_subkeys_multi(to_write)
 
 
 def _eventstream_insert_many(jobs: Sequence[Job]) -> None:
@@ -44,6 +44,7 @@ if TYPE_CHECKING:
     from sentry.models.organization import Organization
     from sentry.models.project import Project
     from sentry.spans.grouping.result import SpanGroupingResults
+    from sentry.stacktraces.processing import FrameIndex
 
 
 def ref_func(x: Event) -> int:
@@ -73,9 +74,22 @@ class BaseEvent(metaclass=abc.ABCMeta):
         state.pop("_environment_cache", None)
         state.pop("_group_cache", None)
         state.pop("interfaces", None)
+        state.pop("frame_index", None)
 
         return state
 
+    def __deepcopy__(self, memo: dict[int, Any]) -> BaseEvent:
+        # Unlike pickles, copies (such as those grouped by secondary and background grouping) keep
+        # the frame index. It is copied along with the data it points into, so that it points into
+        # the copied data.
+        rv = self.__class__.__new__(self.__class__)
+        memo[id(self)] = rv
+        state = dict(self.__getstate__())
+        if "frame_index" in self.__dict__:
+            state["frame_index"] = self.__dict__["frame_index"]
+        rv.__dict__.update(deepcopy(state, memo))
+        return rv
+
     @property
     @abc.abstractmethod
     def data(self) -> NodeData:
@@ -301,6 +315,15 @@ class BaseEvent(metaclass=abc.ABCMeta):
     def interfaces(self) -> Mapping[str, Interface]:
         return get_interfaces(self.data)
 
+    @cached_property
+    def frame_index(self) -> FrameIndex:
+        """
+        The stacktraces of the event, shared by everything grouping it.
+        """
+        from sentry.stacktraces.processing import FrameIndex
+
+        return FrameIndex(self.data)
+
     @overload
     def get_interface(self, name: Literal["user"]) -> User: ...
 
@@ -389,7 +412,7 @@ class BaseEvent(metaclass=abc.ABCMeta):
         """
         from sentry.stacktraces.processing import normalize_stacktraces_for_grouping
 
-        normalize_stacktraces_for_grouping(self.data, grouping_config)
+        normalize_stacktraces_for_grouping(self.data, grouping_config, self.frame_index)
 
         # We have modified event data, so any cached interfaces have to be reset:
         self.__dict__.pop("interfaces", None)
@@ -607,6 +630,7 @@ class Event(BaseEvent):
 
     @data.setter
     def data(self, value: Mapping[str, Any]) -> None:
+        self.__dict__.pop("frame_index", None)
         node_id = Event.generate_node_id(self.project_id, self.event_id)
         self._data = NodeData(
             node_id, data=value, wrapper=EventDict, ref_version=2, ref_func=ref_func
@@ -724,6 +748,7 @@ class GroupEvent(BaseEvent):
 
     @data.setter
     def data(self, value: NodeData) -> None:
+        self.__dict__.pop("frame_index", None)
         self._data = value
 
     @classmethod
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import re
 from collections.abc import MutableMapping, Sequence
 from dataclasses import dataclass
@@ -48,6 +49,11 @@ if TYPE_CHECKING:
 
 HASH_RE = re.compile(r"^[0-9a-f]{32}$")
 
+# Number of compiled enhancements, strategy configurations and fingerprinting rules kept per
+# process. All of them are cached by their contents (including the project options they are built
+# from), so a project option change leads to a new cache key rather than a stale entry.
+COMPILED_CONFIG_CACHE_SIZE = 256
+
 
 class FingerprintInfo(TypedDict):
     client_fingerprint: NotRequired[list[str]]
@@ -95,48 +101,62 @@ class GroupingConfigLoader:
         enhancements_base = CONFIGURATIONS[config_id].enhancements_base
         enhancements_version = get_enhancements_version(project, config_id)
 
-        # Instead of parsing and dumping out config here, we can make a
-        # shortcut
-        from sentry.utils.cache import cache
-        from sentry.utils.hashlib import md5_text
-
-        cache_prefix = self.cache_prefix
-        cache_prefix += f"{enhancements_version}:"
-        cache_key = (
-            cache_prefix
-            + md5_text(
-                f"{enhancements_base}|{derived_enhancements}|{project_enhancements}"
-            ).hexdigest()
+        return _get_enhancements(
+            self.cache_prefix,
+            enhancements_base,
+            derived_enhancements,
+            project_enhancements,
+            enhancements_version,
         )
-        enhancements = cache.get(cache_key)
-        if enhancements is not None:
-            return enhancements
-
-        try:
-            # Automatic enhancements are always applied first, so they can be overridden by
-            # project-specific enhancements.
-            enhancements_string = project_enhancements or ""
-            if derived_enhancements:
-                enhancements_string = (
-                    f"{derived_enhancements}\n{enhancements_string}"
-                    if enhancements_string
-                    else derived_enhancements
-                )
-            enhancements = Enhancements.from_rules_text(
-                enhancements_string,
-                bases=[enhancements_base] if enhancements_base else [],
-                version=enhancements_version,
-                referrer="project_rules",
-            ).base64_string
-        except InvalidEnhancerConfig:
-            enhancements = get_default_enhancements()
-        cache.set(cache_key, enhancements)
-        return enhancements
 
     def _get_config_id(self, project: Project) -> str:
         raise NotImplementedError
 
 
+@functools.lru_cache(maxsize=COMPILED_CONFIG_CACHE_SIZE)
+def _get_enhancements(
+    cache_prefix: str,
+    enhancements_base: str | None,
+    derived_enhancements: str | None,
+    project_enhancements: str | None,
+    enhancements_version: int,
+) -> str:
+    # Instead of parsing and dumping out config here, we can make a
+    # shortcut
+    from sentry.utils.cache import cache
+    from sentry.utils.hashlib import md5_text
+
+    cache_prefix += f"{enhancements_version}:"
+    cache_key = (
+        cache_prefix
+        + md5_text(f"{enhancements_base}|{derived_enhancements}|{project_enhancements}").hexdigest()
+    )
+    enhancements = cache.get(cache_key)
+    if enhancements is not None:
+        return enhancements
+
+    try:
+        # Automatic enhancements are always applied first, so they can be overridden by
+        # project-specific enhancements.
+        enhancements_string = project_enhancements or ""
+        if derived_enhancements:
+            enhancements_string = (
+                f"{derived_enhancements}\n{enhancements_string}"
+                if enhancements_string
+                else derived_enhancements
+            )
+        enhancements = Enhancements.from_rules_text(
+            enhancements_string,
+            bases=[enhancements_base] if enhancements_base else [],
+            version=enhancements_version,
+            referrer="project_rules",
+        ).base64_string
+    except InvalidEnhancerConfig:
+        enhancements = get_default_enhancements()
+    cache.set(cache_key, enhancements)
+    return enhancements
+
+
 class ProjectGroupingConfigLoader(GroupingConfigLoader):
     option_name: str  # Set in subclasses
 
@@ -188,6 +208,7 @@ def get_grouping_config_dict_for_event_data(data: NodeData, project: Project) ->
     return data.get("grouping_config") or get_grouping_config_dict_for_project(project)
 
 
+@functools.lru_cache(maxsize=COMPILED_CONFIG_CACHE_SIZE)
 def get_default_enhancements(config_id: str | None = None) -> str:
     base: str | None = DEFAULT_GROUPING_ENHANCEMENTS_BASE
     if config_id is not None:
@@ -230,7 +251,14 @@ def load_grouping_config(config_dict: GroupingConfig | None = None) -> StrategyC
     config_id = config_dict["id"]
     if config_id not in CONFIGURATIONS:
         raise GroupingConfigNotFound(config_id)
-    return CONFIGURATIONS[config_id](enhancements=config_dict["enhancements"])
+    return _load_grouping_config(config_id, config_dict["enhancements"])
+
+
+@functools.lru_cache(maxsize=COMPILED_CONFIG_CACHE_SIZE)
+def _load_grouping_config(config_id: str, enhancements: str | None) -> StrategyConfiguration:
+    # Strategy configurations are not modified after they are created, so they can be shared by
+    # all events with the same config.
+    return CONFIGURATIONS[config_id](enhancements=enhancements)
 
 
 def load_default_grouping_config() -> StrategyConfiguration:
@@ -245,10 +273,17 @@ def get_fingerprinting_config_for_project(
     Merges the project's custom fingerprinting rules (if any) with the default built-in rules.
     """
 
-    from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
-
     bases = get_projects_default_fingerprinting_bases(project, config_id=config_id)
     raw_rules = project.get_option("sentry:fingerprinting_rules")
+    return _get_fingerprinting_rules(raw_rules or None, tuple(bases) if bases else None)
+
+
+@functools.lru_cache(maxsize=COMPILED_CONFIG_CACHE_SIZE)
+def _get_fingerprinting_rules(
+    raw_rules: str | None, bases: tuple[str, ...] | None
+) -> FingerprintingRules:
+    from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
+
     if not raw_rules:
         return FingerprintingRules([], bases=bases)
 
@@ -268,6 +303,14 @@ def get_fingerprinting_config_for_project(
     return rules
 
 
+def clear_compiled_config_caches() -> None:
+    """Drops all grouping configs and fingerprinting rules compiled by this process."""
+    get_default_enhancements.cache_clear()
+    _get_enhancements.cache_clear()
+    _load_grouping_config.cache_clear()
+    _get_fingerprinting_rules.cache_clear()
+
+
 def apply_server_fingerprinting(
     event: MutableMapping[str, Any], fingerprinting_config: FingerprintingRules
 ) -> None:
@@ -407,7 +450,7 @@ def get_grouping_variants_for_event(
     resolved_fingerprint = (
         raw_fingerprint
         if fingerprint_type == "default"
-        else resolve_fingerprint_values(raw_fingerprint, event.data)
+        else resolve_fingerprint_values(raw_fingerprint, event.data, event.frame_index)
     )
 
     # Run all of the event-data-based grouping strategies. Any which apply will create grouping
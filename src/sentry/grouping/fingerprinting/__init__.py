@@ -3,6 +3,7 @@ from __future__ import annotations
 import inspect
 import logging
 from collections.abc import Generator, Mapping, Sequence
+from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, NamedTuple, NotRequired, Self, TypedDict, TypeVar
 
@@ -273,13 +274,17 @@ class FingerprintingRules:
                 base_rules = FINGERPRINTING_BASES.get(base, [])
                 yield from base_rules
 
+    @cached_property
+    def _index(self) -> FingerprintRuleIndex:
+        return FingerprintRuleIndex(list(self.iter_rules()))
+
     def get_fingerprint_values_for_event(
         self, event: Mapping[str, object]
     ) -> None | FingerprintRuleMatch:
         if not (self.bases or self.rules):
             return None
         event_datastore = EventDatastore(event)
-        for rule in self.iter_rules():
+        for rule in self._index.iter_candidates(event_datastore):
             match = rule.test_for_match_with_event(event_datastore)
             if match is not None:
                 return FingerprintRuleMatch(rule, match.fingerprint, match.attributes)
@@ -562,6 +567,79 @@ class FingerprintRule:
         ).rstrip()
 
 
+# Matcher keys which are matched case-sensitively, and without any path normalization
+_EXACT_MATCH_KEYS = frozenset(("type", "module", "function"))
+
+# Characters with a special meaning in glob patterns
+_GLOB_CHARS = frozenset("*?[]{}\\!")
+
+
+def _get_literal_matcher(rule: FingerprintRule) -> FingerprintMatcher | None:
+    """
+    Returns a matcher of the rule which can only match an event if one of the event's values for
+    the matcher's key equals its pattern.
+    """
+    for matcher in rule.matchers:
+        if matcher.negated:
+            continue
+        if matcher.key not in _EXACT_MATCH_KEYS and not matcher.key.startswith("tags."):
+            continue
+        if _GLOB_CHARS.isdisjoint(matcher.pattern):
+            return matcher
+    return None
+
+
+class FingerprintRuleIndex:
+    """
+    Finds the rules which can possibly match an event, without testing every rule.
+
+    A rule is only a candidate for an event if the event has values for all of the rule's match
+    types (a rule matching on frames can't match an event without frames). In addition, rules with
+    a literal pattern on a case-sensitive key (e.g. `type:DatabaseUnavailable`) are looked up in a
+    hash table by the event's values for that key, so they are never considered for events without
+    that value.
+
+    Candidates are returned in the order of the rules, so testing them one by one finds the same
+    first matching rule as testing all rules.
+    """
+
+    def __init__(self, rules: Sequence[FingerprintRule]) -> None:
+        self.rules = rules
+        self._match_types = [
+            frozenset(matcher.match_type for matcher in rule.matchers) for rule in rules
+        ]
+        # key -> pattern -> indices of rules with a literal matcher on that key and pattern
+        self._literal_rules: dict[str, dict[str, list[int]]] = {}
+        self._literal_match_types: dict[str, str] = {}
+        # indices of rules without a literal matcher
+        self._other_rules: list[int] = []
+
+        for i, rule in enumerate(rules):
+            matcher = _get_literal_matcher(rule)
+            if matcher is None:
+                self._other_rules.append(i)
+            else:
+                patterns = self._literal_rules.setdefault(matcher.key, {})
+                patterns.setdefault(matcher.pattern, []).append(i)
+                self._literal_match_types[matcher.key] = matcher.match_type
+
+    def iter_candidates(self, event_datastore: EventDatastore) -> Generator[FingerprintRule]:
+        indices = self._other_rules
+        if self._literal_rules:
+            found: set[int] = set()
+            for key, patterns in self._literal_rules.items():
+                for event_values in event_datastore.get_values(self._literal_match_types[key]):
+                    value = event_values.get(key)
+                    if isinstance(value, str) and value in patterns:
+                        found.update(patterns[value])
+            if found:
+                indices = sorted(found.union(self._other_rules))
+
+        for i in indices:
+            if all(event_datastore.get_values(match_type) for match_type in self._match_types[i]):
+                yield self.rules[i]
+
+
 class FingerprintingVisitor(NodeVisitorBase):
     visit_empty = lambda *a: None
     unwrapped_exceptions = (InvalidFingerprintingConfig,)
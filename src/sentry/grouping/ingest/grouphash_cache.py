@@ -0,0 +1,141 @@
+"""
+Read cache of `GroupHash` records for the ingest hot path.
+
+Almost every event is grouped into an existing issue, so looking up its hashes returns the same
+records over and over again. `get_grouphashes` therefore fetches the records of all hashes of a
+batch with a single `IN` query and keeps them in the shared cache for a short while:
+
+* Only records which are settled are cached, i.e. records which either point at a group or at a
+  tombstone. Records which have just been created and are still waiting for their group are always
+  read from the database.
+* Hashes without a record can be cached as missing (negative entries) with their own, shorter TTL.
+  Secondary grouping is the main beneficiary of those, as its unknown hashes are never created.
+* Everything which moves records to another group, a tombstone or deletes them (merging, unmerging,
+  discarding and deleting issues) invalidates the affected entries once the change is made. A
+  lookup racing with such a change may still put the previous state back into the cache, which is
+  why the TTLs are kept short.
+
+The cache is configured through the ``grouping.grouphash_cache.*`` options.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Generator, Iterable
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db.models import QuerySet
+
+from sentry import options
+from sentry.models.grouphash import GroupHash
+from sentry.utils import metrics
+
+CACHE_KEY_PREFIX = "grouphash:v1"
+
+# Stored in place of a record for hashes which don't have one
+MISSING = 0
+
+
+def get_cache_key(project_id: int | None, hash_value: str) -> str:
+    return f"{CACHE_KEY_PREFIX}:{project_id}:{hash_value}"
+
+
+def _is_cacheable(grouphash: GroupHash) -> bool:
+    return grouphash.group_id is not None or grouphash.group_tombstone_id is not None
+
+
+def get_grouphashes(
+    project_id: int, hashes: Collection[str], cache_missing: bool = False
+) -> dict[str, GroupHash | None]:
+    """
+    Returns the `GroupHash` record of each of the given hashes, or `None` if there isn't one. Hashes
+    which aren't cached are fetched with one query, and their records are cached if they are
+    settled. With `cache_missing`, hashes without a record are cached as missing.
+
+    Records are fetched together with their metadata.
+    """
+    if not options.get("grouping.grouphash_cache.enabled"):
+        return _fetch_grouphashes(project_id, hashes)
+
+    cache_keys = {hash_value: get_cache_key(project_id, hash_value) for hash_value in hashes}
+    cached = cache.get_many(list(cache_keys.values()))
+
+    rv: dict[str, GroupHash | None] = {}
+    uncached = []
+    for hash_value, cache_key in cache_keys.items():
+        if cache_key in cached:
+            value = cached[cache_key]
+            rv[hash_value] = None if value == MISSING else value
+        else:
+            uncached.append(hash_value)
+
+    if rv:
+        metrics.incr("grouping.grouphash_cache.hit", amount=len(rv))
+    if not uncached:
+        return rv
+
+    metrics.incr("grouping.grouphash_cache.miss", amount=len(uncached))
+    fetched = _fetch_grouphashes(project_id, uncached)
+    rv.update(fetched)
+
+    cache_grouphashes(project_id, [grouphash for grouphash in fetched.values() if grouphash])
+    if cache_missing:
+        missing = [hash_value for hash_value, grouphash in fetched.items() if grouphash is None]
+        if missing:
+            cache.set_many(
+                {cache_keys[hash_value]: MISSING for hash_value in missing},
+                options.get("grouping.grouphash_cache.negative_ttl_seconds"),
+            )
+
+    return rv
+
+
+def _fetch_grouphashes(project_id: int, hashes: Collection[str]) -> dict[str, GroupHash | None]:
+    rv: dict[str, GroupHash | None] = dict.fromkeys(hashes)
+    if rv:
+        for grouphash in GroupHash.objects.filter(
+            project_id=project_id, hash__in=list(rv)
+        ).select_related("_metadata"):
+            rv[grouphash.hash] = grouphash
+    return rv
+
+
+def cache_grouphashes(project_id: int, grouphashes: Iterable[GroupHash]) -> None:
+    """
+    Caches the settled ones among the given records, replacing their current entries.
+    """
+    if not options.get("grouping.grouphash_cache.enabled"):
+        return
+
+    values = {
+        get_cache_key(project_id, grouphash.hash): grouphash
+        for grouphash in grouphashes
+        if _is_cacheable(grouphash)
+    }
+    if values:
+        cache.set_many(values, options.get("grouping.grouphash_cache.ttl_seconds"))
+
+
+def invalidate(project_id: int | None, hashes: Iterable[str]) -> None:
+    cache_keys = [get_cache_key(project_id, hash_value) for hash_value in hashes]
+    if cache_keys:
+        cache.delete_many(cache_keys)
+        metrics.incr("grouping.grouphash_cache.invalidated", amount=len(cache_keys))
+
+
+@contextmanager
+def invalidating(queryset: QuerySet[GroupHash]) -> Generator[None]:
+    """
+    Invalidates the entries of the records matched by `queryset` after the block has run. The
+    records are looked up beforehand, so the block may change them in a way that they no longer
+    match (for example by moving them to another group).
+    """
+    keys = list(queryset.values_list("project_id", "hash"))
+    try:
+        yield
+    finally:
+        if keys:
+            cache.delete_many(
+                [get_cache_key(project_id, hash_value) for project_id, hash_value in keys]
+            )
+            metrics.incr("grouping.grouphash_cache.invalidated", amount=len(keys))
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import copy
+import functools
 import logging
-from collections.abc import Iterable, Sequence
-from typing import TYPE_CHECKING
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from queue import Full
+from typing import TYPE_CHECKING, Any
 
 import sentry_sdk
+from django.db import connection
 
+from sentry import options
 from sentry.exceptions import HashDiscarded
 from sentry.grouping.api import (
     NULL_GROUPING_CONFIG,
@@ -18,6 +23,7 @@ from sentry.grouping.api import (
     get_grouping_config_dict_for_project,
     load_grouping_config,
 )
+from sentry.grouping.ingest import grouphash_cache
 from sentry.grouping.ingest.config import is_in_transition
 from sentry.grouping.ingest.grouphash_metadata import (
     create_or_update_grouphash_metadata_if_needed,
@@ -29,6 +35,7 @@ from sentry.models.grouphash import GroupHash
 from sentry.models.project import Project
 from sentry.options.rollout import in_random_rollout
 from sentry.utils import metrics
+from sentry.utils.concurrent import Executor, ThreadedExecutor, TimedFuture
 from sentry.utils.metrics import MutableTags
 from sentry.utils.tag_normalization import normalized_sdk_tag_from_event
 
@@ -38,6 +45,63 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("sentry.events.grouping")
 
+_grouping_executor: ThreadedExecutor | None = None
+_grouping_executor_lock = threading.Lock()
+
+
+def _get_grouping_executor() -> Executor | None:
+    """
+    Returns the thread pool which runs background grouping off the critical path of event saving,
+    or `None` if it should run inline.
+
+    The pool is created on first use with `grouping.async_grouping.workers` threads and a queue of
+    at most `grouping.async_grouping.max_queued` tasks. Changes to either option take effect after
+    a restart.
+    """
+    global _grouping_executor
+
+    if not options.get("grouping.async_grouping.enabled"):
+        return None
+
+    if _grouping_executor is None:
+        with _grouping_executor_lock:
+            if _grouping_executor is None:
+                _grouping_executor = ThreadedExecutor(
+                    worker_count=options.get("grouping.async_grouping.workers"),
+                    maxsize=options.get("grouping.async_grouping.max_queued"),
+                )
+    return _grouping_executor
+
+
+def _submit_grouping_task[T](executor: Executor, task: Callable[[], T]) -> TimedFuture[T] | None:
+    """
+    Queue a grouping task without blocking. Returns `None` if the task was dropped because the
+    queue is full.
+    """
+    submitting_thread = threading.current_thread()
+
+    def run() -> T:
+        try:
+            return task()
+        finally:
+            # Django opens a connection per thread, and nothing else closes the ones of the
+            # executor's threads.
+            if threading.current_thread() is not submitting_thread:
+                connection.close()
+
+    future = executor.submit(run, block=False)
+    if future.done() and isinstance(future.exception(), Full):
+        metrics.incr("grouping.async_grouping.dropped")
+        return None
+
+    metrics.incr("grouping.async_grouping.submitted")
+    return future
+
+
+def _capture_grouping_task_exception(future: TimedFuture[Any]) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        sentry_sdk.capture_exception(future.exception())
+
 
 def _calculate_event_grouping(
     project: Project, event: Event, grouping_config: GroupingConfig
@@ -88,7 +152,18 @@ def maybe_run_background_grouping(project: Project, job: Job) -> None:
             config = BackgroundGroupingConfigLoader().get_config_dict(project)
             if config["id"]:
                 copied_event = copy.deepcopy(job["event"])
-                _calculate_background_grouping(project, copied_event, config)
+                executor = _get_grouping_executor()
+                if executor is None:
+                    _calculate_background_grouping(project, copied_event, config)
+                else:
+                    future = _submit_grouping_task(
+                        executor,
+                        functools.partial(
+                            _calculate_background_grouping, project, copied_event, config
+                        ),
+                    )
+                    if future is not None:
+                        future.add_done_callback(_capture_grouping_task_exception)
     except Exception as err:
         sentry_sdk.capture_exception(err)
 
@@ -218,20 +293,27 @@ def get_or_create_grouphashes(
 ) -> list[GroupHash]:
     is_secondary = grouping_config == project.get_option("sentry:secondary_grouping_config")
     grouphashes: list[GroupHash] = []
-
+    updated_grouphashes: list[GroupHash] = []
+    hashes = list(dict.fromkeys(hashes))
+
+    # Fetch the records of all hashes at once (or take them from the cache), so that only the
+    # missing ones need to be created below. The only utility of secondary hashes is to link new
+    # primary hashes to an existing group via an existing grouphash. Secondary hashes which are new
+    # are therefore of no value and never get a record, so it's worth remembering they're missing.
+    existing_grouphashes = grouphash_cache.get_grouphashes(
+        project.id, hashes, cache_missing=is_secondary
+    )
     if is_secondary:
-        # The only utility of secondary hashes is to link new primary hashes to an existing group
-        # via an existing grouphash. Secondary hashes which are new are therefore of no value, so
-        # filter them out before creating grouphash records.
-        existing_hashes = set(
-            GroupHash.objects.filter(project=project, hash__in=hashes).values_list(
-                "hash", flat=True
-            )
-        )
-        hashes = filter(lambda hash_value: hash_value in existing_hashes, hashes)
+        hashes = [hash_value for hash_value in hashes if existing_grouphashes[hash_value]]
 
     for hash_value in hashes:
-        grouphash, created = GroupHash.objects.get_or_create(project=project, hash=hash_value)
+        existing_grouphash = existing_grouphashes[hash_value]
+        if existing_grouphash is not None:
+            grouphash, created = existing_grouphash, False
+        else:
+            grouphash, created = GroupHash.objects.get_or_create(project=project, hash=hash_value)
+            if created:
+                grouphash_cache.invalidate(project.id, [hash_value])
 
         if should_handle_grouphash_metadata(project, created):
             try:
@@ -248,6 +330,8 @@ def get_or_create_grouphashes(
                 logger.warning(
                     "grouphash_metadata.exception", extra={"event_id": event_id, "error": repr(exc)}
                 )
+            else:
+                updated_grouphashes.append(grouphash)
 
         if grouphash.metadata:
             record_grouphash_metadata_metrics(grouphash.metadata, event.platform)
@@ -260,4 +344,7 @@ def get_or_create_grouphashes(
 
         grouphashes.append(grouphash)
 
+    # Keep the cached records in line with the metadata created or updated above
+    grouphash_cache.cache_grouphashes(project.id, updated_grouphashes)
+
     return grouphashes
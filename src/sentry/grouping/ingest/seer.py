@@ -18,6 +18,7 @@ from sentry.grouping.utils import get_fingerprint_type
 from sentry.grouping.variants import BaseVariant
 from sentry.models.grouphash import GroupHash
 from sentry.models.project import Project
+from sentry.seer.similarity import similar_issues_cache
 from sentry.seer.similarity.similar_issues import get_similarity_data_from_seer
 from sentry.seer.similarity.types import SimilarIssuesEmbeddingsRequest
 from sentry.seer.similarity.utils import (
@@ -284,9 +285,10 @@ def get_seer_similar_issues(
 
     seer_request_metric_tags = {"platform": event.platform or "unknown"}
 
-    seer_results = get_similarity_data_from_seer(
+    seer_results = similar_issues_cache.get_similarity_data(
         request_data,
         {**seer_request_metric_tags, "hybrid_fingerprint": event_has_hybrid_fingerprint},
+        get_similarity_data_from_seer,
     )
 
     # All of these will get overridden if we find a usable match
@@ -311,7 +313,11 @@ def get_seer_similar_issues(
         # Similar issues are returned sorted in descending order of similarity, so we want to use
         # the first match we find.
         for seer_result in seer_results:
-            parent_grouphash = parent_grouphashes_by_hash[seer_result.parent_hash]
+            parent_grouphash = parent_grouphashes_by_hash.get(seer_result.parent_hash)
+            # Results may come from the request cache, and their grouphashes may have been deleted
+            # since they were cached
+            if parent_grouphash is None:
+                continue
             can_use_parent_grouphash = _should_use_seer_match_for_grouping(
                 event,
                 event_grouphash,
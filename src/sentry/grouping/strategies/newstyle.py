@@ -21,6 +21,7 @@ from sentry.grouping.component import (
     StacktraceGroupingComponent,
     ThreadsGroupingComponent,
 )
+from sentry.grouping.strategies import stacktrace_cache
 from sentry.grouping.strategies.base import (
     GroupingContext,
     ReturnedVariants,
@@ -428,6 +429,20 @@ def _single_stacktrace_variant(
 ) -> ReturnedVariants:
     variant_name = context["variant"]
 
+    # Strategies can be passed extra arguments, which aren't part of the cache key
+    cache_key = None if meta else stacktrace_cache.get_cache_key(stacktrace, event, context)
+    stacktrace_component = stacktrace_cache.get_or_compute(
+        cache_key, lambda: _get_stacktrace_component(stacktrace, event, context, meta)
+    )
+
+    return {variant_name: stacktrace_component}
+
+
+def _get_stacktrace_component(
+    stacktrace: Stacktrace, event: Event, context: GroupingContext, meta: dict[str, Any]
+) -> StacktraceGroupingComponent:
+    variant_name = context["variant"]
+
     frames = stacktrace.frames
 
     frame_components = []
@@ -492,7 +507,7 @@ def _single_stacktrace_variant(
 
         stacktrace_component.hint = f"ignored because it contains no {frames_description}"
 
-    return {variant_name: stacktrace_component}
+    return stacktrace_component
 
 
 @stacktrace.variant_processor
@@ -0,0 +1,157 @@
+"""
+Process-local memoization of stacktrace grouping components.
+
+Events of the same issue usually carry identical stacktraces, and building their stacktrace
+components (running the frame strategy on every frame and applying the enhancement rules) is most
+of the work of grouping them. The components are therefore cached by a digest of everything which
+goes into them:
+
+* the frame attributes read by the frame strategy and the enhancement rules,
+* the event platform, the grouping config ID and the enhancements,
+* the variant, and the exception the stacktrace belongs to (if any).
+
+Components are copied on their way into and out of the cache, so callers updating them (for
+example when a custom fingerprint takes precedence) don't change the cached version. A sample of
+cache hits can be recomputed and compared to the cached component; entries which turn out to be
+wrong are replaced by the recomputed component.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import random
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+import orjson
+from cachetools import LRUCache
+
+from sentry import options
+from sentry.grouping.component import StacktraceGroupingComponent
+from sentry.interfaces.stacktrace import Stacktrace
+from sentry.utils import metrics
+
+if TYPE_CHECKING:
+    from sentry.eventstore.models import Event
+    from sentry.grouping.strategies.base import GroupingContext
+
+logger = logging.getLogger(__name__)
+
+# Frame attributes read by the frame strategy, the recursion check or the enhancement rules
+FRAME_KEY_FIELDS = (
+    "abs_path",
+    "colno",
+    "context_line",
+    "filename",
+    "function",
+    "in_app",
+    "lineno",
+    "module",
+    "package",
+    "platform",
+    "raw_function",
+)
+
+_cache: LRUCache[bytes, StacktraceGroupingComponent] | None = None
+_lock = threading.Lock()
+
+
+def _get_cache() -> LRUCache[bytes, StacktraceGroupingComponent]:
+    global _cache
+
+    max_entries = options.get("grouping.stacktrace_cache.max_entries")
+    if _cache is None or _cache.maxsize != max_entries:
+        _cache = LRUCache(maxsize=max_entries)
+    return _cache
+
+
+def get_cache_key(stacktrace: Stacktrace, event: Event, context: GroupingContext) -> bytes | None:
+    """
+    Returns the digest under which the stacktrace component for the current variant is cached, or
+    `None` if the cache is disabled or the stacktrace can't be digested.
+    """
+    if not options.get("grouping.stacktrace_cache.enabled"):
+        return None
+
+    frames = []
+    for frame in stacktrace.frames:
+        frame_data = frame.data or {}
+        frames.append(
+            [
+                *(getattr(frame, field, None) for field in FRAME_KEY_FIELDS),
+                frame_data.get("category"),
+                frame_data.get("orig_in_app"),
+                frame_data.get("sourcemap") is not None,
+            ]
+        )
+
+    try:
+        payload = orjson.dumps(
+            [
+                context.config.id,
+                context.config.enhancements.base64_string,
+                event.platform,
+                context["variant"],
+                context["exception_data"],
+                frames,
+            ],
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        )
+    except TypeError:
+        metrics.incr("grouping.stacktrace_cache.undigestable")
+        return None
+
+    return hashlib.sha256(payload).digest()
+
+
+def _is_same_component(a: StacktraceGroupingComponent, b: StacktraceGroupingComponent) -> bool:
+    return a.as_dict() == b.as_dict() and a.frame_counts == b.frame_counts
+
+
+def get_or_compute(
+    cache_key: bytes | None, compute: Callable[[], StacktraceGroupingComponent]
+) -> StacktraceGroupingComponent:
+    """
+    Returns a copy of the component cached under `cache_key`, or calls `compute` and caches its
+    result. Without a key, `compute` is always called.
+    """
+    if cache_key is None:
+        return compute()
+
+    with _lock:
+        cache = _get_cache()
+        cached = cache.get(cache_key)
+
+    if cached is None:
+        metrics.incr("grouping.stacktrace_cache.miss")
+        component = compute()
+        with _lock:
+            cache[cache_key] = copy.deepcopy(component)
+        return component
+
+    metrics.incr("grouping.stacktrace_cache.hit")
+
+    if random.random() < options.get("grouping.stacktrace_cache.validation_sample_rate"):
+        component = compute()
+        if _is_same_component(component, cached):
+            metrics.incr("grouping.stacktrace_cache.validation", tags={"result": "match"})
+        else:
+            metrics.incr("grouping.stacktrace_cache.validation", tags={"result": "mismatch"})
+            logger.warning(
+                "grouping.stacktrace_cache.mismatch",
+                extra={"cached": cached.as_dict(), "computed": component.as_dict()},
+            )
+            with _lock:
+                cache[cache_key] = copy.deepcopy(component)
+        return component
+
+    return copy.deepcopy(cached)
+
+
+def clear() -> None:
+    with _lock:
+        if _cache is not None:
+            _cache.clear()
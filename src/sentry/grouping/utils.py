@@ -10,7 +10,7 @@ from uuid import UUID
 from django.utils.encoding import force_bytes
 
 from sentry.db.models.fields.node import NodeData
-from sentry.stacktraces.processing import get_crash_frame_from_event_data
+from sentry.stacktraces.processing import FrameIndex, get_crash_frame_from_event_data
 from sentry.utils.safe import get_path
 
 if TYPE_CHECKING:
@@ -88,7 +88,9 @@ def bool_from_string(value: str) -> bool | None:
 
 
 def resolve_fingerprint_variable(
-    variable_key: str, event_data: NodeData | Mapping[str, Any]
+    variable_key: str,
+    event_data: NodeData | Mapping[str, Any],
+    frame_index: FrameIndex | None = None,
 ) -> str | None:
     if variable_key == "transaction":
         return event_data.get("transaction") or "<no-transaction>"
@@ -110,27 +112,27 @@ def resolve_fingerprint_variable(
         return value or "<no-value>"
 
     elif variable_key in ("function", "stack.function"):
-        frame = get_crash_frame_from_event_data(event_data)
+        frame = get_crash_frame_from_event_data(event_data, frame_index=frame_index)
         func = frame.get("function") if frame else None
         return func or "<no-function>"
 
     elif variable_key in ("path", "stack.abs_path"):
-        frame = get_crash_frame_from_event_data(event_data)
+        frame = get_crash_frame_from_event_data(event_data, frame_index=frame_index)
         abs_path = frame.get("abs_path") or frame.get("filename") if frame else None
         return abs_path or "<no-abs-path>"
 
     elif variable_key == "stack.filename":
-        frame = get_crash_frame_from_event_data(event_data)
+        frame = get_crash_frame_from_event_data(event_data, frame_index=frame_index)
         filename = frame.get("filename") or frame.get("abs_path") if frame else None
         return filename or "<no-filename>"
 
     elif variable_key in ("module", "stack.module"):
-        frame = get_crash_frame_from_event_data(event_data)
+        frame = get_crash_frame_from_event_data(event_data, frame_index=frame_index)
         module = frame.get("module") if frame else None
         return module or "<no-module>"
 
     elif variable_key in ("package", "stack.package"):
-        frame = get_crash_frame_from_event_data(event_data)
+        frame = get_crash_frame_from_event_data(event_data, frame_index=frame_index)
         pkg = frame.get("package") if frame else None
         if pkg:
             # If the package is formatted as either a POSIX or Windows path, grab the last segment
@@ -154,14 +156,16 @@ def resolve_fingerprint_variable(
         return None
 
 
-def resolve_fingerprint_values(fingerprint: list[str], event_data: NodeData) -> list[str]:
+def resolve_fingerprint_values(
+    fingerprint: list[str], event_data: NodeData, frame_index: FrameIndex | None = None
+) -> list[str]:
     def _resolve_single_entry(entry: str) -> str:
         variable_key = parse_fingerprint_entry_as_variable(entry)
         if variable_key == "default":  # entry is some variation of `{{ default }}`
             return DEFAULT_FINGERPRINT_VARIABLE
         if variable_key is None:  # entry isn't a variable
             return entry
-        resolved_value = resolve_fingerprint_variable(variable_key, event_data)
+        resolved_value = resolve_fingerprint_variable(variable_key, event_data, frame_index)
         if resolved_value is None:  # variable wasn't recognized
             return entry
         return resolved_value
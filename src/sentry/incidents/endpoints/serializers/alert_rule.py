@@ -12,6 +12,7 @@ from drf_spectacular.utils import extend_schema_serializer
 
 from sentry import features
 from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers.dataloader import get_user_loader
 from sentry.api.serializers.models.rule import RuleSerializer
 from sentry.incidents.models.alert_rule import (
     AlertRule,
@@ -32,7 +33,6 @@ from sentry.snuba.models import SnubaQueryEventType
 from sentry.uptime.models import ProjectUptimeSubscription
 from sentry.users.models.user import User
 from sentry.users.services.user import RpcUser
-from sentry.users.services.user.service import user_service
 
 logger = logging.getLogger(__name__)
 
@@ -197,12 +197,9 @@ class AlertRuleSerializer(Serializer):
             )
         )
 
-        user_by_user_id: MutableMapping[int, RpcUser] = {
-            user.id: user
-            for user in user_service.get_many_by_id(
-                ids=[r.user_id for r in rule_activities if r.user_id is not None]
-            )
-        }
+        user_by_user_id: Mapping[int, RpcUser] = get_user_loader().load_many(
+            r.user_id for r in rule_activities if r.user_id is not None
+        )
         for rule_activity in rule_activities:
             if rule_activity.user_id is not None:
                 rpc_user = user_by_user_id.get(rule_activity.user_id)
@@ -1,7 +1,11 @@
 import logging
 
+from django.db.models import prefetch_related_objects
+
 from sentry.api.serializers import Serializer, register
+from sentry.api.serializers.dataloader import get_team_loader
 from sentry.incidents.models.alert_rule import AlertRuleTriggerAction
+from sentry.models.organizationmember import OrganizationMember
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +73,51 @@ def get_input_channel_id(action_type, target_identifier=None):
 
 @register(AlertRuleTriggerAction)
 class AlertRuleTriggerActionSerializer(Serializer):
+    def get_attrs(self, item_list, user, **kwargs):
+        # Resolves `AlertRuleTriggerAction.target` for all the actions at once
+        team_ids = set()
+        member_user_ids = set()
+        for action in item_list:
+            if action.target_identifier is None:
+                continue
+            if action.target_type == AlertRuleTriggerAction.TargetType.TEAM.value:
+                team_ids.add(int(action.target_identifier))
+            elif action.target_type == AlertRuleTriggerAction.TargetType.USER.value:
+                member_user_ids.add(int(action.target_identifier))
+
+        teams = get_team_loader().load_many(team_ids)
+        members = {}
+        if member_user_ids:
+            prefetch_related_objects(item_list, "alert_rule_trigger__alert_rule")
+            members = {
+                (member.organization_id, member.user_id): member
+                for member in OrganizationMember.objects.filter(
+                    organization_id__in={
+                        action.alert_rule_trigger.alert_rule.organization_id
+                        for action in item_list
+                    },
+                    user_id__in=member_user_ids,
+                )
+            }
+
+        result = {}
+        for action in item_list:
+            target = None
+            if action.target_identifier is None:
+                pass
+            elif action.target_type == AlertRuleTriggerAction.TargetType.TEAM.value:
+                target = teams.get(int(action.target_identifier))
+            elif action.target_type == AlertRuleTriggerAction.TargetType.USER.value:
+                target = members.get(
+                    (
+                        action.alert_rule_trigger.alert_rule.organization_id,
+                        int(action.target_identifier),
+                    )
+                )
+            elif action.target_type == AlertRuleTriggerAction.TargetType.SPECIFIC.value:
+                target = action.target_identifier
+            result[action] = {"target": target}
+        return result
 
     def serialize(self, obj, attrs, user, **kwargs):
         from sentry.incidents.serializers import ACTION_TARGET_TYPE_TO_STRING
@@ -96,9 +145,9 @@ class AlertRuleTriggerActionSerializer(Serializer):
                 obj.type,
                 obj.target_type,
                 obj.target_identifier,
-                obj.target,
+                attrs["target"],
                 obj.target_display,
-                obj.target,
+                attrs["target"],
                 priority,
             ),
             "priority": (
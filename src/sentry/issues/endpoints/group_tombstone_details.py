@@ -6,6 +6,7 @@ from sentry.api.api_publish_status import ApiPublishStatus
 from sentry.api.base import region_silo_endpoint
 from sentry.api.bases import ProjectEndpoint
 from sentry.api.exceptions import ResourceDoesNotExist
+from sentry.grouping.ingest import grouphash_cache
 from sentry.models.grouphash import GroupHash
 from sentry.models.grouptombstone import GroupTombstone
 from sentry.models.project import Project
@@ -37,10 +38,12 @@ class GroupTombstoneDetailsEndpoint(ProjectEndpoint):
         except GroupTombstone.DoesNotExist:
             raise ResourceDoesNotExist
 
-        GroupHash.objects.filter(project_id=project.id, group_tombstone_id=tombstone_id).update(
-            # will allow new events to be captured
-            group_tombstone_id=None
+        grouphashes = GroupHash.objects.filter(
+            project_id=project.id, group_tombstone_id=tombstone_id
         )
+        with grouphash_cache.invalidating(grouphashes):
+            # will allow new events to be captured
+            grouphashes.update(group_tombstone_id=None)
 
         tombstone.delete()
 
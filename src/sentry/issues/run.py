@@ -64,7 +64,13 @@ class OccurrenceStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         )
 
     def create_batched_parallel_worker(self, commit: Commit) -> ProcessingStrategy[KafkaPayload]:
+        from sentry.buffer.coalescing import enable_local_buffer, flush_before_commit
+
         assert self.worker is not None
+        # Batches are processed in this process, so buffer increments of a whole batch can be
+        # coalesced and flushed before the batch is committed.
+        if enable_local_buffer("ingest-occurrences") is not None:
+            commit = flush_before_commit(commit)
         batch_processor = RunTask(
             function=functools.partial(process_batch, self.worker),
             next_step=CommitOffsets(commit),
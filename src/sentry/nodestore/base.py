@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import struct
 from collections.abc import Mapping
 from datetime import datetime, timedelta
 from threading import local
 from typing import Any
 
+import orjson
 import sentry_sdk
+import zstandard
 from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.nodestore import lru
 from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
@@ -28,6 +32,31 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+# Nodes written in the framed format start with this magic, which can never
+# start a legacy (JSON or pickled) node. It is followed by a header of
+# ``(subkey length, segment offset, segment length)`` entries, one per
+# subkey, the subkey names, and finally the segments themselves: the JSON of
+# each subkey, compressed with zstd on its own. The first segment is always
+# the default (`None`) subkey. Backends store framed nodes as they are,
+# without compressing them as a whole.
+FRAMED_MAGIC = b"\x00NF1"
+_framed_count = struct.Struct("<H")
+_framed_entry = struct.Struct("<HII")
+
+
+def _loads_segment(segment: memoryview) -> Any:
+    """
+    Decompresses and parses a segment of a framed node, straight from the
+    node's buffer.
+    """
+    value = zstandard.ZstdDecompressor().decompress(segment)
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        # orjson rejects some of what `json_dumps` writes, such as NaN or
+        # integers beyond 64 bits.
+        return json_loads(value)
+
 
 class NodeStorage(local, Service):
     """
@@ -62,6 +91,13 @@ class NodeStorage(local, Service):
 
     This is used in reprocessing to store a snapshot of the event from multiple
     stages of the pipeline.
+
+    Nodes written in the framed format (see `FRAMED_MAGIC`) compress each
+    subkey on its own instead, trading some of that compression ratio for
+    reading a subkey without decompressing the others.
+
+    Reads can additionally go through a process-local LRU in front of the
+    remote cache and the backend, see `sentry.nodestore.lru`.
     """
 
     __all__ = (
@@ -72,7 +108,10 @@ class NodeStorage(local, Service):
         "get_multi",
         "set",
         "set_bytes",
+        "set_bytes_multi",
+        "set_multi",
         "set_subkeys",
+        "set_subkeys_multi",
         "cleanup",
         "validate",
         "bootstrap",
@@ -100,6 +139,10 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if value.startswith(FRAMED_MAGIC):
+            segment = self._get_framed_segment(value, subkey)
+            return _loads_segment(segment) if segment is not None else None
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -120,6 +163,28 @@ class NodeStorage(local, Service):
         except StopIteration:
             return None
 
+    def _get_framed_segment(self, value: bytes, subkey: str | None) -> memoryview | None:
+        """
+        Returns a view of the segment for ``subkey`` in a framed node, without
+        copying or decompressing any of the other segments.
+        """
+        view = memoryview(value)
+        pos = len(FRAMED_MAGIC)
+        (count,) = _framed_count.unpack_from(view, pos)
+        pos += _framed_count.size
+        names_pos = pos + count * _framed_entry.size
+
+        _subkey = subkey.encode("ascii") if subkey is not None else b""
+        for i in range(count):
+            name_length, offset, length = _framed_entry.unpack_from(view, pos)
+            pos += _framed_entry.size
+            name = view[names_pos : names_pos + name_length]
+            names_pos += name_length
+            if (i == 0) == (subkey is None) and name == _subkey:
+                return view[offset : offset + length]
+
+        return None
+
     def get_bytes(self, id: str) -> bytes | None:
         """
         >>> nodestore._get_bytes('key1')
@@ -136,6 +201,12 @@ class NodeStorage(local, Service):
         >>> nodestore.get('key1')
         {"message": "hello world"}
         """
+        local_cache = lru.get_lru()
+        if local_cache is not None:
+            return local_cache.get_many([id], subkey, lambda _: {id: self._get(id, subkey)}).get(id)
+        return self._get(id, subkey)
+
+    def _get(self, id: str, subkey: str | None = None) -> Any:
         with sentry_sdk.start_span(op="nodestore.get") as span:
             span.set_tag("node_id", id)
             if subkey is None:
@@ -179,9 +250,18 @@ class NodeStorage(local, Service):
             "key2": {"message": "hello world"}
         }
         """
+        # Deduplicate ids, preserving order
+        id_list = list(dict.fromkeys(id_list))
+
+        local_cache = lru.get_lru()
+        if local_cache is not None:
+            return local_cache.get_many(
+                id_list, subkey, lambda ids: self._get_multi(ids, subkey=subkey)
+            )
+        return self._get_multi(id_list, subkey=subkey)
+
+    def _get_multi(self, id_list: list[str], subkey: str | None = None) -> dict[str, Any | None]:
         with sentry_sdk.start_span(op="nodestore.get_multi") as span:
-            # Deduplicate ids, preserving order
-            id_list = list(dict.fromkeys(id_list))
             span.set_tag("subkey", str(subkey))
             span.set_tag("num_ids", len(id_list))
 
@@ -218,6 +298,9 @@ class NodeStorage(local, Service):
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
         """
+        if options.get("nodestore.framed-encoding.enabled"):
+            return self._encode_framed(data)
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             if key is not None:
@@ -226,6 +309,32 @@ class NodeStorage(local, Service):
 
         return b"\n".join(lines)
 
+    def _encode_framed(self, data: dict[str | None, Mapping[str, Any]]) -> bytes:
+        """
+        Encode data dict in the framed format, see `FRAMED_MAGIC`. Subkeys can
+        then be read without decompressing or parsing the rest of the node.
+        """
+        compressor = zstandard.ZstdCompressor()
+        names = [b""]
+        segments = [compressor.compress(json_dumps(data.pop(None)).encode("utf8"))]
+        for key, value in data.items():
+            if key is not None:
+                names.append(key.encode("ascii"))
+                segments.append(compressor.compress(json_dumps(value).encode("utf8")))
+
+        header = [FRAMED_MAGIC, _framed_count.pack(len(segments))]
+        offset = (
+            len(FRAMED_MAGIC)
+            + _framed_count.size
+            + len(segments) * _framed_entry.size
+            + sum(len(name) for name in names)
+        )
+        for name, segment in zip(names, segments):
+            header.append(_framed_entry.pack(len(name), offset, len(segment)))
+            offset += len(segment)
+
+        return b"".join([*header, *names, *segments])
+
     def set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         """
         >>> nodestore.set_bytes('key1', b"{'foo': 'bar'}")
@@ -236,6 +345,25 @@ class NodeStorage(local, Service):
     def _set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         raise NotImplementedError
 
+    def set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        """
+        Write multiple nodes, ideally in a single round-trip to the backend.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+
+        >>> nodestore.set_bytes_multi({'key1': b"{'foo': 'bar'}", 'key2': b"{'foo': 'baz'}"})
+        """
+        for data in items.values():
+            metrics.distribution("nodestore.set_bytes", len(data))
+        return self._set_bytes_multi(items, ttl)
+
+    def _set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        # This implementation should be overridden by backends that support
+        # batched writes.
+        for item_id, data in items.items():
+            self._set_bytes(item_id, data, ttl)
+
     def set(self, item_id: str, data: Mapping[str, Any], ttl: timedelta | None = None) -> None:
         """
         Set value for `item_id`. Note that this deletes existing subkeys for `item_id` as
@@ -245,6 +373,18 @@ class NodeStorage(local, Service):
         """
         return self.set_subkeys(item_id, {None: data}, ttl=ttl)
 
+    def set_multi(
+        self, items: Mapping[str, Mapping[str, Any]], ttl: timedelta | None = None
+    ) -> None:
+        """
+        Like `set`, for multiple nodes.
+
+        >>> nodestore.set_multi({'key1': {'foo': 'bar'}, 'key2': {'foo': 'baz'}})
+        """
+        return self.set_subkeys_multi(
+            {item_id: {None: data} for item_id, data in items.items()}, ttl=ttl
+        )
+
     @sentry_sdk.tracing.trace
     def set_subkeys(
         self, item_id: str, data: dict[str | None, Mapping[str, Any]], ttl: timedelta | None = None
@@ -265,10 +405,36 @@ class NodeStorage(local, Service):
         cache_item = data.get(None)
         bytes_data = self._encode(data)
         self.set_bytes(item_id, bytes_data, ttl=ttl)
+        lru.invalidate([item_id])
         # set cache only after encoding and write to nodestore has succeeded
         if options.get("nodestore.set-subkeys.enable-set-cache-item"):
             self._set_cache_item(item_id, cache_item)
 
+    @sentry_sdk.tracing.trace
+    def set_subkeys_multi(
+        self,
+        items: Mapping[str, dict[str | None, Mapping[str, Any]]],
+        ttl: timedelta | None = None,
+    ) -> None:
+        """
+        Like `set_subkeys`, for multiple nodes.
+
+        >>> nodestore.set_subkeys_multi({
+        ...     'key1': {None: {'foo': 'bar'}, "reprocessing": {'foo': 'bam'}},
+        ...     'key2': {None: {'foo': 'baz'}},
+        ... })
+        """
+        if not items:
+            return
+
+        cache_items = {item_id: data.get(None) for item_id, data in items.items()}
+        bytes_data = {item_id: self._encode(data) for item_id, data in items.items()}
+        self.set_bytes_multi(bytes_data, ttl=ttl)
+        lru.invalidate(list(items))
+        # set cache only after encoding and write to nodestore has succeeded
+        if options.get("nodestore.set-subkeys.enable-set-cache-item"):
+            self._set_cache_items({k: v for k, v in cache_items.items() if v})
+
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         raise NotImplementedError
 
@@ -296,10 +462,12 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        lru.invalidate([item_id])
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        lru.invalidate(id_list)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Mapping
 from datetime import timedelta
 from typing import Any
 
 import sentry_sdk
 
-from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.base import FRAMED_MAGIC, NodeStorage
 from sentry.utils.kvstore.bigtable import BigtableKVStorage
 
 
@@ -74,7 +75,17 @@ class BigtableNodeStorage(NodeStorage):
         return rv
 
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
-        self.store.set(id, data, ttl)
+        # Framed nodes compress each of their segments on their own
+        self.store.set(id, data, ttl, compress=not data.startswith(FRAMED_MAGIC))
+
+    @sentry_sdk.tracing.trace
+    def _set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        framed = [(id, data) for id, data in items.items() if data.startswith(FRAMED_MAGIC)]
+        other = [(id, data) for id, data in items.items() if not data.startswith(FRAMED_MAGIC)]
+        if framed:
+            self.store.set_many(framed, ttl, compress=False)
+        if other:
+            self.store.set_many(other, ttl)
 
     def delete(self, id: str) -> None:
         if self.skip_deletes:
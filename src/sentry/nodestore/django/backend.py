@@ -1,22 +1,40 @@
 from __future__ import annotations
 
+import base64
 import logging
 import math
 import pickle
+import zlib
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 from typing import Any
 
 from django.utils import timezone
 
 from sentry.db.models.query import create_or_update
-from sentry.nodestore.base import NodeStorage
-from sentry.utils.strings import compress, decompress
+from sentry.nodestore import lru
+from sentry.nodestore.base import FRAMED_MAGIC, NodeStorage
+from sentry.utils.strings import compress
 
 from .models import Node
 
 logger = logging.getLogger("sentry")
 
 
+def _compress(data: bytes) -> str:
+    if data.startswith(FRAMED_MAGIC):
+        # Framed nodes compress each of their segments on their own
+        return base64.b64encode(data).decode("utf-8")
+    return compress(data)
+
+
+def _decompress(data: str) -> bytes:
+    value = base64.b64decode(data)
+    if value.startswith(FRAMED_MAGIC):
+        return value
+    return zlib.decompress(value)
+
+
 class DjangoNodeStorage(NodeStorage):
     def delete(self, id: str) -> None:
         Node.objects.filter(id=id).delete()
@@ -27,7 +45,7 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith((b"{", FRAMED_MAGIC)):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
@@ -41,19 +59,31 @@ class DjangoNodeStorage(NodeStorage):
     def _get_bytes(self, id: str) -> bytes | None:
         try:
             data = Node.objects.get(id=id).data
-            return decompress(data)
+            return _decompress(data)
         except Node.DoesNotExist:
             return None
 
     def _get_bytes_multi(self, id_list: list[str]) -> dict[str, bytes | None]:
-        return {n.id: decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
+        return {n.id: _decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
 
     def delete_multi(self, id_list: list[str]) -> None:
         Node.objects.filter(id__in=id_list).delete()
         self._delete_cache_items(id_list)
 
     def _set_bytes(self, id: str, data: Any, ttl: timedelta | None = None) -> None:
-        create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
+        create_or_update(
+            Node, id=id, values={"data": _compress(data), "timestamp": timezone.now()}
+        )
+
+    def _set_bytes_multi(self, items: Mapping[str, bytes], ttl: timedelta | None = None) -> None:
+        now = timezone.now()
+        Node.objects.bulk_create(
+            # Sorted, so that concurrent upserts of overlapping batches lock rows in the same order.
+            [Node(id=id, data=_compress(data), timestamp=now) for id, data in sorted(items.items())],
+            update_conflicts=True,
+            update_fields=["data", "timestamp"],
+            unique_fields=["id"],
+        )
 
     def cleanup(self, cutoff_timestamp: datetime) -> None:
         from sentry.db.deletion import BulkDeleteQuery
@@ -62,6 +92,7 @@ class DjangoNodeStorage(NodeStorage):
         days = math.floor(total_seconds / 86400)
 
         BulkDeleteQuery(model=Node, dtfield="timestamp", days=days).execute()
+        lru.clear()
         if self.cache:
             self.cache.clear()
 
@@ -0,0 +1,244 @@
+"""
+Process-local read-through cache for nodestore.
+
+Post-processing, rule processing and the issue details API tend to load the
+same events several times within a couple of seconds, and every load that
+misses the (optional) remote ``nodedata`` cache goes to the backend. The
+`NodeLRUCache` sits in front of both of them:
+
+* Entries are keyed by ``(node_id, subkey)`` and hold the pickled node, like
+  Django's cache backends do, so callers never share mutable state. The size
+  of the pickle is what counts against ``max_bytes``.
+* Entries expire after ``ttl`` seconds. Writes and deletes through
+  `NodeStorage` invalidate every subkey of a node in this process, but not in
+  other processes, which may keep serving the previous value until it expires.
+* Concurrent loads of the same key within a process are coalesced, so only one
+  thread goes to the remote cache or backend for it (single-flight).
+* Missing nodes are not cached.
+
+The cache is shared by all threads of a process and is configured through the
+``nodestore.lru.*`` options.
+"""
+
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sentry import options
+from sentry.utils import metrics
+
+# How long threads wait for a concurrent load of the same key before loading it themselves.
+FLIGHT_TIMEOUT = 10.0
+
+_MISSING = object()
+
+CacheKey = tuple[str, str | None]
+
+
+class _Flight:
+    __slots__ = ("done", "value")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = _MISSING
+
+
+class NodeLRUCache:
+    """
+    A bounded, thread-safe LRU of nodestore values with single-flight loading.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (pickled value, expires at)
+        self._entries: OrderedDict[CacheKey, tuple[bytes, float]] = OrderedDict()
+        self._subkeys: defaultdict[str, set[str | None]] = defaultdict(set)
+        self._flights: dict[CacheKey, _Flight] = {}
+        self._size = 0
+        # Bumped on every invalidation, so that loads which started before it don't store their
+        # (possibly outdated) result.
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _remove(self, key: CacheKey) -> None:
+        data, _ = self._entries.pop(key)
+        self._size -= len(data)
+        subkeys = self._subkeys[key[0]]
+        subkeys.discard(key[1])
+        if not subkeys:
+            del self._subkeys[key[0]]
+
+    def _store(self, key: CacheKey, value: Any, now: float) -> int:
+        """
+        Stores ``value`` and evicts the least recently used entries until the cache fits into
+        ``max_bytes`` again. Returns the number of evicted entries.
+        """
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            metrics.incr("nodestore.lru.unpicklable")
+            return 0
+
+        if len(data) > self.max_bytes:
+            metrics.incr("nodestore.lru.too_large")
+            return 0
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (data, now + self.ttl)
+        self._subkeys[key[0]].add(key[1])
+        self._size += len(data)
+
+        evicted = 0
+        while self._size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            evicted += 1
+        return evicted
+
+    def get_many(
+        self,
+        id_list: Sequence[str],
+        subkey: str | None,
+        load: Callable[[list[str]], dict[str, Any | None]],
+    ) -> dict[str, Any | None]:
+        """
+        Returns the values of all nodes in ``id_list``. Nodes which are neither cached nor being
+        loaded by another thread are passed to ``load`` in one call, which must return a value
+        (or `None`) for each of them.
+        """
+        now = time.monotonic()
+        rv: dict[str, Any | None] = {}
+        owned: list[tuple[str, _Flight]] = []
+        waiting: list[tuple[str, _Flight]] = []
+        expired = 0
+
+        with self._lock:
+            generation = self._generation
+            for id in id_list:
+                key = (id, subkey)
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if entry[1] > now:
+                        self._entries.move_to_end(key)
+                        rv[id] = pickle.loads(entry[0])
+                        continue
+                    self._remove(key)
+                    expired += 1
+
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = _Flight()
+                    owned.append((id, flight))
+                else:
+                    waiting.append((id, flight))
+
+        if rv:
+            metrics.incr("nodestore.lru.hit", amount=len(rv))
+        if owned:
+            metrics.incr("nodestore.lru.miss", amount=len(owned))
+        if waiting:
+            metrics.incr("nodestore.lru.coalesced", amount=len(waiting))
+        if expired:
+            metrics.incr("nodestore.lru.eviction", amount=expired, tags={"reason": "ttl"})
+
+        if owned:
+            loaded: dict[str, Any | None] = {}
+            try:
+                loaded = load([id for id, _ in owned])
+            finally:
+                evicted = 0
+                with self._lock:
+                    for id, flight in owned:
+                        key = (id, subkey)
+                        if self._flights.get(key) is flight:
+                            del self._flights[key]
+                        if id not in loaded:
+                            continue
+                        value = flight.value = rv[id] = loaded[id]
+                        if value is not None and generation == self._generation:
+                            evicted += self._store(key, value, now)
+                    size = self._size
+                for _, flight in owned:
+                    flight.done.set()
+
+                if evicted:
+                    metrics.incr("nodestore.lru.eviction", amount=evicted, tags={"reason": "size"})
+                metrics.gauge("nodestore.lru.bytes", size)
+
+        retry = []
+        for id, flight in waiting:
+            if flight.done.wait(FLIGHT_TIMEOUT) and flight.value is not _MISSING:
+                # Hand out a copy, the loading thread returned the original to its caller.
+                rv[id] = pickle.loads(pickle.dumps(flight.value, protocol=pickle.HIGHEST_PROTOCOL))
+            else:
+                # The other thread failed or is too slow, load it without coalescing.
+                retry.append(id)
+        if retry:
+            metrics.incr("nodestore.lru.flight_failed", amount=len(retry))
+            rv.update(load(retry))
+
+        return rv
+
+    def delete(self, id_list: Sequence[str]) -> None:
+        with self._lock:
+            self._generation += 1
+            for id in id_list:
+                for subkey in list(self._subkeys.get(id, ())):
+                    self._remove((id, subkey))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._subkeys.clear()
+            self._size = 0
+
+
+_lru: NodeLRUCache | None = None
+_lru_lock = threading.Lock()
+
+
+def get_lru() -> NodeLRUCache | None:
+    """
+    Returns the process-wide cache, or `None` if it is disabled.
+    """
+    global _lru
+
+    if not options.get("nodestore.lru.enabled"):
+        return None
+
+    max_bytes = options.get("nodestore.lru.max-bytes")
+    ttl = options.get("nodestore.lru.ttl-seconds")
+
+    if _lru is None:
+        with _lru_lock:
+            if _lru is None:
+                _lru = NodeLRUCache(max_bytes=max_bytes, ttl=ttl)
+
+    # Resizing takes effect on the next insert, a new TTL for new entries.
+    _lru.max_bytes = max_bytes
+    _lru.ttl = ttl
+    return _lru
+
+
+def invalidate(id_list: Sequence[str]) -> None:
+    if _lru is not None:
+        _lru.delete(id_list)
+
+
+def clear() -> None:
+    if _lru is not None:
+        _lru.clear()
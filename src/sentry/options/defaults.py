@@ -751,8 +751,48 @@ register("snuba.search.chunk-growth-rate", default=1.5, flags=FLAG_AUTOMATOR_MOD
 register("snuba.search.max-chunk-size", default=2000, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.max-total-chunk-time-seconds", default=30.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 register("snuba.search.hits-sample-size", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Size post-filtered search chunks from the estimated selectivity, see `sentry.search.snuba.chunking`
+register(
+    "snuba.search.adaptive-chunking.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# How many more groups than estimated to be needed are fetched per chunk
+register(
+    "snuba.search.adaptive-chunking.headroom", default=1.25, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
 register("snuba.track-outcomes-sample-rate", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Snuba query result cache (`use_cache=True`), see `sentry.utils.snuba_query_cache`
+register(
+    "snuba.query-cache.single-flight.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# How long results are still served after their TTL while one caller refreshes them
+register("snuba.query-cache.stale-ttl-seconds", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Per-referrer overrides of both TTLs, e.g. {"<referrer>": {"ttl": 120, "stale_ttl": 600}}
+register(
+    "snuba.query-cache.referrer-policies",
+    type=Dict,
+    default={},
+    flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Send Snuba queries from an event loop over pooled keep-alive connections, see
+# `sentry.utils.snuba_transport`
+register(
+    "snuba.async-transport.enabled", type=Bool, default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+register("snuba.async-transport.max-connections", default=50, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register(
+    "snuba.async-transport.max-concurrent-per-referrer",
+    default=10,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register(
     "snuba.tagstore.cache-tagkeys-rate",
@@ -803,6 +843,16 @@ register(
     "processing.sourcemapcache-processor", default=0.0, flags=FLAG_AUTOMATOR_MODIFIABLE
 )  # unused
 
+# Process-local layer in front of the frame cache used by stacktrace processors. Entries are kept
+# for at most `ttl-seconds`, 0 entries disable it.
+register("processing.frame-cache.local-max-entries", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register(
+    "processing.frame-cache.local-ttl-seconds",
+    type=Float,
+    default=60.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Killswitch for sending internal errors to the internal project or
 # `SENTRY_SDK_CONFIG.relay_dsn`. Set to `0` to only send to
 # `SENTRY_SDK_CONFIG.dsn` (the "upstream transport") and nothing else.
@@ -1046,6 +1096,27 @@ register(
 )
 
 
+# Process-local deduplication of identical Seer similarity requests during ingest, see
+# `sentry.seer.similarity.similar_issues_cache`
+register(
+    "seer.similarity.ingest.request_cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "seer.similarity.ingest.request_cache.max_entries",
+    type=Int,
+    default=1000,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "seer.similarity.ingest.request_cache.ttl_seconds",
+    type=Float,
+    default=30.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # TODO: Once Seer grouping is GA-ed, we probably either want to turn this down or get rid of it in
 # favor of the default 10% sample rate
 register(
@@ -1147,6 +1218,18 @@ register(
     default=[],
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Load independent serializer attributes concurrently, see `sentry.api.serializers.attribute_loader`
+register(
+    "api.serializers.concurrent-attrs.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "api.serializers.concurrent-attrs.timeout-seconds",
+    default=30.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "issues.severity.skip-seer-requests",
     type=Sequence,
@@ -2054,6 +2137,49 @@ register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_
 register(
     "nodestore.set-subkeys.enable-set-cache-item", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Write nodes in the framed format, whose subkeys can be read independently. Only enable this once
+# every deployed reader understands the format, and never roll back to a release which doesn't:
+# framed nodes stay around for the whole nodestore retention after this is disabled again.
+register("nodestore.framed-encoding.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Process-local LRU in front of the nodedata cache and the nodestore backend.
+# See `sentry.nodestore.lru`.
+register("nodestore.lru.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("nodestore.lru.max-bytes", default=64 * 1024 * 1024, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Bounds how long other processes may serve a node after it was changed or deleted.
+register("nodestore.lru.ttl-seconds", type=Float, default=10.0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# === TSDB related runtime options ===
+
+# Seconds for which RedisTSDB caches the union of closed distinct counter buckets queried by
+# `get_distinct_counts_totals`. 0 disables the cache.
+register("tsdb.redis.distinct-counts-union-ttl", default=0, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Seconds after the end of a bucket before it is included in cached unions, so that most late data
+# is recorded by then.
+register(
+    "tsdb.redis.distinct-counts-union-grace-seconds", default=60, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+
+# === Buffer related runtime options ===
+
+# Flush pending RedisBuffer keys in bulk: many keys are read with pipelined Redis
+# commands and applied with one multi-row UPDATE per model instead of one per key.
+register("buffer.bulk-flush.enabled", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Number of pending keys handed to a single `process_incr` task in bulk flush mode.
+register("buffer.bulk-flush.batch-size", default=500, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Consumers which pre-aggregate `buffer_incr` calls in process before forwarding them to the
+# buffer backend. See `sentry.buffer.coalescing`.
+register(
+    "buffer.coalescing.consumers",
+    type=Sequence,
+    default=[],
+    flags=FLAG_ALLOW_EMPTY | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Number of distinct keys held locally before they are flushed to the buffer backend.
+register("buffer.coalescing.max-keys", default=1000, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Maximum time in seconds increments are held locally before they are flushed.
+register(
+    "buffer.coalescing.max-age-seconds", type=Float, default=1.0, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
 
 # === Backpressure related runtime options ===
 
@@ -2609,6 +2735,54 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Run background grouping in a bounded thread pool instead of inline during event saving, and drop
+# it if the queue is full. Secondary grouping always runs inline, since its hashes are only needed
+# once primary grouping has found no group, and then right away. The pool size options take effect
+# after a restart.
+register(
+    "grouping.async_grouping.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register("grouping.async_grouping.workers", default=2, flags=FLAG_AUTOMATOR_MODIFIABLE)
+register("grouping.async_grouping.max_queued", default=100, flags=FLAG_AUTOMATOR_MODIFIABLE)
+
+# Process-local memoization of stacktrace grouping components, see
+# `sentry.grouping.strategies.stacktrace_cache`
+register(
+    "grouping.stacktrace_cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "grouping.stacktrace_cache.max_entries",
+    default=10_000,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Rate at which to recompute stacktrace components found in the cache and compare the results
+register(
+    "grouping.stacktrace_cache.validation_sample_rate",
+    type=Float,
+    default=0.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Shared read cache of grouphash records on the ingest path, see
+# `sentry.grouping.ingest.grouphash_cache`
+register(
+    "grouping.grouphash_cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register("grouping.grouphash_cache.ttl_seconds", default=60, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# How long hashes without a grouphash record are remembered as missing
+register(
+    "grouping.grouphash_cache.negative_ttl_seconds", default=10, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+
 register(
     "metrics.sample-list.sample-rate",
     type=Float,
@@ -2726,6 +2900,14 @@ register(
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Assemble segments for flushing in a Redis script, which trims them to max-segment-bytes and
+# streams them back in pages instead of scanning them into the flusher.
+register(
+    "spans.buffer.flusher.server-side-assembly",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Compression level for spans buffer segments. Default -1 disables compression, 0-22 for zstd levels
 register(
     "spans.buffer.compression.level",
@@ -2733,6 +2915,48 @@ register(
     default=-1,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Compress span buffer segments with a zstd dictionary trained on sampled spans.
+# Only has an effect if compression is enabled. See `sentry.spans.compression`.
+register(
+    "spans.buffer.compression.dictionary.enabled",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Fraction of incoming spans that are sampled for dictionary training.
+register(
+    "spans.buffer.compression.dictionary.sample-rate",
+    type=Float,
+    default=0.01,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Number of sampled spans required before a dictionary is trained.
+register(
+    "spans.buffer.compression.dictionary.min-samples",
+    type=Int,
+    default=1000,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Maximum number of sampled spans kept per consumer for dictionary training.
+register(
+    "spans.buffer.compression.dictionary.max-samples",
+    type=Int,
+    default=5000,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Size of trained dictionaries in bytes.
+register(
+    "spans.buffer.compression.dictionary.size",
+    type=Int,
+    default=112640,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Minimum time in seconds between two dictionary trainings.
+register(
+    "spans.buffer.compression.dictionary.training-interval",
+    type=Int,
+    default=3600,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Segments consumer
 register(
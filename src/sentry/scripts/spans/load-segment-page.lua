@@ -0,0 +1,63 @@
+--[[
+
+Load one page of a segment from the span buffer for flushing.
+
+On the first page, the segment is trimmed to `max_segment_bytes` by removing its oldest
+payloads, so that oversized segments never have to be transferred to the flusher. This is the
+only place where the size of a segment is limited when assembling it server-side. Sizes are
+those of the stored (possibly compressed) payloads.
+
+Pages are read with ZSCAN, whose cursor stays valid while spans are added to the segment
+between pages: every payload present for the whole iteration is returned, though possibly more
+than once.
+
+KEYS:
+- set_key -- "span-buf:z:{project_id:trace_id}:span_id"
+
+ARGS:
+- cursor -- the ZSCAN cursor of the page to return
+- is_first_page -- 1 on the first page, which trims the segment
+- page_size -- int
+- max_segment_bytes -- int
+
+Returns {next_cursor, num_trimmed, *payloads}. next_cursor is "0" once the entire segment
+has been returned.
+
+]]--
+
+local set_key = KEYS[1]
+
+local cursor = ARGV[1]
+local is_first_page = tonumber(ARGV[2]) == 1
+local page_size = tonumber(ARGV[3])
+local max_segment_bytes = tonumber(ARGV[4])
+
+local num_trimmed = 0
+
+if is_first_page then
+    local payloads = redis.call("zrange", set_key, 0, -1)
+    local total_bytes = 0
+    for i = 1, #payloads do
+        total_bytes = total_bytes + #payloads[i]
+    end
+
+    -- Payloads are sorted by their end timestamp, so the oldest ones go first.
+    while total_bytes > max_segment_bytes and num_trimmed < #payloads do
+        num_trimmed = num_trimmed + 1
+        total_bytes = total_bytes - #payloads[num_trimmed]
+    end
+
+    if num_trimmed > 0 then
+        redis.call("zremrangebyrank", set_key, 0, num_trimmed - 1)
+    end
+end
+
+local scan_result = redis.call("zscan", set_key, cursor, "COUNT", page_size)
+local members_and_scores = scan_result[2]
+
+local result = {scan_result[1], num_trimmed}
+for i = 1, #members_and_scores, 2 do
+    table.insert(result, members_and_scores[i])
+end
+
+return result
@@ -0,0 +1,77 @@
+--[[
+
+Count distinct items over a range of HyperLogLog buckets, caching the union of closed buckets.
+
+Buckets that have closed do not receive new items (apart from late data), so their union is
+stored under a short-lived key and reused by subsequent queries over the same range. When the
+range is extended by one bucket (same start, end moved by one rollup), the cached union of the
+previous range is merged with the newly closed bucket instead of re-unioning every bucket.
+
+A union expires `ttl` seconds after it was created, and reading it does not extend that. A union
+that was built from the previous one expires together with it, so late data in any closed bucket
+is counted at most `ttl` seconds after the union was last built from all buckets.
+
+Each cached union is stored alongside the version it was built at. The version changes whenever
+the distinct counters of the key are merged or deleted, which invalidates all unions at once.
+
+KEYS:
+- version_key
+- union_key -- the cached union of the closed buckets
+- union_version_key -- the version `union_key` was built at
+- previous_key -- the cached union of the closed buckets but the last one
+- previous_version_key -- the version `previous_key` was built at
+- closed bucket keys, oldest first (`num_closed` of them)
+- open bucket keys
+
+ARGV:
+- ttl -- int, seconds cached unions are kept after their creation
+- num_closed -- int
+
+Returns the estimated number of distinct items in all buckets.
+
+]]--
+
+local version_key = KEYS[1]
+local union_key = KEYS[2]
+local union_version_key = KEYS[3]
+local previous_key = KEYS[4]
+local previous_version_key = KEYS[5]
+
+local ttl = tonumber(ARGV[1])
+local num_closed = tonumber(ARGV[2])
+
+local closed_keys = {}
+for i = 6, 5 + num_closed do
+    table.insert(closed_keys, KEYS[i])
+end
+local open_keys = {}
+for i = 6 + num_closed, #KEYS do
+    table.insert(open_keys, KEYS[i])
+end
+
+if num_closed == 0 then
+    return redis.call("PFCOUNT", unpack(open_keys))
+end
+
+local version = redis.call("GET", version_key) or "0"
+
+if redis.call("GET", union_version_key) ~= version then
+    local ttl_ms = ttl * 1000
+    local previous_ttl_ms = -1
+    if num_closed > 1 and redis.call("GET", previous_version_key) == version then
+        previous_ttl_ms = redis.call("PTTL", previous_key)
+    end
+
+    -- A union of an older version may still be around.
+    redis.call("DEL", union_key)
+    if previous_ttl_ms > 0 then
+        redis.call("PFMERGE", union_key, previous_key, closed_keys[num_closed])
+        ttl_ms = math.min(ttl_ms, previous_ttl_ms)
+    else
+        redis.call("PFMERGE", union_key, unpack(closed_keys))
+    end
+    redis.call("PEXPIRE", union_key, ttl_ms)
+    redis.call("SET", union_version_key, version, "PX", ttl_ms)
+end
+
+return redis.call("PFCOUNT", union_key, unpack(open_keys))
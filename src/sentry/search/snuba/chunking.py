@@ -0,0 +1,121 @@
+"""
+Sizing of the chunks in which `PostgresSnubaQueryExecutor` fetches groups from Snuba when it has to
+post-filter them in Postgres.
+
+Growing chunks geometrically wastes a lot of round-trips on selective searches of big projects,
+where most of the groups returned by Snuba are then filtered out by Postgres. `ChunkPlanner`
+instead estimates which fraction of the groups pass the Postgres filters (the selectivity), from
+the chunks fetched so far and from earlier searches with the same filters, and sizes the next chunk
+to find all the missing results in one go.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from hashlib import md5
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+from django.utils import timezone as django_timezone
+
+from sentry.utils import metrics
+
+if TYPE_CHECKING:
+    from sentry.api.event_search import SearchFilter
+    from sentry.models.project import Project
+
+# How long the selectivity of a search is remembered for
+SELECTIVITY_CACHE_TTL = 60 * 60
+# The weight of the selectivity of the latest search when updating the remembered one
+SELECTIVITY_DECAY = 0.5
+
+
+def _normalize_search_value(raw_value: object, now: datetime) -> str:
+    """
+    Returns a representation of a filter value which doesn't change between otherwise identical
+    searches. Dates are mostly relative to the time of the search (``firstSeen:-24h``), so they are
+    represented by their age, in hours.
+    """
+    if isinstance(raw_value, datetime):
+        if raw_value.tzinfo is None:
+            raw_value = raw_value.replace(tzinfo=timezone.utc)
+        return f"-{round((now - raw_value).total_seconds() / 3600)}h"
+    if isinstance(raw_value, (list, tuple)):
+        return "[{}]".format(",".join(sorted(_normalize_search_value(v, now) for v in raw_value)))
+    return str(raw_value)
+
+
+def get_selectivity_cache_key(
+    projects: Sequence[Project], search_filters: Sequence[SearchFilter] | None
+) -> str:
+    now = django_timezone.now()
+    project_ids = ",".join(str(project_id) for project_id in sorted(p.id for p in projects))
+    filters = sorted(
+        f"{search_filter.key.name}{search_filter.operator}"
+        + _normalize_search_value(search_filter.value.raw_value, now)
+        for search_filter in search_filters or ()
+    )
+    hashable = ":".join([project_ids, *filters])
+    return f"search:selectivity:{md5(hashable.encode('utf-8')).hexdigest()}"
+
+
+class ChunkPlanner:
+    def __init__(
+        self,
+        cache_key: str,
+        limit: int,
+        max_chunk_size: int,
+        growth_rate: float,
+        headroom: float,
+    ) -> None:
+        self.cache_key = cache_key
+        self.limit = limit
+        self.max_chunk_size = max_chunk_size
+        self.growth_rate = growth_rate
+        self.headroom = headroom
+
+        self.prior: float | None = cache.get(cache_key)
+        self.scanned = 0
+        self.matched = 0
+
+    @property
+    def selectivity(self) -> float | None:
+        if self.scanned:
+            if self.matched:
+                return self.matched / self.scanned
+            # Nothing matched so far, so assume that barely less than one group in what we've
+            # scanned would have
+            return 1 / (self.scanned + 1)
+        return self.prior
+
+    def next_chunk_size(self, found: int) -> int:
+        """
+        Returns how many groups to fetch from Snuba next, given that `found` results were found so
+        far.
+        """
+        selectivity = self.selectivity
+        if selectivity is None:
+            # No idea how selective the search is, so start like the static chunking would
+            size = int(self.limit * self.growth_rate)
+        else:
+            missing = max(self.limit - found, 1)
+            size = math.ceil(missing / selectivity * self.headroom)
+        return max(min(size, self.max_chunk_size), self.limit)
+
+    def record_chunk(self, scanned: int, matched: int) -> None:
+        self.scanned += scanned
+        self.matched += matched
+
+    def save(self) -> None:
+        if not self.scanned:
+            return
+
+        selectivity = self.matched / self.scanned
+        metrics.distribution("snuba.search.selectivity", selectivity)
+        if self.prior is not None:
+            selectivity = SELECTIVITY_DECAY * selectivity + (1 - SELECTIVITY_DECAY) * self.prior
+        # Chunks can't be sized from a selectivity of 0, so remember that at most one group in the
+        # largest chunk is a match
+        cache.set(self.cache_key, max(selectivity, 1 / self.max_chunk_size), SELECTIVITY_CACHE_TTL)
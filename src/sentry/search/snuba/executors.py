@@ -64,6 +64,7 @@ from sentry.models.team import Team
 from sentry.search.events.builder.discover import UnresolvedQuery
 from sentry.search.events.filter import convert_search_filter_to_snuba_query, format_search_filter
 from sentry.search.events.types import SnubaParams
+from sentry.search.snuba.chunking import ChunkPlanner, get_selectivity_cache_key
 from sentry.snuba.dataset import Dataset
 from sentry.users.models.user import User
 from sentry.users.services.user.model import RpcUser
@@ -910,6 +911,16 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         chunk_growth = options.get("snuba.search.chunk-growth-rate")
         max_chunk_size = options.get("snuba.search.max-chunk-size")
         chunk_limit = limit
+        chunk_planner = None
+        if not group_ids and options.get("snuba.search.adaptive-chunking.enabled"):
+            # Only post-filtered searches need more than one chunk
+            chunk_planner = ChunkPlanner(
+                get_selectivity_cache_key(projects, search_filters),
+                limit=limit,
+                max_chunk_size=max_chunk_size,
+                growth_rate=chunk_growth,
+                headroom=options.get("snuba.search.adaptive-chunking.headroom"),
+            )
         offset = 0
         num_chunks = 0
         hits = self.calculate_hits(
@@ -950,9 +961,13 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
         while (time.time() - time_start) < max_time:
             num_chunks += 1
 
-            # grow the chunk size on each iteration to account for huge projects
-            # and weird queries, up to a max size
-            chunk_limit = min(int(chunk_limit * chunk_growth), max_chunk_size)
+            if chunk_planner is not None:
+                # size the chunk from how many of the groups have passed post-filtering so far
+                chunk_limit = chunk_planner.next_chunk_size(len(paginator_results.results))
+            else:
+                # grow the chunk size on each iteration to account for huge projects
+                # and weird queries, up to a max size
+                chunk_limit = min(int(chunk_limit * chunk_growth), max_chunk_size)
             # but if we have group_ids always query for at least that many items
             chunk_limit = max(chunk_limit, len(group_ids))
 
@@ -993,9 +1008,13 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             else:
                 # pre-filtered candidates were *not* passed down to Snuba,
                 # so we need to do post-filtering to verify Sentry DB predicates
-                filtered_group_ids = group_queryset.filter(
-                    id__in=[gid for gid, _ in snuba_groups]
-                ).values_list("id", flat=True)
+                filtered_group_ids = list(
+                    group_queryset.filter(id__in=[gid for gid, _ in snuba_groups]).values_list(
+                        "id", flat=True
+                    )
+                )
+                if chunk_planner is not None:
+                    chunk_planner.record_chunk(len(snuba_groups), len(filtered_group_ids))
 
                 group_to_score = dict(snuba_groups)
                 for group_id in filtered_group_ids:
@@ -1043,6 +1062,8 @@ class PostgresSnubaQueryExecutor(AbstractQueryExecutor):
             paginator_results.prev.has_results = True
 
         metrics.distribution("snuba.search.num_chunks", num_chunks)
+        if chunk_planner is not None:
+            chunk_planner.save()
 
         groups = Group.objects.in_bulk(paginator_results.results)
         paginator_results.results = [groups[k] for k in paginator_results.results if k in groups]
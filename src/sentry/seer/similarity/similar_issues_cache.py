@@ -0,0 +1,130 @@
+"""
+Process-local deduplication of Seer similar issues requests made during ingest.
+
+A burst of new errors often carries the very same stacktrace (for example when a deploy breaks one
+code path for many users), and without deduplication every one of them asks Seer for its nearest
+neighbor. Requests are therefore keyed by everything Seer's answer depends on (the project, a
+digest of the stacktrace string, the exception type and the request parameters, but not the event
+or its hash):
+
+* Concurrent requests with the same key are coalesced, so only the first one goes to Seer and the
+  others wait for its result (single-flight).
+* Results which contain at least one similar issue are kept for
+  ``seer.similarity.ingest.request_cache.ttl_seconds``.
+
+Empty results are neither cached nor handed to waiting requests, because Seer stores the
+stacktrace of a request it found no match for. Identical requests made afterwards would be matched
+to the newly stored stacktrace, so they go to Seer themselves.
+
+The cache is configured through the ``seer.similarity.ingest.request_cache.*`` options.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import threading
+from collections.abc import Callable, Mapping
+
+import orjson
+from cachetools import TTLCache
+
+from sentry import options
+from sentry.seer.similarity.types import SeerSimilarIssueData, SimilarIssuesEmbeddingsRequest
+from sentry.utils import metrics
+
+# Request fields which don't affect which similar issues Seer finds
+IGNORED_REQUEST_FIELDS = frozenset(("event_id", "hash", "stacktrace"))
+
+Results = list[SeerSimilarIssueData]
+
+
+class _Flight:
+    __slots__ = ("done", "results")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.results: Results | None = None
+
+
+_cache: TTLCache[str, Results] | None = None
+_flights: dict[str, _Flight] = {}
+_lock = threading.Lock()
+
+
+def _get_cache() -> TTLCache[str, Results]:
+    global _cache
+
+    max_entries = options.get("seer.similarity.ingest.request_cache.max_entries")
+    ttl = options.get("seer.similarity.ingest.request_cache.ttl_seconds")
+    if _cache is None or _cache.maxsize != max_entries or _cache.ttl != ttl:
+        _cache = TTLCache(maxsize=max_entries, ttl=ttl)
+    return _cache
+
+
+def get_cache_key(request: SimilarIssuesEmbeddingsRequest) -> str:
+    parameters = {k: v for k, v in request.items() if k not in IGNORED_REQUEST_FIELDS}
+    stacktrace_digest = hashlib.sha256(request["stacktrace"].encode("utf-8")).hexdigest()
+    return f"{stacktrace_digest}:{orjson.dumps(parameters, option=orjson.OPT_SORT_KEYS).decode()}"
+
+
+def _copy(results: Results) -> Results:
+    return [dataclasses.replace(result) for result in results]
+
+
+def get_similarity_data(
+    request: SimilarIssuesEmbeddingsRequest,
+    metric_tags: Mapping[str, str | int | bool],
+    fetch: Callable[[SimilarIssuesEmbeddingsRequest, Mapping[str, str | int | bool]], Results],
+) -> Results:
+    """
+    Returns the similar issues for `request` from the cache or from a concurrent identical request,
+    or calls `fetch` to request them from Seer.
+    """
+    if not options.get("seer.similarity.ingest.request_cache.enabled"):
+        return fetch(request, metric_tags)
+
+    key = get_cache_key(request)
+
+    with _lock:
+        cached = _get_cache().get(key)
+        flight = _flights.get(key) if cached is None else None
+        owns_flight = cached is None and flight is None
+        if owns_flight:
+            flight = _flights[key] = _Flight()
+
+    if cached is not None:
+        metrics.incr("seer.similar_issues_request.deduplicated", tags={"result": "cached"})
+        return _copy(cached)
+
+    assert flight is not None
+    if not owns_flight:
+        # Wait as long as the concurrent request may take, including its retries, before giving up
+        # on it and making our own
+        timeout = options.get("seer.similarity.grouping-ingest-timeout") * (
+            options.get("seer.similarity.grouping-ingest-retries") + 1
+        )
+        if flight.done.wait(timeout) and flight.results:
+            metrics.incr("seer.similar_issues_request.deduplicated", tags={"result": "coalesced"})
+            return _copy(flight.results)
+        return fetch(request, metric_tags)
+
+    try:
+        results = fetch(request, metric_tags)
+        if results:
+            flight.results = _copy(results)
+            with _lock:
+                _get_cache()[key] = flight.results
+        return results
+    finally:
+        with _lock:
+            if _flights.get(key) is flight:
+                del _flights[key]
+        flight.done.set()
+
+
+def clear() -> None:
+    with _lock:
+        if _cache is not None:
+            _cache.clear()
+        _flights.clear()
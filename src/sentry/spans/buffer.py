@@ -77,6 +77,7 @@ from sentry_redis_tools.clients import RedisCluster, StrictRedis
 
 from sentry import options
 from sentry.processing.backpressure.memory import ServiceMemory, iter_cluster_memory_usage
+from sentry.spans.compression import SpanDictionaries
 from sentry.utils import metrics, redis
 
 # SegmentKey is an internal identifier used by the redis buffer that is also
@@ -119,6 +120,7 @@ def get_redis_client() -> RedisCluster[bytes] | StrictRedis[bytes]:
 
 
 add_buffer_script = redis.load_redis_script("spans/add-buffer.lua")
+load_segment_page_script = redis.load_redis_script("spans/load-segment-page.lua")
 
 
 # NamedTuples are faster to construct than dataclasses
@@ -154,15 +156,22 @@ class SpansBuffer:
     def __init__(self, assigned_shards: list[int]):
         self.assigned_shards = list(assigned_shards)
         self.add_buffer_sha: str | None = None
+        self.load_segment_page_sha: str | None = None
         self.any_shard_at_limit = False
+        self.shards_at_limit: set[int] = set()
         self._current_compression_level = None
         self._zstd_compressor: zstandard.ZstdCompressor | None = None
+        self._zstd_dict_compressor: zstandard.ZstdCompressor | None = None
         self._zstd_decompressor = zstandard.ZstdDecompressor()
 
     @cached_property
     def client(self) -> RedisCluster[bytes] | StrictRedis[bytes]:
         return get_redis_client()
 
+    @cached_property
+    def dictionaries(self) -> SpanDictionaries:
+        return SpanDictionaries(self.client)
+
     # make it pickleable
     def __reduce__(self):
         return (SpansBuffer, (self.assigned_shards,))
@@ -186,6 +195,14 @@ class SpansBuffer:
             else:
                 self._zstd_compressor = zstandard.ZstdCompressor(level=compression_level)
 
+        self._zstd_dict_compressor = None
+        use_dictionary = self._zstd_compressor is not None and options.get(
+            "spans.buffer.compression.dictionary.enabled"
+        )
+        if use_dictionary:
+            self.dictionaries.sample(span.payload for span in spans)
+            self._zstd_dict_compressor = self.dictionaries.get_compressor(compression_level)
+
         redis_ttl = options.get("spans.buffer.redis-ttl")
         timeout = options.get("spans.buffer.timeout")
         root_timeout = options.get("spans.buffer.root-timeout")
@@ -280,6 +297,9 @@ class SpansBuffer:
 
                 p.execute()
 
+        if use_dictionary:
+            self.dictionaries.maybe_train()
+
         metrics.timing("spans.buffer.process_spans.num_spans", len(spans))
         metrics.timing("spans.buffer.process_spans.num_is_root_spans", is_root_span_count)
         metrics.timing("spans.buffer.process_spans.num_subsegments", len(trees))
@@ -294,6 +314,14 @@ class SpansBuffer:
         self.add_buffer_sha = self.client.script_load(add_buffer_script.script)
         return self.add_buffer_sha
 
+    def _ensure_load_segment_page_script(self):
+        if self.load_segment_page_sha is not None:
+            if self.client.script_exists(self.load_segment_page_sha)[0]:
+                return self.load_segment_page_sha
+
+        self.load_segment_page_sha = self.client.script_load(load_segment_page_script.script)
+        return self.load_segment_page_sha
+
     def _get_queue_key(self, shard: int) -> bytes:
         return f"span-buf:q:{shard}".encode("ascii")
 
@@ -328,14 +356,15 @@ class SpansBuffer:
         return trees
 
     def _prepare_payloads(self, spans: list[Span]) -> dict[str | bytes, float]:
-        if self._zstd_compressor is None:
+        compressor = self._zstd_dict_compressor or self._zstd_compressor
+        if compressor is None:
             return {span.payload: span.end_timestamp_precise for span in spans}
 
         combined = b"\x00".join(span.payload for span in spans)
         original_size = len(combined)
 
         with metrics.timer("spans.buffer.compression.cpu_time"):
-            compressed = self._zstd_compressor.compress(combined)
+            compressed = compressor.compress(combined)
 
         compressed_size = len(compressed)
 
@@ -354,7 +383,19 @@ class SpansBuffer:
             if not compressed_data.startswith(b"\x28\xb5\x2f\xfd"):
                 return [compressed_data]
 
-            decompressed_buffer = self._zstd_decompressor.decompress(compressed_data)
+            decompressor = self._zstd_decompressor
+            # Payloads compressed with a trained dictionary carry its ID in
+            # the frame header.
+            dict_id = zstandard.get_frame_parameters(compressed_data).dict_id
+            if dict_id:
+                dict_decompressor = self.dictionaries.get_decompressor(dict_id)
+                if dict_decompressor is None:
+                    # Reported by `get_decompressor`. The payload can't be read
+                    # without its dictionary.
+                    return []
+                decompressor = dict_decompressor
+
+            decompressed_buffer = decompressor.decompress(compressed_data)
             return decompressed_buffer.split(b"\x00")
 
     def record_stored_segments(self):
@@ -396,24 +437,28 @@ class SpansBuffer:
                 result = p.execute()
 
         segment_keys: list[tuple[int, QueueKey, SegmentKey]] = []
+        shards_at_limit = set()
         for shard, queue_key, keys in zip(self.assigned_shards, queue_keys, result):
+            # A full page means that this shard has more segments ready than
+            # we can flush in one cycle, i.e. its queue is backing up.
+            if len(keys) >= max_segments_per_shard:
+                shards_at_limit.add(shard)
             for segment_key in keys:
                 segment_keys.append((shard, queue_key, segment_key))
 
         with metrics.timer("spans.buffer.flush_segments.load_segment_data"):
-            segments = self._load_segment_data([k for _, _, k in segment_keys])
+            if options.get("spans.buffer.flusher.server-side-assembly"):
+                segments = self._load_segment_data_server_side([k for _, _, k in segment_keys])
+            else:
+                segments = self._load_segment_data([k for _, _, k in segment_keys])
 
         return_segments = {}
         num_has_root_spans = 0
-        any_shard_at_limit = False
 
         for shard, queue_key, segment_key in segment_keys:
             segment_span_id = _segment_key_to_span_id(segment_key).decode("ascii")
             segment = segments.get(segment_key, [])
 
-            if len(segment) >= max_segments_per_shard:
-                any_shard_at_limit = True
-
             output_spans = []
             has_root_span = False
             metrics.timing("spans.buffer.flush_segments.num_spans_per_segment", len(segment))
@@ -455,7 +500,8 @@ class SpansBuffer:
         metrics.timing("spans.buffer.flush_segments.num_segments", len(return_segments))
         metrics.timing("spans.buffer.flush_segments.has_root_span", num_has_root_spans)
 
-        self.any_shard_at_limit = any_shard_at_limit
+        self.shards_at_limit = shards_at_limit
+        self.any_shard_at_limit = bool(shards_at_limit)
         return return_segments
 
     def _load_segment_data(self, segment_keys: list[SegmentKey]) -> dict[SegmentKey, list[bytes]]:
@@ -518,6 +564,99 @@ class SpansBuffer:
 
         return payloads
 
+    def _load_segment_data_server_side(
+        self, segment_keys: list[SegmentKey]
+    ) -> dict[SegmentKey, list[bytes]]:
+        """
+        Like `_load_segment_data`, but size accounting and trimming happens
+        in `load-segment-page.lua`: The first page of every segment trims it
+        to `max-segment-bytes` in Redis, and payloads are then streamed back
+        in pages of `segment-page-size`, so that oversized segments are never
+        transferred and the flusher holds at most one page per segment and
+        round-trip in flight.
+
+        The script can only account for the size of the stored, possibly
+        compressed payloads. Segments which still decompress to more than
+        `max-segment-bytes` are skipped and an error is logged, like in
+        `_load_segment_data`.
+        """
+
+        page_size = options.get("spans.buffer.segment-page-size")
+        max_segment_bytes = options.get("spans.buffer.max-segment-bytes")
+        load_segment_page_sha = self._ensure_load_segment_page_script()
+
+        payloads: dict[SegmentKey, list[bytes]] = {}
+        cursors: dict[SegmentKey, int] = {}
+        for key in segment_keys:
+            if key.startswith(b"span-buf:z:"):
+                cursors[key] = 0
+                payloads[key] = []
+
+        # Keys from before the switch to sorted sets are loaded the old way.
+        legacy_keys = [key for key in segment_keys if key not in cursors]
+        if legacy_keys:
+            payloads.update(self._load_segment_data(legacy_keys))
+
+        # ZSCAN may return a payload more than once
+        seen: dict[SegmentKey, set[bytes]] = {key: set() for key in cursors}
+        sizes = {key: 0 for key in cursors}
+        first_page = set(cursors)
+        num_trimmed = 0
+
+        while cursors:
+            with self.client.pipeline(transaction=False) as p:
+                current_keys = []
+                for key, cursor in cursors.items():
+                    p.execute_command(
+                        "EVALSHA",
+                        load_segment_page_sha,
+                        1,
+                        key,
+                        cursor,
+                        1 if key in first_page else 0,
+                        page_size,
+                        max_segment_bytes,
+                    )
+                    current_keys.append(key)
+
+                results = p.execute()
+
+            first_page.clear()
+            for key, (cursor, trimmed, *page) in zip(current_keys, results):
+                num_trimmed += trimmed
+
+                decompressed_spans = []
+                for span_data in page:
+                    if span_data in seen[key]:
+                        continue
+                    seen[key].add(span_data)
+                    decompressed_spans.extend(self._decompress_batch(span_data))
+
+                sizes[key] += sum(len(span) for span in decompressed_spans)
+                if sizes[key] > max_segment_bytes:
+                    metrics.incr("spans.buffer.flush_segments.segment_size_exceeded")
+                    logger.warning("Skipping too large segment, byte size %s", sizes[key])
+
+                    del payloads[key]
+                    del cursors[key]
+                    continue
+
+                payloads[key].extend(decompressed_spans)
+                cursor = int(cursor)
+                if cursor == 0:
+                    del cursors[key]
+                else:
+                    cursors[key] = cursor
+
+        metrics.timing("spans.buffer.flush_segments.num_trimmed_payloads", num_trimmed)
+
+        for key, spans in payloads.items():
+            if not spans:
+                # See `_load_segment_data`.
+                metrics.incr("spans.buffer.empty_segments")
+
+        return payloads
+
     def done_flush_segments(self, segment_keys: dict[SegmentKey, FlushedSegment]):
         metrics.timing("spans.buffer.done_flush_segments.num_segments", len(segment_keys))
         with metrics.timer("spans.buffer.done_flush_segments"):
@@ -0,0 +1,238 @@
+"""
+Trained zstd dictionaries for span buffer payloads.
+
+Subsegments in the span buffer are small and compressed independently, which
+gives zstd very little context to work with. Span payloads are highly
+repetitive though, so a dictionary trained on a sample of recent spans
+recovers most of the compression ratio that is lost at small sizes.
+
+Dictionaries are trained by the process-spans consumers from sampled payloads,
+in a background thread so that consuming isn't blocked, and stored in Redis:
+
+    * span-buf:zdict:<dict_id> -- the raw dictionary.
+    * span-buf:zdict:current -- "<dict_id>:<trained_at>" of the dictionary
+      new payloads should be compressed with.
+    * span-buf:zdict:lock -- held while one consumer trains a new dictionary,
+      for at most one training interval.
+
+The dictionary ID is carried in the zstd frame header of every compressed
+payload, so readers know which dictionary to load without any additional
+framing. Dictionary keys expire `redis-ttl + training-interval` after the
+last time a consumer compressed with them, which outlives any payload that
+references them.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections.abc import Iterable
+
+import zstandard
+from sentry_redis_tools.clients import RedisCluster, StrictRedis
+
+from sentry import options
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+CURRENT_DICTIONARY_KEY = b"span-buf:zdict:current"
+TRAINING_LOCK_KEY = b"span-buf:zdict:lock"
+
+# How often the current dictionary is looked up in Redis.
+REFRESH_INTERVAL = 60
+
+
+def get_dictionary_key(dict_id: int) -> bytes:
+    return b"span-buf:zdict:%d" % dict_id
+
+
+class SpanDictionaries:
+    """
+    Process-local cache of trained dictionaries, their compressors and
+    decompressors, and the sample of payloads the next dictionary is trained
+    from.
+    """
+
+    def __init__(self, client: RedisCluster[bytes] | StrictRedis[bytes]):
+        self.client = client
+        self._dictionaries: dict[int, zstandard.ZstdCompressionDict] = {}
+        self._compressors: dict[tuple[int, int], zstandard.ZstdCompressor] = {}
+        self._decompressors: dict[int, zstandard.ZstdDecompressor] = {}
+        self._current_id: int | None = None
+        self._current_trained_at = 0
+        self._current_checked_at = 0.0
+        self._samples: list[bytes] = []
+        # Number of payloads that were picked for the sample since the last
+        # training, including those which were not kept.
+        self._num_sampled = 0
+        self._training_thread: threading.Thread | None = None
+
+    def _dictionary_ttl(self) -> int:
+        return options.get("spans.buffer.redis-ttl") + options.get(
+            "spans.buffer.compression.dictionary.training-interval"
+        )
+
+    def _refresh_current(self) -> None:
+        now = time.time()
+        if now - self._current_checked_at < REFRESH_INTERVAL:
+            return
+        self._current_checked_at = now
+
+        current = self.client.get(CURRENT_DICTIONARY_KEY)
+        if current is None:
+            self._current_id = None
+            return
+
+        dict_id, trained_at = map(int, current.split(b":"))
+        if self.get_dictionary(dict_id) is None:
+            # New payloads are compressed without a dictionary until the next
+            # one is trained.
+            metrics.incr("spans.buffer.compression.dictionary.current_missing")
+            logger.warning("Current span dictionary %s is missing from Redis", dict_id)
+            self._current_id = None
+            return
+
+        # Keep the dictionary around for as long as payloads may reference it.
+        with self.client.pipeline(transaction=False) as p:
+            p.expire(get_dictionary_key(dict_id), self._dictionary_ttl())
+            p.expire(CURRENT_DICTIONARY_KEY, self._dictionary_ttl())
+            p.execute()
+        self._current_id = dict_id
+        self._current_trained_at = trained_at
+
+    def get_dictionary(self, dict_id: int) -> zstandard.ZstdCompressionDict | None:
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            data = self.client.get(get_dictionary_key(dict_id))
+            if data is None:
+                return None
+            dictionary = self._dictionaries[dict_id] = zstandard.ZstdCompressionDict(data)
+        return dictionary
+
+    def get_compressor(self, level: int) -> zstandard.ZstdCompressor | None:
+        """
+        Returns a compressor for the current dictionary, or `None` if no
+        dictionary has been trained yet.
+        """
+        self._refresh_current()
+        if self._current_id is None:
+            return None
+
+        compressor = self._compressors.get((self._current_id, level))
+        if compressor is None:
+            dictionary = self._dictionaries[self._current_id]
+            compressor = zstandard.ZstdCompressor(level=level, dict_data=dictionary)
+            self._compressors[self._current_id, level] = compressor
+        return compressor
+
+    def get_decompressor(self, dict_id: int) -> zstandard.ZstdDecompressor | None:
+        """
+        Returns a decompressor for the dictionary `dict_id`, or `None` if the
+        dictionary does not exist anymore, in which case payloads compressed
+        with it can't be read.
+        """
+        decompressor = self._decompressors.get(dict_id)
+        if decompressor is None:
+            dictionary = self.get_dictionary(dict_id)
+            if dictionary is None:
+                metrics.incr("spans.buffer.compression.dictionary.missing")
+                logger.warning("Span dictionary %s is missing from Redis", dict_id)
+                return None
+            decompressor = self._decompressors[dict_id] = zstandard.ZstdDecompressor(
+                dict_data=dictionary
+            )
+        return decompressor
+
+    def sample(self, payloads: Iterable[bytes]) -> None:
+        """
+        Adds payloads to the sample the next dictionary is trained from. Once
+        the sample is full, new payloads replace random ones, so that the
+        sample keeps following the traffic until training starts.
+        """
+        max_samples = options.get("spans.buffer.compression.dictionary.max-samples")
+        sample_rate = options.get("spans.buffer.compression.dictionary.sample-rate")
+        for payload in payloads:
+            if random.random() >= sample_rate:
+                continue
+            self._num_sampled += 1
+            if len(self._samples) < max_samples:
+                self._samples.append(payload)
+            else:
+                index = random.randrange(self._num_sampled)
+                if index < max_samples:
+                    self._samples[index] = payload
+
+    def maybe_train(self) -> None:
+        """
+        Starts training a new dictionary in the background once enough
+        payloads have been sampled and the current dictionary is older than
+        the training interval. Only one consumer trains per interval.
+        """
+        if self._training_thread is not None and self._training_thread.is_alive():
+            return
+
+        if len(self._samples) < options.get("spans.buffer.compression.dictionary.min-samples"):
+            return
+
+        training_interval = options.get("spans.buffer.compression.dictionary.training-interval")
+        now = int(time.time())
+
+        if self._current_id is not None and now - self._current_trained_at < training_interval:
+            return
+
+        if not self.client.set(TRAINING_LOCK_KEY, b"1", nx=True, ex=training_interval):
+            return
+
+        samples, self._samples = self._samples, []
+        self._num_sampled = 0
+        self._training_thread = threading.Thread(
+            target=self._train,
+            args=(samples, now),
+            name="span-dictionary-training",
+            daemon=True,
+        )
+        self._training_thread.start()
+
+    def wait_for_training(self, timeout: float | None = None) -> None:
+        """
+        Waits for the dictionary that is being trained, if any, to be stored.
+        """
+        if self._training_thread is not None:
+            self._training_thread.join(timeout)
+
+    def _train(self, samples: list[bytes], now: int) -> None:
+        try:
+            with metrics.timer("spans.buffer.compression.dictionary.train"):
+                dictionary = zstandard.train_dictionary(
+                    options.get("spans.buffer.compression.dictionary.size"), samples
+                )
+        except zstandard.ZstdError:
+            # Happens if the samples are too small or too uniform.
+            logger.warning("spans.buffer.compression.dictionary.training_failed", exc_info=True)
+            return
+
+        dict_id = dictionary.dict_id()
+        try:
+            with self.client.pipeline(transaction=False) as p:
+                p.set(
+                    get_dictionary_key(dict_id), dictionary.as_bytes(), ex=self._dictionary_ttl()
+                )
+                p.set(CURRENT_DICTIONARY_KEY, b"%d:%d" % (dict_id, now), ex=self._dictionary_ttl())
+                p.execute()
+        except Exception:
+            logger.exception("spans.buffer.compression.dictionary.store_failed")
+            return
+
+        # The dictionary has to be known before it becomes current, since the
+        # consuming thread may pick it up at any time.
+        self._dictionaries[dict_id] = dictionary
+        self._current_trained_at = now
+        self._current_id = dict_id
+        self._current_checked_at = time.time()
+
+        metrics.incr("spans.buffer.compression.dictionary.trained")
+        metrics.timing("spans.buffer.compression.dictionary.num_samples", len(samples))
+        metrics.timing("spans.buffer.compression.dictionary.size", len(dictionary.as_bytes()))
@@ -36,7 +36,15 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
     processed timestamps (from the producer timestamp of the incoming span
     message), which are then used as a clock to determine whether segments have expired.
 
+    Shards are spread evenly over at most `max_processes` processes. Each
+    process runs its own flush loop with its own backpressure signal, so a
+    shard whose queue backs up only slows down the shards sharing its process.
+    Passing `max_processes=0` runs one process per CPU core.
+
     :param topic: The topic to send segments to.
+    :param max_processes: Maximum number of flusher processes. 0 means one per CPU core, and
+        None (the default when constructed directly) one per shard. The consumer CLI passes
+        `--flusher-processes`, which defaults to 1.
     :param produce_to_pipe: For unit-testing, produce to this multiprocessing Pipe instead of creating a kafka consumer.
     """
 
@@ -48,6 +56,8 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
         produce_to_pipe: Callable[[KafkaPayload], None] | None = None,
     ):
         self.next_step = next_step
+        if max_processes == 0:
+            max_processes = multiprocessing.cpu_count()
         self.max_processes = max_processes or len(buffer.assigned_shards)
 
         self.mp_context = mp_context = multiprocessing.get_context("spawn")
@@ -176,6 +186,8 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
                 if buffer.any_shard_at_limit:
                     if backpressure_since.value == 0:
                         backpressure_since.value = system_now
+                    for shard in buffer.shards_at_limit:
+                        metrics.incr("spans.buffer.flusher.shard_at_limit", tags={"shard": shard})
                 else:
                     backpressure_since.value = 0
 
@@ -1,20 +1,24 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Callable, Mapping, MutableMapping, Sequence
+import pickle
+import threading
+from collections.abc import Callable, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING, Any, NamedTuple
 from urllib.parse import urlparse
 
 import sentry_sdk
+from cachetools import TTLCache
 
+from sentry import options
 from sentry.models.project import Project
 from sentry.models.release import Release
 from sentry.stacktraces.functions import set_in_app, trim_function_name
 from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import hash_values
-from sentry.utils.safe import get_path, safe_execute, set_path
+from sentry.utils.safe import get_path, safe_execute
 
 logger = logging.getLogger(__name__)
 op = "stacktrace_processing"
@@ -58,6 +62,8 @@ class ProcessableFrame:
         self.data = None
         self.cache_key = None
         self.cache_value = None
+        self.pending_cache_value = None
+        self.has_pending_cache_value = False
         self.processable_frames = processable_frames
 
     def __repr__(self):
@@ -91,8 +97,13 @@ class ProcessableFrame:
         return self.processable_frames[last_idx]
 
     def set_cache_value(self, value):
+        """
+        Stores the processing result of this frame under its cache key. Writes are buffered and
+        sent in one batch when the processing task is closed.
+        """
         if self.cache_key is not None:
-            cache.set(self.cache_key, value, 3600)
+            self.pending_cache_value = value
+            self.has_pending_cache_value = True
             return True
         return False
 
@@ -112,8 +123,24 @@ class StacktraceProcessingTask:
         self.processors = processors
 
     def close(self):
+        try:
+            self.flush_frame_cache()
+        except Exception:
+            logger.exception("Failed to store processed frames in the frame cache")
+        finally:
+            for frame in self.iter_processable_frames():
+                frame.close()
+
+    def flush_frame_cache(self):
+        """Writes the cache values set by processors since the last call."""
+        to_store = {}
         for frame in self.iter_processable_frames():
-            frame.close()
+            if frame.has_pending_cache_value:
+                to_store[frame.cache_key] = frame.pending_cache_value
+                frame.pending_cache_value = None
+                frame.has_pending_cache_value = False
+        if to_store:
+            store_frame_cache(to_store)
 
     def iter_processors(self):
         return iter(self.processors)
@@ -192,75 +219,106 @@ class StacktraceProcessor:
         return False
 
 
-def find_stacktraces_in_data(
-    data: Mapping[str, Any], include_raw: bool = False, include_empty_exceptions: bool = False
-) -> list[StacktraceInfo]:
-    """
-    Finds all stacktraces in a given data blob and returns them together with some meta information.
+class _IndexedStacktrace(NamedTuple):
+    info: StacktraceInfo
+    # Whether the stacktrace has no (non-null) frames
+    is_empty: bool
+    # For raw stacktraces, the position of the stacktrace of the same container in the index
+    parent: int | None = None
 
-    If `include_raw` is True, then also raw stacktraces are included.
 
-    If `include_empty_exceptions` is set to `True` then null/empty stacktraces and stacktraces with
-    no or only null/empty frames are included (where they otherwise would not be), with the
-    `is_exception` flag is set on their `StacktraceInfo` object.
+class FrameIndex:
     """
-    rv = []
+    All stacktraces of an event, collected in a single walk over its data.
 
-    def _append_stacktrace(
-        stacktrace: Any,
-        # The entry in `exception.values` or `threads.values` containing the `stacktrace` attribute,
-        # or None for top-level stacktraces
-        container: Any = None,
-        # Whether or not the container is from `exception.values`
-        is_exception: bool = False,
-        # Prevent skipping empty/null stacktraces from `exception.values` (other empty/null
-        # stacktraces are always skipped)
-        include_empty_exceptions: bool = False,
-    ) -> None:
-        frames = _safe_get_frames(stacktrace)
-
-        if is_exception and include_empty_exceptions:
-            # win-fast bypass of null/empty check
-            pass
-        elif not stacktrace or not frames:
-            return
+    The index holds references into the event data rather than copies, so changes to frames are
+    visible through it, but it has to be rebuilt if stacktraces or frame lists are replaced or
+    added. Use `find_stacktraces_in_data` for one-off lookups.
+    """
 
-        platforms = _get_frames_metadata(frames, data.get("platform", "unknown"))
-        rv.append(
-            StacktraceInfo(
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        fallback_platform = data.get("platform", "unknown")
+        self._stacktraces: list[_IndexedStacktrace] = []
+
+        def _add(
+            stacktrace: Any,
+            container: Any = None,
+            is_exception: bool = False,
+            parent: int | None = None,
+        ) -> None:
+            frames = _safe_get_frames(stacktrace)
+            # Null/empty stacktraces are only ever included for `exception.values`
+            if not is_exception and not (stacktrace and frames):
+                return
+            info = StacktraceInfo(
                 stacktrace=stacktrace,
                 container=container,
-                platforms=platforms,
+                platforms=_get_frames_metadata(frames, fallback_platform),
                 is_exception=is_exception,
             )
-        )
+            self._stacktraces.append(
+                _IndexedStacktrace(info, is_empty=not (stacktrace and frames), parent=parent)
+            )
 
-    # Look for stacktraces under the key `exception`
-    for exc in get_path(data, "exception", "values", filter=True, default=()):
-        _append_stacktrace(
-            exc.get("stacktrace"),
-            container=exc,
-            is_exception=True,
-            include_empty_exceptions=include_empty_exceptions,
-        )
+        for exc in get_path(data, "exception", "values", filter=True, default=()):
+            _add(exc.get("stacktrace"), container=exc, is_exception=True)
+        _add(data.get("stacktrace"))
+        # The native family includes stacktraces under threads
+        for thread in get_path(data, "threads", "values", filter=True, default=()):
+            _add(thread.get("stacktrace"), container=thread)
+
+        # Raw stacktraces come after all others. They are never flagged as exceptions, even when
+        # their container is one, because otherwise we'd end up processing each exception
+        # container twice in `process_stacktraces`.
+        for i, indexed in enumerate(self._stacktraces[:]):
+            if indexed.info.container is not None:
+                _add(indexed.info.container.get("raw_stacktrace"), indexed.info.container, parent=i)
+
+        self.crash_frames = _get_crash_frames(data)
+
+    def get_stacktrace_infos(
+        self, include_raw: bool = False, include_empty_exceptions: bool = False
+    ) -> list[StacktraceInfo]:
+        """
+        Returns the same stacktraces as `find_stacktraces_in_data` with the same arguments.
+        """
+        included = [False] * len(self._stacktraces)
+        rv = []
+        for i, indexed in enumerate(self._stacktraces):
+            if indexed.parent is not None:
+                if not include_raw or not included[indexed.parent]:
+                    continue
+            elif indexed.is_empty and not include_empty_exceptions:
+                continue
+            included[i] = True
+            rv.append(indexed.info)
+        return rv
+
+    @property
+    def platforms(self) -> set[str]:
+        """
+        The platforms of all frames in stacktraces which aren't raw.
+        """
+        rv: set[str] = set()
+        for indexed in self._stacktraces:
+            if indexed.parent is None:
+                rv.update(indexed.info.platforms)
+        return rv
 
-    # Look for stacktraces under the key `stacktrace`
-    _append_stacktrace(data.get("stacktrace"))
 
-    # The native family includes stacktraces under threads
-    for thread in get_path(data, "threads", "values", filter=True, default=()):
-        _append_stacktrace(thread.get("stacktrace"), container=thread)
+def find_stacktraces_in_data(
+    data: Mapping[str, Any], include_raw: bool = False, include_empty_exceptions: bool = False
+) -> list[StacktraceInfo]:
+    """
+    Finds all stacktraces in a given data blob and returns them together with some meta information.
 
-    if include_raw:
-        # Iterate over a copy of rv, otherwise, it will infinitely append to itself
-        for info in rv[:]:
-            if info.container is not None:
-                # We don't set `is_exception` to `True` here, even if `info.is_exception` is set,
-                # because otherwise we'd end up processing each exception container twice in
-                # `process_stacktraces`
-                _append_stacktrace(info.container.get("raw_stacktrace"), container=info.container)
+    If `include_raw` is True, then also raw stacktraces are included.
 
-    return rv
+    If `include_empty_exceptions` is set to `True` then null/empty stacktraces and stacktraces with
+    no or only null/empty frames are included (where they otherwise would not be), with the
+    `is_exception` flag is set on their `StacktraceInfo` object.
+    """
+    return FrameIndex(data).get_stacktrace_infos(include_raw, include_empty_exceptions)
 
 
 def _get_frames_metadata(frames: Sequence[dict[str, Any]], fallback_platform: str) -> set[str]:
@@ -279,10 +337,11 @@ def _normalize_in_app(stacktrace: Sequence[dict[str, str]]) -> str:
     # Default to false in all cases where processors or grouping enhancers
     # have not yet set in_app.
     for frame in stacktrace:
-        if frame.get("in_app") is None:
+        in_app = frame.get("in_app")
+        if in_app is None:
             set_in_app(frame, False)
 
-        if frame.get("in_app"):
+        if in_app:
             has_in_app_frames = True
         else:
             has_system_frames = True
@@ -296,17 +355,25 @@ def _normalize_in_app(stacktrace: Sequence[dict[str, str]]) -> str:
 
 
 def normalize_stacktraces_for_grouping(
-    data: MutableMapping[str, Any], grouping_config: StrategyConfiguration | None = None
+    data: MutableMapping[str, Any],
+    grouping_config: StrategyConfiguration | None = None,
+    frame_index: FrameIndex | None = None,
 ) -> None:
     """
     Applies grouping enhancement rules and ensure in_app is set on all frames.
     This also trims functions and pulls query strings off of filenames if necessary.
+
+    Pass the event's `FrameIndex` to avoid walking the data again when normalizing for several
+    grouping configs.
     """
 
     stacktrace_frames = []
     stacktrace_containers = []
 
-    for stacktrace_info in find_stacktraces_in_data(data, include_raw=True):
+    if frame_index is None:
+        frame_index = FrameIndex(data)
+
+    for stacktrace_info in frame_index.get_stacktrace_infos(include_raw=True):
         frames = stacktrace_info.get_frames()
         if frames:
             stacktrace_frames.append(frames)
@@ -325,30 +392,9 @@ def normalize_stacktraces_for_grouping(
     # otherwise stored in `function` to not make the payload larger
     # unnecessarily.
     with sentry_sdk.start_span(op=op, name="iterate_frames"):
-        stripped_querystring = False
-        for frames in stacktrace_frames:
-            for frame in frames:
-                _update_frame(frame, platform)
-
-                # Track the incoming `in_app` value, before we make any changes. This is different
-                # from the `orig_in_app` value which may be set by
-                # `apply_category_and_updated_in_app_to_frames`, because it's not tied to the value
-                # changing as a result of stacktrace rules.
-                client_in_app = frame.get("in_app")
-                if client_in_app is not None:
-                    set_path(frame, "data", "client_in_app", value=client_in_app)
-
-                if platform == "javascript":
-                    try:
-                        parsed_filename = urlparse(frame.get("filename", ""))
-                        if parsed_filename.query:
-                            stripped_querystring = True
-                            frame["filename"] = frame["filename"].replace(
-                                f"?{parsed_filename.query}", ""
-                            )
-                    # ignore unparsable filenames
-                    except Exception:
-                        pass
+        stripped_querystring = _update_frames(
+            [frame for frames in stacktrace_frames for frame in frames], platform
+        )
         if stripped_querystring:
             # Fires once per event, regardless of how many frames' filenames were stripped
             metrics.incr("sentry.grouping.stripped_filename_querystrings")
@@ -379,33 +425,85 @@ def normalize_stacktraces_for_grouping(
     data["metadata"] = event_metadata
 
 
-def _update_frame(frame: dict[str, Any], platform: str | None) -> None:
-    """Restore the original in_app value before the first grouping
-    enhancers have been run. This allows to re-apply grouping
-    enhancers on the original frame data.
+def _update_frames(frames: Sequence[dict[str, Any]], platform: str | None) -> bool:
+    """
+    Prepare the frames of an event for the grouping enhancers:
+
+    * Restore the original in_app value before the first grouping enhancers have been run. This
+      allows to re-apply grouping enhancers on the original frame data.
+    * Track the incoming `in_app` value as `client_in_app`, before we make any changes. This is
+      different from the `orig_in_app` value which may be set by
+      `apply_category_and_updated_in_app_to_frames`, because it's not tied to the value changing as
+      a result of stacktrace rules.
+    * Trim function names and (for JavaScript events) strip query strings off filenames.
+
+    Events with many threads repeat the same frames over and over, so every distinct function name
+    and filename is only trimmed or parsed once. Returns whether any query string was stripped.
     """
-    orig_in_app = get_path(frame, "data", "orig_in_app")
-    if orig_in_app is not None:
-        frame["in_app"] = None if orig_in_app == -1 else bool(orig_in_app)
+    trimmed_functions: dict[tuple[str, str | None], str] = {}
+    stripped_filenames: dict[str, str | None] = {}
+
+    for frame in frames:
+        frame_data = frame.get("data")
+
+        orig_in_app = frame_data.get("orig_in_app") if isinstance(frame_data, Mapping) else None
+        if orig_in_app is not None:
+            frame["in_app"] = None if orig_in_app == -1 else bool(orig_in_app)
+
+        client_in_app = frame.get("in_app")
+        if client_in_app is not None:
+            if frame_data is None:
+                frame["data"] = {"client_in_app": client_in_app}
+            elif isinstance(frame_data, MutableMapping):
+                frame_data["client_in_app"] = client_in_app
+
+        # Put the trimmed function names into the frames. We only do this if the trimming produces
+        # a different function than the function we have otherwise stored in `function` to not
+        # make the payload larger unnecessarily.
+        raw_func = frame.get("function")
+        if raw_func and frame.get("raw_function") is None:
+            key = (raw_func, frame.get("platform") or platform)
+            if key not in trimmed_functions:
+                trimmed_functions[key] = trim_function_name(*key)
+            function_name = trimmed_functions[key]
+            if function_name != raw_func:
+                frame["raw_function"] = raw_func
+                frame["function"] = function_name
+
+        if platform == "javascript":
+            filename = frame.get("filename", "")
+            if not isinstance(filename, str):
+                continue
+            if filename not in stripped_filenames:
+                stripped_filenames[filename] = _strip_querystring(filename)
+            stripped_filename = stripped_filenames[filename]
+            if stripped_filename is not None:
+                frame["filename"] = stripped_filename
+
+    return any(filename is not None for filename in stripped_filenames.values())
 
-    if frame.get("raw_function") is not None:
-        return
-    raw_func = frame.get("function")
-    if not raw_func:
-        return
-    function_name = trim_function_name(raw_func, frame.get("platform") or platform)
-    if function_name != raw_func:
-        frame["raw_function"] = raw_func
-        frame["function"] = function_name
+
+def _strip_querystring(filename: str) -> str | None:
+    """
+    Returns the filename without its query string, or `None` if it doesn't have one.
+    """
+    try:
+        parsed_filename = urlparse(filename)
+        if parsed_filename.query:
+            return filename.replace(f"?{parsed_filename.query}", "")
+    # ignore unparsable filenames
+    except Exception:
+        pass
+    return None
 
 
-def should_process_for_stacktraces(data):
+def should_process_for_stacktraces(data, frame_index=None):
     from sentry.plugins.base import plugins
 
-    infos = find_stacktraces_in_data(data, include_empty_exceptions=True)
-    platforms: set[str] = set()
-    for info in infos:
-        platforms.update(info.platforms or ())
+    if frame_index is None:
+        frame_index = FrameIndex(data)
+    infos = frame_index.get_stacktrace_infos(include_empty_exceptions=True)
+    platforms = frame_index.platforms
     for plugin in plugins.all(version=2):
         processors = safe_execute(
             plugin.get_stacktrace_processors, data=data, stacktrace_infos=infos, platforms=platforms
@@ -506,7 +604,18 @@ def process_single_stacktrace(processing_task, stacktrace_info, processable_fram
     )
 
 
-def get_crash_frame_from_event_data(data, frame_filter=None):
+def _get_crash_frames(data: Mapping[str, Any]) -> Sequence[dict[str, Any] | None] | None:
+    frames = get_path(data, "exception", "values", -1, "stacktrace", "frames") or get_path(
+        data, "stacktrace", "frames"
+    )
+    if not frames:
+        threads = get_path(data, "threads", "values")
+        if threads and len(threads) == 1:
+            frames = get_path(threads, 0, "stacktrace", "frames")
+    return frames
+
+
+def get_crash_frame_from_event_data(data, frame_filter=None, frame_index=None):
     """
     Return the highest (closest to the crash) in-app frame in the top stacktrace
     which doesn't fail the given filter test.
@@ -520,15 +629,11 @@ def get_crash_frame_from_event_data(data, frame_filter=None):
         - we're unable to find any frames nested in either event.exception or
           event.stacktrace, and there's anything other than exactly one thread
           in the data
+
+    If the event's `FrameIndex` is passed, the frames are taken from it.
     """
 
-    frames = get_path(data, "exception", "values", -1, "stacktrace", "frames") or get_path(
-        data, "stacktrace", "frames"
-    )
-    if not frames:
-        threads = get_path(data, "threads", "values")
-        if threads and len(threads) == 1:
-            frames = get_path(threads, 0, "stacktrace", "frames")
+    frames = frame_index.crash_frames if frame_index is not None else _get_crash_frames(data)
 
     default = None
     for frame in reversed(frames or ()):
@@ -546,13 +651,92 @@ def get_crash_frame_from_event_data(data, frame_filter=None):
         return default
 
 
-def lookup_frame_cache(keys):
-    rv = {}
-    for key in keys:
-        rv[key] = cache.get(key)
+# How long processed frames are kept in the frame cache
+FRAME_CACHE_TIMEOUT = 3600
+
+_local_frame_cache: TTLCache[str, bytes] | None = None
+_local_frame_cache_lock = threading.Lock()
+
+
+def _get_local_frame_cache() -> TTLCache[str, bytes] | None:
+    """
+    Returns the process-local layer of the frame cache, or `None` if it is disabled. Values are
+    stored pickled, so that processors never share the objects they get from the cache.
+    """
+    global _local_frame_cache
+
+    max_entries = options.get("processing.frame-cache.local-max-entries")
+    if not max_entries:
+        return None
+
+    ttl = options.get("processing.frame-cache.local-ttl-seconds")
+    if (
+        _local_frame_cache is None
+        or _local_frame_cache.maxsize != max_entries
+        or _local_frame_cache.ttl != ttl
+    ):
+        _local_frame_cache = TTLCache(maxsize=max_entries, ttl=ttl)
+    return _local_frame_cache
+
+
+def lookup_frame_cache(keys: Iterable[str]) -> dict[str, Any]:
+    """
+    Looks up the cached processing results of the given frame cache keys, first in the process-local
+    layer and then with a single `get_many` call to the cache backend. Missing keys map to `None`.
+    """
+    keys = list(keys)
+    rv: dict[str, Any] = {}
+    with metrics.timer("stacktraces.processing.lookup_frame_cache") as metric_tags:
+        with _local_frame_cache_lock:
+            local_cache = _get_local_frame_cache()
+            if local_cache is not None:
+                for key in keys:
+                    data = local_cache.get(key)
+                    if data is not None:
+                        rv[key] = data
+
+        for key, data in rv.items():
+            rv[key] = pickle.loads(data)
+
+        missing = [key for key in keys if key not in rv]
+        metric_tags["local_hits"] = bool(rv)
+        if missing:
+            found = cache.get_many(missing)
+            for key in missing:
+                rv[key] = found.get(key)
+            _store_local_frame_cache(found)
+
+    metrics.distribution("stacktraces.processing.lookup_frame_cache.keys", len(keys))
     return rv
 
 
+def store_frame_cache(values: Mapping[str, Any]) -> None:
+    """Stores processed frames by their cache keys, with a single `set_many` call."""
+    cache.set_many(values, FRAME_CACHE_TIMEOUT)
+    _store_local_frame_cache(values)
+
+
+def _store_local_frame_cache(values: Mapping[str, Any]) -> None:
+    with _local_frame_cache_lock:
+        if _get_local_frame_cache() is None:
+            return
+
+    # Pickle outside of the lock, the local layer is checked again below in case it was disabled
+    # in the meantime.
+    to_store = {
+        key: pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        for key, value in values.items()
+        if value is not None
+    }
+    if not to_store:
+        return
+
+    with _local_frame_cache_lock:
+        local_cache = _get_local_frame_cache()
+        if local_cache is not None:
+            local_cache.update(to_store)
+
+
 def get_stacktrace_processing_task(infos, processors):
     """Returns a list of all tasks for the processors.  This can skip over
     processors that seem to not handle any frames.
@@ -576,9 +760,10 @@ def get_stacktrace_processing_task(infos, processors):
             if processable_frame.cache_key is not None:
                 to_lookup[processable_frame.cache_key] = processable_frame
 
-    frame_cache = lookup_frame_cache(to_lookup)
-    for cache_key, processable_frame in to_lookup.items():
-        processable_frame.cache_value = frame_cache.get(cache_key)
+    if to_lookup:
+        frame_cache = lookup_frame_cache(to_lookup)
+        for cache_key, processable_frame in to_lookup.items():
+            processable_frame.cache_value = frame_cache.get(cache_key)
 
     return StacktraceProcessingTask(
         processable_stacktraces=by_stacktrace_info, processors=by_processor
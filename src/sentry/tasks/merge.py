@@ -40,6 +40,7 @@ def merge_groups(
     **kwargs,
 ):
     # TODO(mattrobenolt): Write tests for all of this
+    from sentry.grouping.ingest import grouphash_cache
     from sentry.models.activity import Activity
     from sentry.models.environment import Environment
     from sentry.models.eventattachment import EventAttachment
@@ -108,9 +109,11 @@ def merge_groups(
             GroupMeta,
         )
 
-        has_more = merge_objects(
-            model_list, group, new_group, logger=logger, transaction_id=transaction_id
-        )
+        # Moving the grouphashes changes which group their events go to
+        with grouphash_cache.invalidating(GroupHash.objects.filter(group_id=group.id)):
+            has_more = merge_objects(
+                model_list, group, new_group, logger=logger, transaction_id=transaction_id
+            )
 
         if not has_more:
             # There are no more objects to merge for *this* "from" group, remove it
@@ -103,7 +103,12 @@ def process_incr(
 
 def buffer_incr(model: type[Model], *args, **kwargs):
     from sentry import buffer
+    from sentry.buffer.coalescing import get_local_buffer
 
     sentry_sdk.set_tag("model", model._meta.model_name)
 
-    buffer.backend.incr(model, *args, **kwargs)
+    local_buffer = get_local_buffer()
+    if local_buffer is not None:
+        local_buffer.incr(model, *args, **kwargs)
+    else:
+        buffer.backend.incr(model, *args, **kwargs)
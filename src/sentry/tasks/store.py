@@ -23,7 +23,11 @@ from sentry.lang.native.symbolicator import SymbolicatorTaskKind
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.silo.base import SiloMode
-from sentry.stacktraces.processing import process_stacktraces, should_process_for_stacktraces
+from sentry.stacktraces.processing import (
+    FrameIndex,
+    process_stacktraces,
+    should_process_for_stacktraces,
+)
 from sentry.tasks.base import instrumented_task
 from sentry.taskworker.config import TaskworkerConfig
 from sentry.taskworker.namespaces import (
@@ -45,7 +49,7 @@ class RetryProcessing(Exception):
     pass
 
 
-def should_process(data: Mapping[str, Any]) -> bool:
+def should_process(data: Mapping[str, Any], frame_index: FrameIndex | None = None) -> bool:
     """Quick check if processing is needed at all."""
     from sentry.plugins.base import plugins
 
@@ -57,7 +61,7 @@ def should_process(data: Mapping[str, Any]) -> bool:
         if processors:
             return True
 
-    if should_process_for_stacktraces(data):
+    if should_process_for_stacktraces(data, frame_index):
         return True
 
     return False
@@ -129,7 +133,6 @@ def _do_preprocess_event(
     project: Project | None,
     has_attachments: bool = False,
 ) -> None:
-    from sentry.stacktraces.processing import find_stacktraces_in_data
     from sentry.tasks.symbolication import (
         get_symbolication_function_for_platform,
         get_symbolication_platforms,
@@ -161,7 +164,9 @@ def _do_preprocess_event(
     # Possible values are `js`, `jvm`, and `native`.
     # The event will be submitted to Symbolicator for all returned platforms,
     # one after the other, so we handle mixed stacktraces.
-    stacktraces = find_stacktraces_in_data(data)
+    # Walk the stacktraces once for both the symbolication and the processing check
+    frame_index = FrameIndex(data)
+    stacktraces = frame_index.get_stacktrace_infos()
     symbolicate_platforms = get_symbolication_platforms(data, stacktraces)
     metrics.incr(
         "events.to-symbolicate",
@@ -203,7 +208,7 @@ def _do_preprocess_event(
         # else: go directly to process, do not go through the symbolicate queue, do not collect 200
 
     # NOTE: Events considered for symbolication always go through `do_process_event`
-    if should_symbolicate or should_process(data):
+    if should_symbolicate or should_process(data, frame_index):
         submit_process(
             from_reprocessing=from_reprocessing,
             cache_key=cache_key,
@@ -14,6 +14,7 @@ from sentry import analytics, eventstore, features, similarity, tsdb
 from sentry.constants import DEFAULT_LOGGER_NAME, LOG_LEVELS_MAP
 from sentry.culprit import generate_culprit
 from sentry.eventstore.models import BaseEvent
+from sentry.grouping.ingest import grouphash_cache
 from sentry.models.activity import Activity
 from sentry.models.environment import Environment
 from sentry.models.eventattachment import EventAttachment
@@ -480,7 +481,9 @@ def lock_hashes(project_id, source_id, fingerprints):
             state=GroupHash.State.LOCKED_IN_MIGRATION
         )
 
-    return [h.hash for h in eligible_hashes]
+    locked_hashes = [h.hash for h in eligible_hashes]
+    grouphash_cache.invalidate(project_id, locked_hashes)
+    return locked_hashes
 
 
 def unlock_hashes(project_id, locked_primary_hashes):
@@ -489,6 +492,7 @@ def unlock_hashes(project_id, locked_primary_hashes):
         hash__in=locked_primary_hashes,
         state=GroupHash.State.LOCKED_IN_MIGRATION,
     ).update(state=GroupHash.State.UNLOCKED)
+    grouphash_cache.invalidate(project_id, locked_primary_hashes)
 
 
 @instrumented_task(
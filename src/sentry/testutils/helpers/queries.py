@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from collections.abc import Generator
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections, router
+from django.db.models import Model
+from django.test.utils import CaptureQueriesContext
+
+__all__ = ("capture_model_queries",)
+
+
+@contextmanager
+def capture_model_queries(*models: type[Model]) -> Generator[dict[type[Model], int]]:
+    """
+    Counts the queries made on the table of each of `models` while the context is active, in
+    whichever database the model lives in. Joins to the table are not counted.
+    """
+    counts = {model: 0 for model in models}
+    with ExitStack() as stack:
+        contexts = {
+            model: stack.enter_context(
+                CaptureQueriesContext(connections[router.db_for_read(model)])
+            )
+            for model in models
+        }
+        yield counts
+
+    for model, context in contexts.items():
+        table = model._meta.db_table
+        counts[model] = sum(f'FROM "{table}"' in query["sql"] for query in context.captured_queries)
@@ -362,6 +362,10 @@ def pytest_runtest_teardown(item: pytest.Item) -> None:
     ProjectOption.objects.clear_local_cache()
     UserOption.objects.clear_local_cache()
 
+    from sentry.grouping.api import clear_compiled_config_caches
+
+    clear_compiled_config_caches()
+
     sentry_sdk.get_global_scope().set_client(None)
 
 
@@ -1,7 +1,9 @@
+from array import array
 from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, TypedDict, TypeVar
+from typing import Any, Generic, TypedDict, TypeVar
 
 from django.conf import settings
 from django.utils import timezone
@@ -23,6 +25,46 @@ class IncrMultiOptions(TypedDict):
     count: int
 
 
+@dataclass(frozen=True)
+class TSDBCounterMatrix(Generic[TSDBKey]):
+    """
+    Counter values of multiple keys over the same series of buckets, stored as
+    a dense, row-major ``len(keys) x len(timestamps)`` array of integers.
+
+    Rows are exposed as memoryviews into the array, so sums and sparklines can
+    be computed without materializing a ``(timestamp, count)`` tuple per
+    bucket.
+    """
+
+    keys: list[TSDBKey]
+    timestamps: list[int]
+    values: array
+
+    def __post_init__(self) -> None:
+        assert len(self.values) == len(self.keys) * len(self.timestamps)
+
+    @classmethod
+    def zeros(cls, keys: Sequence[TSDBKey], timestamps: Sequence[int]) -> "TSDBCounterMatrix":
+        return cls(list(keys), list(timestamps), array("q", bytes(8 * len(keys) * len(timestamps))))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.keys), len(self.timestamps)
+
+    def row(self, index: int) -> memoryview:
+        width = len(self.timestamps)
+        return memoryview(self.values)[index * width : (index + 1) * width]
+
+    def sums(self) -> dict[TSDBKey, int]:
+        return {key: sum(self.row(i)) for i, key in enumerate(self.keys)}
+
+    def to_range(self) -> dict[TSDBKey, list[tuple[int, int]]]:
+        """
+        Returns the values in the format of `BaseTSDB.get_range`.
+        """
+        return {key: list(zip(self.timestamps, self.row(i))) for i, key in enumerate(self.keys)}
+
+
 class TSDBModel(Enum):
     internal = 0
 
@@ -115,6 +157,7 @@ class BaseTSDB(Service):
     __read_methods__ = frozenset(
         [
             "get_range",
+            "get_range_matrix",
             "get_sums",
             "get_timeseries_sums",
             "get_distinct_counts_series",
@@ -437,6 +480,48 @@ class BaseTSDB(Service):
         """
         raise NotImplementedError
 
+    def get_range_matrix(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+    ) -> TSDBCounterMatrix:
+        """
+        Like `get_range`, but returns the counts as a dense `TSDBCounterMatrix`
+        with one row per (deduplicated) key and one column per bucket.
+
+        >>> now = timezone.now()
+        >>> matrix = get_range_matrix(TSDBModel.group, [1, 2, 3],
+        >>>                           start=now - timedelta(days=1),
+        >>>                           end=now)
+        >>> matrix.sums()
+        {1: 10, 2: 0, 3: 4}
+        """
+        # This implementation should be overridden by backends that can fill
+        # the matrix directly.
+        keys = list(dict.fromkeys(keys))
+        range_set = self.get_range(
+            model,
+            keys,
+            start,
+            end,
+            rollup,
+            environment_ids=[environment_id] if environment_id is not None else None,
+            tenant_ids=tenant_ids,
+        )
+        timestamps = sorted({ts for points in range_set.values() for ts, _ in points})
+        matrix = TSDBCounterMatrix.zeros(keys, timestamps)
+        columns = {ts: i for i, ts in enumerate(timestamps)}
+        width = len(timestamps)
+        for row, key in enumerate(keys):
+            for ts, count in range_set.get(key, ()):
+                matrix.values[row * width + columns[ts]] = int(count)
+        return matrix
+
     def get_timeseries_sums(
         self,
         model: TSDBModel,
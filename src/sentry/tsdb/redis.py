@@ -13,10 +13,12 @@ from django.utils import timezone
 from django.utils.encoding import force_bytes
 from redis.client import Script
 
+from sentry import options as sentry_options
 from sentry.tsdb.base import (
     BaseTSDB,
     IncrMultiOptions,
     SnubaCondition,
+    TSDBCounterMatrix,
     TSDBItem,
     TSDBKey,
     TSDBModel,
@@ -32,6 +34,7 @@ T = TypeVar("T")
 SketchParameters = namedtuple("SketchParameters", "depth width capacity")
 
 CountMinScript = load_redis_script("tsdb/cmsketch.lua")
+DistinctCountsUnionScript = load_redis_script("tsdb/distinct-counts-union.lua")
 
 
 def _crc32(data: bytes) -> int:
@@ -184,6 +187,33 @@ class RedisTSDB(BaseTSDB):
             environment_id,
         )
 
+    def make_union_keys(
+        self,
+        model: TSDBModel,
+        rollup: int,
+        first: int,
+        last: int,
+        key: int | str,
+        environment_id: int | None,
+    ) -> tuple[str | int, str | int]:
+        """
+        Make the key of the cached union of the distinct counters of the
+        closed buckets from ``first`` to ``last``, and the key of the version
+        it was built at, see ``distinct-counts-union.lua``.
+        """
+        suffix = f"{model.value}:{rollup}:{first}:{last}:{self.get_model_key(key)}"
+        return (
+            self.add_environment_parameter(f"{self.prefix}u:{suffix}", environment_id),
+            self.add_environment_parameter(f"{self.prefix}u:v:{suffix}", environment_id),
+        )
+
+    def make_union_version_key(
+        self, model: TSDBModel, key: int | str, environment_id: int | None
+    ) -> str | int:
+        return self.add_environment_parameter(
+            f"{self.prefix}uv:{model.value}:{self.get_model_key(key)}", environment_id
+        )
+
     def make_counter_key(
         self,
         model: TSDBModel,
@@ -337,31 +367,87 @@ class RedisTSDB(BaseTSDB):
             raise NotImplementedError
         environment_id = environment_ids[0] if environment_ids else None
 
+        return self.get_range_matrix(
+            model, keys, start, end, rollup, environment_id=environment_id
+        ).to_range()
+
+    def get_range_matrix(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+    ) -> TSDBCounterMatrix:
+        """
+        Counters of all keys in the same rollup bucket and vnode share a hash,
+        so they are fetched with a single HMGET per hash. ``cluster.map()``
+        pipelines all of them per host.
+        """
         self.validate_arguments([model], [environment_id])
 
+        keys = list(dict.fromkeys(keys))
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
-        _series = [to_datetime(item) for item in series]
+        matrix = TSDBCounterMatrix.zeros(keys, series)
+        width = len(series)
+
+        # hash_key -> ([hash_field, ...], [matrix index, ...])
+        requests: dict[str, tuple[list[str | int], list[int]]] = defaultdict(lambda: ([], []))
+        for column, timestamp in enumerate(to_datetime(item) for item in series):
+            for row, key in enumerate(keys):
+                hash_key, hash_field = self.make_counter_key(
+                    model, rollup, timestamp, key, environment_id
+                )
+                fields, indexes = requests[hash_key]
+                fields.append(hash_field)
+                indexes.append(row * width + column)
 
-        results = []
         cluster, _ = self.get_cluster(environment_id)
         with cluster.map() as client:
-            for key in keys:
-                for timestamp in _series:
-                    hash_key, hash_field = self.make_counter_key(
-                        model, rollup, timestamp, key, environment_id
-                    )
-                    results.append(
-                        (int(timestamp.timestamp()), key, client.hget(hash_key, hash_field))
-                    )
+            promises = [
+                (client.hmget(hash_key, fields), indexes)
+                for hash_key, (fields, indexes) in requests.items()
+            ]
 
-        results_by_key: dict[TSDBKey, dict[int, int]] = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
+        values = matrix.values
+        for promise, indexes in promises:
+            for index, count in zip(indexes, promise.value):
+                if count:
+                    values[index] = int(count)
 
-        output = {}
-        for key, points in results_by_key.items():
-            output[key] = sorted(points.items())
-        return output
+        return matrix
+
+    def get_timeseries_sums(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        use_cache: bool = False,
+        jitter_value: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+        referrer_suffix: str | None = None,
+        conditions: list[SnubaCondition] | None = None,
+        group_on_time: bool = True,
+    ) -> dict[TSDBKey, int]:
+        """
+        Sums the counters of the dense matrix of `get_range_matrix`.
+
+        Counters are always read from Redis, so there is no query cache for
+        `use_cache` and `jitter_value` to control, and `tenant_ids`,
+        `referrer_suffix` and `group_on_time` only apply to Snuba queries.
+        Filtering by `conditions` isn't supported.
+        """
+        if conditions:
+            raise NotImplementedError("RedisTSDB doesn't support conditions")
+
+        return self.get_range_matrix(
+            model, keys, start, end, rollup, environment_id=environment_id
+        ).sums()
 
     def merge(
         self,
@@ -548,6 +634,12 @@ class RedisTSDB(BaseTSDB):
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
 
+        union_ttl = sentry_options.get("tsdb.redis.distinct-counts-union-ttl")
+        if union_ttl:
+            return self._get_distinct_counts_totals_cached(
+                model, keys, rollup, series, environment_id, union_ttl
+            )
+
         responses = {}
         cluster, _ = self.get_cluster(environment_id)
         with cluster.fanout() as client:
@@ -566,6 +658,73 @@ class RedisTSDB(BaseTSDB):
 
         return {key: value.value for key, value in responses.items()}
 
+    def _get_distinct_counts_totals_cached(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        rollup: int,
+        series: list[int],
+        environment_id: int | None,
+        union_ttl: int,
+    ) -> dict[TSDBKey, int]:
+        """
+        Like `get_distinct_counts_totals`, but the union of all buckets that
+        have been closed for ``tsdb.redis.distinct-counts-union-grace-seconds``
+        is cached for ``union_ttl`` seconds. Items recorded into a closed
+        bucket after that (late data) are counted at the latest ``union_ttl``
+        seconds after the cached union was built from all buckets.
+        """
+        grace = sentry_options.get("tsdb.redis.distinct-counts-union-grace-seconds")
+        now = int(timezone.now().timestamp())
+        num_closed = sum(1 for timestamp in series if timestamp + rollup + grace <= now)
+        first, last = series[0], series[num_closed - 1] if num_closed else 0
+
+        commands = {}
+        for key in keys:
+            union_key, union_version_key = self.make_union_keys(
+                model, rollup, first, last, key, environment_id
+            )
+            previous_key, previous_version_key = self.make_union_keys(
+                model, rollup, first, last - rollup, key, environment_id
+            )
+            ks = [
+                self.make_union_version_key(model, key, environment_id),
+                union_key,
+                union_version_key,
+                previous_key,
+                previous_version_key,
+            ]
+            ks.extend(
+                self.make_key(model, rollup, timestamp, key, environment_id) for timestamp in series
+            )
+            commands[key] = [(DistinctCountsUnionScript, ks, [union_ttl, num_closed])]
+
+        cluster, _ = self.get_cluster(environment_id)
+        return {
+            key: responses[0].value for key, responses in cluster.execute_commands(commands).items()
+        }
+
+    def _invalidate_distinct_counts_unions(
+        self,
+        client: Any,
+        model: TSDBModel,
+        key: int | str,
+        environment_ids: Iterable[int | None],
+    ) -> None:
+        union_ttl = sentry_options.get("tsdb.redis.distinct-counts-union-ttl")
+        if not union_ttl:
+            return
+
+        for environment_id in environment_ids:
+            # Versions are never reused, so that unions built before the
+            # version key expired can't become valid again. Unions of older
+            # versions expire before the version key does.
+            client.set(
+                self.make_union_version_key(model, key, environment_id),
+                uuid.uuid4().hex,
+                ex=union_ttl,
+            )
+
     def merge_distinct_counts(
         self,
         model: TSDBModel,
@@ -607,9 +766,11 @@ class RedisTSDB(BaseTSDB):
                                 )
                                 results[environment_id].append(c.get(key))
                                 c.delete(key)
+                    self._invalidate_distinct_counts_unions(c, model, source, _ids)
 
             with wrapper(cluster.fanout()) as client:
                 c = client.target_key(destination)
+                self._invalidate_distinct_counts_unions(c, model, destination, _ids)
 
                 temporary_key_sequence = itertools.count()
 
@@ -676,6 +837,12 @@ class RedisTSDB(BaseTSDB):
                                         )
                                     )
 
+                for model in models:
+                    for key in keys:
+                        self._invalidate_distinct_counts_unions(
+                            client.target_key(key), model, key, _ids
+                        )
+
     def make_frequency_table_keys(
         self,
         model: TSDBModel,
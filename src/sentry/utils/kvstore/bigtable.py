@@ -10,7 +10,7 @@ import sentry_sdk
 from django.utils import timezone
 from google.api_core import exceptions, retry
 from google.cloud import bigtable
-from google.cloud.bigtable.row import PartialRowData
+from google.cloud.bigtable.row import DirectRow, PartialRowData
 from google.cloud.bigtable.row_data import DEFAULT_RETRY_READ_ROWS
 from google.cloud.bigtable.row_set import RowSet
 from google.cloud.bigtable.table import Table
@@ -181,9 +181,15 @@ class BigtableKVStorage(KVStorage[str, bytes]):
 
         return value
 
-    def set(self, key: str, value: bytes, ttl: timedelta | None = None) -> None:
+    def set(
+        self, key: str, value: bytes, ttl: timedelta | None = None, compress: bool = True
+    ) -> None:
+        """
+        Values which are already compressed can be written with ``compress=False``
+        to skip the store's compression.
+        """
         try:
-            return self._set(key, value, ttl)
+            return self._set(key, value, ttl, compress)
         except (exceptions.InternalServerError, exceptions.ServiceUnavailable):
             # Delete cached client before retry
             with self.__table_lock:
@@ -191,12 +197,54 @@ class BigtableKVStorage(KVStorage[str, bytes]):
             # Retry once on InternalServerError or ServiceUnavailable
             # 500 Received RST_STREAM with error code 2
             # SENTRY-S6D
-            return self._set(key, value, ttl)
+            return self._set(key, value, ttl, compress)
+
+    def _set(
+        self, key: str, value: bytes, ttl: timedelta | None = None, compress: bool = True
+    ) -> None:
+        row = self._build_row(self._get_table(), key, value, ttl, compress)
+        status = row.commit()
+        if status.code != 0:
+            raise BigtableError(status.code, status.message)
+
+    def set_many(
+        self,
+        items: Sequence[tuple[str, bytes]],
+        ttl: timedelta | None = None,
+        compress: bool = True,
+    ) -> None:
+        try:
+            return self._set_many(items, ttl, compress)
+        except (exceptions.InternalServerError, exceptions.ServiceUnavailable):
+            # Delete cached client before retry, see ``set``. Rewriting rows
+            # which were already written is harmless.
+            with self.__table_lock:
+                del self.__table
+            return self._set_many(items, ttl, compress)
+
+    def _set_many(
+        self,
+        items: Sequence[tuple[str, bytes]],
+        ttl: timedelta | None = None,
+        compress: bool = True,
+    ) -> None:
+        table = self._get_table()
+        rows = [self._build_row(table, key, value, ttl, compress) for key, value in items]
+
+        errors = []
+        for status in table.mutate_rows(rows):
+            if status.code != 0:
+                errors.append(BigtableError(status.code, status.message))
 
-    def _set(self, key: str, value: bytes, ttl: timedelta | None = None) -> None:
+        if errors:
+            raise BigtableError(errors)
+
+    def _build_row(
+        self, table: Table, key: str, value: bytes, ttl: timedelta | None, compress: bool = True
+    ) -> DirectRow:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
         # ``bytes`` but we are providing it with ``str``.
-        row = self._get_table().direct_row(key)
+        row = table.direct_row(key)
 
         # Call to delete is just a state mutation, and in this case is just
         # used to clear all columns so the entire row will be replaced.
@@ -235,7 +283,7 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         # tracking now is whether compression is on or not for the data column.
         flags = self.Flags(0)
 
-        if self.compression:
+        if self.compression and compress:
             compression_flag, strategy = self.compression_strategies[self.compression]
             flags |= compression_flag
             value = strategy.encode(value)
@@ -253,10 +301,7 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         assert len(value) <= self.max_size
 
         row.set_cell(self.column_family, self.data_column, value, timestamp=ts)
-
-        status = row.commit()
-        if status.code != 0:
-            raise BigtableError(status.code, status.message)
+        return row
 
     def delete(self, key: str) -> None:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
@@ -22,10 +22,10 @@ import sentry_sdk.scope
 import urllib3
 from dateutil.parser import parse as parse_datetime
 from django.conf import settings
-from django.core.cache import cache
 from snuba_sdk import DeleteQuery, MetricsQuery, Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry import options
 from sentry.models.environment import Environment
 from sentry.models.group import Group
 from sentry.models.grouprelease import GroupRelease
@@ -39,7 +39,7 @@ from sentry.snuba.dataset import Dataset
 from sentry.snuba.events import Columns
 from sentry.snuba.query_sources import QuerySource
 from sentry.snuba.referrer import validate_referrer
-from sentry.utils import json, metrics
+from sentry.utils import json, metrics, snuba_query_cache, snuba_transport
 from sentry.utils.dates import outside_retention_with_modified_start
 
 logger = logging.getLogger(__name__)
@@ -1082,8 +1082,8 @@ def get_cache_key(query: Request) -> str:
     else:
         hashable = json.dumps(query)
 
-    # sqc - Snuba Query Cache
-    return f"sqc:{sha1(hashable.encode('utf-8')).hexdigest()}"
+    # sqc - Snuba Query Cache, v2 entries carry their freshness (see `snuba_query_cache`)
+    return f"sqc:v2:{sha1(hashable.encode('utf-8')).hexdigest()}"
 
 
 def _apply_cache_and_build_results(
@@ -1095,49 +1095,17 @@ def _apply_cache_and_build_results(
     if scope.transaction:
         parent_api = scope.transaction.name
 
-    # Store the original position of the query so that we can maintain the order
-    snuba_requests_list: list[tuple[int, SnubaRequest]] = []
-    for i, snuba_request in enumerate(snuba_requests):
+    for snuba_request in snuba_requests:
         snuba_request.request.parent_api = parent_api
-        snuba_requests_list.append((i, snuba_request))
 
-    results = []
-
-    to_query: list[tuple[int, SnubaRequest, str | None]] = []
+    if not snuba_requests:
+        return []
 
     if use_cache:
-        cache_keys = [
-            get_cache_key(snuba_request.request) for _, snuba_request in snuba_requests_list
-        ]
-        cache_data = cache.get_many(cache_keys)
-        for (query_pos, snuba_request), cache_key in zip(snuba_requests_list, cache_keys):
-            cached_result = cache_data.get(cache_key)
-            metric_tags = {"referrer": snuba_request.referrer} if snuba_request.referrer else None
-            if cached_result is None:
-                metrics.incr("snuba.query_cache.miss", tags=metric_tags)
-                to_query.append((query_pos, snuba_request, cache_key))
-            else:
-                metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
-    else:
-        for query_pos, snuba_request in snuba_requests_list:
-            to_query.append((query_pos, snuba_request, None))
-
-    if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query])
-        for result, (query_pos, _, opt_cache_key) in zip(query_results, to_query):
-            if opt_cache_key:
-                cache.set(
-                    opt_cache_key,
-                    json.dumps(result),
-                    settings.SENTRY_SNUBA_CACHE_TTL_SECONDS,
-                )
-            results.append((query_pos, result))
+        cache_keys = [get_cache_key(snuba_request.request) for snuba_request in snuba_requests]
+        return snuba_query_cache.get_results(snuba_requests, cache_keys, _bulk_snuba_query)
 
-    # Sort so that we get the results back in the original param list order
-    results.sort()
-    # Drop the sort order val
-    return [result[1] for result in results]
+    return _bulk_snuba_query(snuba_requests)
 
 
 def _is_rejected_query(body: Any) -> bool:
@@ -1155,7 +1123,9 @@ def _bulk_snuba_query(snuba_requests: Sequence[SnubaRequest]) -> ResultSet:
     with sentry_sdk.start_span(op="snuba_query") as span:
         span.set_tag("snuba.num_queries", len(snuba_requests_list))
 
-        if len(snuba_requests_list) > 1:
+        if options.get("snuba.async-transport.enabled"):
+            query_results = _snuba_query_async(snuba_requests_list)
+        elif len(snuba_requests_list) > 1:
             query_results = list(
                 _query_thread_pool.map(
                     _snuba_query,
@@ -1275,6 +1245,24 @@ def _log_request_query(req: Request) -> None:
 RawResult = tuple[str, urllib3.response.HTTPResponse, Translator, Translator]
 
 
+def _prepare_snuba_request(snuba_request: SnubaRequest) -> str:
+    """
+    Logs and tags a request before it is sent, whichever way that happens. Returns its referrer.
+    """
+    referrer = snuba_request.headers.get("referer", "unknown")
+
+    if SNUBA_INFO:
+        import pprint
+
+        log_snuba_info(f"{referrer}.body:\n {pprint.pformat(snuba_request.request.to_dict())}")
+        snuba_request.request.flags.debug = True
+
+    # We set both span + sdk level, this is cause 1 txn/error might query snuba more than once
+    # but we still want to know a general sense of how referrers impact performance
+    sentry_sdk.set_tag("query.referrer", referrer)
+    return referrer
+
+
 def _snuba_query(
     params: tuple[
         sentry_sdk.Scope,
@@ -1290,17 +1278,7 @@ def _snuba_query(
             headers = snuba_request.headers
             request = snuba_request.request
             try:
-                referrer = headers.get("referer", "unknown")
-
-                if SNUBA_INFO:
-                    import pprint
-
-                    log_snuba_info(f"{referrer}.body:\n {pprint.pformat(request.to_dict())}")
-                    request.flags.debug = True
-
-                # We set both span + sdk level, this is cause 1 txn/error might query snuba more than once
-                # but we still want to know a general sense of how referrers impact performance
-                sentry_sdk.set_tag("query.referrer", referrer)
+                referrer = _prepare_snuba_request(snuba_request)
 
                 if isinstance(request.query, MetricsQuery):
                     return (
@@ -1327,6 +1305,40 @@ def _snuba_query(
                 raise SnubaError(err)
 
 
+def _get_http_request(snuba_request: SnubaRequest) -> snuba_transport.HttpRequest:
+    request = snuba_request.request
+    if isinstance(request.query, MetricsQuery):
+        method, path = "POST", f"/{request.dataset}/mql"
+    elif isinstance(request.query, DeleteQuery):
+        method, path = "DELETE", f"/{request.query.storage_name}"
+    else:
+        method, path = "POST", f"/{request.dataset}/snql"
+    return snuba_transport.HttpRequest(
+        method=method, path=path, body=request.serialize(), headers=snuba_request.headers
+    )
+
+
+def _snuba_query_async(snuba_requests: Sequence[SnubaRequest]) -> list[RawResult]:
+    """
+    Sends all queries at once through `snuba_transport`, rather than one per thread of
+    `_query_thread_pool`.
+    """
+    # Requests are serialized after they're prepared, which may enable their debug flag
+    referrers = [_prepare_snuba_request(snuba_request) for snuba_request in snuba_requests]
+    with timer("async_query"):
+        try:
+            responses = snuba_transport.get_transport().bulk_request(
+                [_get_http_request(snuba_request) for snuba_request in snuba_requests]
+            )
+        except snuba_transport.TransportError as err:
+            raise SnubaError(err)
+
+    return [
+        (referrer, response, snuba_request.forward, snuba_request.reverse)
+        for referrer, snuba_request, response in zip(referrers, snuba_requests, responses)
+    ]
+
+
 def _raw_delete_query(
     request: Request, headers: Mapping[str, str]
 ) -> urllib3.response.HTTPResponse:
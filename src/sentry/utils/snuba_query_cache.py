@@ -0,0 +1,194 @@
+"""
+Shared cache of Snuba query results, used by queries made with ``use_cache=True``.
+
+Popular dashboards and issue streams make the very same queries over and over again, and used to
+send all of them to Snuba whenever the cached result had just expired. On top of caching each
+result for its TTL, this module therefore:
+
+* coalesces concurrent identical queries of a process, so only the first one goes to Snuba and the
+  others wait for its result (single-flight), and
+* keeps serving a result for a while after its TTL has passed (stale-while-revalidate). The first
+  caller to find it stale takes a short-lived lock in the shared cache and refreshes it, while
+  every other caller, in any process, is served the stale result in the meantime.
+
+The TTLs default to ``SENTRY_SNUBA_CACHE_TTL_SECONDS`` and ``snuba.query-cache.stale-ttl-seconds``,
+and can be set per referrer through ``snuba.query-cache.referrer-policies``, e.g.
+``{"api.dashboards.widget.line-chart": {"ttl": 120, "stale_ttl": 600}}``.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from sentry import options
+from sentry.utils import json, metrics
+
+if TYPE_CHECKING:
+    from sentry.utils.snuba import SnubaRequest
+
+Result = Mapping[str, Any]
+
+
+class CacheEntry(TypedDict):
+    # The JSON encoded result, which is decoded for every caller so that they can't change each
+    # other's results
+    result: str
+    fresh_until: float
+
+
+@dataclasses.dataclass(frozen=True)
+class CachePolicy:
+    ttl: int
+    stale_ttl: int
+
+
+class _Flight:
+    __slots__ = ("done", "result")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: str | None = None
+
+
+_flights: dict[str, _Flight] = {}
+_lock = threading.Lock()
+
+
+def get_policy(referrer: str | None) -> CachePolicy:
+    policy = options.get("snuba.query-cache.referrer-policies").get(referrer or "") or {}
+    return CachePolicy(
+        ttl=policy.get("ttl", settings.SENTRY_SNUBA_CACHE_TTL_SECONDS),
+        stale_ttl=policy.get("stale_ttl", options.get("snuba.query-cache.stale-ttl-seconds")),
+    )
+
+
+def _get_refresh_lock_key(cache_key: str) -> str:
+    return f"{cache_key}:refresh"
+
+
+def _get_metric_tags(snuba_request: SnubaRequest) -> dict[str, str]:
+    return {"referrer": snuba_request.referrer} if snuba_request.referrer else {}
+
+
+def _store(cache_key: str, snuba_request: SnubaRequest, result: str) -> None:
+    policy = get_policy(snuba_request.referrer)
+    entry: CacheEntry = {"result": result, "fresh_until": time.time() + policy.ttl}
+    cache.set(cache_key, entry, policy.ttl + policy.stale_ttl)
+
+
+def get_results(
+    snuba_requests: Sequence[SnubaRequest],
+    cache_keys: Sequence[str],
+    query: Callable[[Sequence[SnubaRequest]], list[Result]],
+) -> list[Result]:
+    """
+    Returns the results of `snuba_requests` (in the same order) from the cache, from concurrent
+    identical queries, or by calling `query` with the requests which need to be sent to Snuba.
+    """
+    now = time.time()
+    cached: dict[str, CacheEntry] = cache.get_many(list(cache_keys))
+
+    results: dict[int, Result] = {}
+    to_query: list[int] = []
+    refreshing: list[str] = []
+    for i, (snuba_request, cache_key) in enumerate(zip(snuba_requests, cache_keys)):
+        metric_tags = _get_metric_tags(snuba_request)
+        entry = cached.get(cache_key)
+        if entry is None:
+            metrics.incr("snuba.query_cache.miss", tags=metric_tags)
+            to_query.append(i)
+        elif entry["fresh_until"] > now:
+            metrics.incr("snuba.query_cache.hit", tags=metric_tags)
+            results[i] = json.loads(entry["result"])
+        elif cache.add(_get_refresh_lock_key(cache_key), 1, settings.SENTRY_SNUBA_TIMEOUT):
+            metrics.incr("snuba.query_cache.stale", tags={**metric_tags, "action": "refresh"})
+            to_query.append(i)
+            refreshing.append(cache_key)
+        else:
+            metrics.incr("snuba.query_cache.stale", tags={**metric_tags, "action": "serve"})
+            results[i] = json.loads(entry["result"])
+
+    try:
+        if to_query:
+            results.update(_query(snuba_requests, cache_keys, to_query, query))
+    finally:
+        if refreshing:
+            cache.delete_many([_get_refresh_lock_key(cache_key) for cache_key in refreshing])
+
+    return [results[i] for i in range(len(snuba_requests))]
+
+
+def _query_and_store(
+    snuba_requests: Sequence[SnubaRequest],
+    cache_keys: Sequence[str],
+    indexes: Sequence[int],
+    query: Callable[[Sequence[SnubaRequest]], list[Result]],
+    flights: Mapping[str, _Flight] | None = None,
+) -> dict[int, Result]:
+    rv = {}
+    for i, result in zip(indexes, query([snuba_requests[i] for i in indexes])):
+        encoded_result = json.dumps(result)
+        _store(cache_keys[i], snuba_requests[i], encoded_result)
+        if flights is not None:
+            flights[cache_keys[i]].result = encoded_result
+        rv[i] = result
+    return rv
+
+
+def _query(
+    snuba_requests: Sequence[SnubaRequest],
+    cache_keys: Sequence[str],
+    indexes: Sequence[int],
+    query: Callable[[Sequence[SnubaRequest]], list[Result]],
+) -> dict[int, Result]:
+    if not options.get("snuba.query-cache.single-flight.enabled"):
+        return _query_and_store(snuba_requests, cache_keys, indexes, query)
+
+    owned: dict[str, _Flight] = {}
+    to_query: list[int] = []
+    to_wait: list[tuple[int, _Flight]] = []
+    with _lock:
+        for i in indexes:
+            cache_key = cache_keys[i]
+            flight = _flights.get(cache_key)
+            if flight is None:
+                flight = _flights[cache_key] = owned[cache_key] = _Flight()
+                to_query.append(i)
+            else:
+                # Also covers duplicate requests within the same batch, whose flight is ours
+                to_wait.append((i, flight))
+
+    try:
+        results = _query_and_store(snuba_requests, cache_keys, to_query, query, owned)
+    finally:
+        with _lock:
+            for cache_key, flight in owned.items():
+                if _flights.get(cache_key) is flight:
+                    del _flights[cache_key]
+        for flight in owned.values():
+            flight.done.set()
+
+    # Wait as long as the concurrent query may take before giving up on it and making our own
+    fallback = []
+    for i, flight in to_wait:
+        if flight.done.wait(settings.SENTRY_SNUBA_TIMEOUT) and flight.result is not None:
+            metrics.incr("snuba.query_cache.coalesced", tags=_get_metric_tags(snuba_requests[i]))
+            results[i] = json.loads(flight.result)
+        else:
+            fallback.append(i)
+
+    if fallback:
+        results.update(_query_and_store(snuba_requests, cache_keys, fallback, query))
+    return results
+
+
+def clear() -> None:
+    with _lock:
+        _flights.clear()
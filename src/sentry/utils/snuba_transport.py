@@ -0,0 +1,209 @@
+"""
+Asynchronous transport for Snuba queries.
+
+By default `sentry.utils.snuba._bulk_snuba_query` sends each query of a batch from one of the
+threads of a fixed pool, using a blocking urllib3 request, so that a dashboard with 20 widgets
+occupies 20 threads of a web worker. When ``snuba.async-transport.enabled`` is set, the queries are
+instead sent from a single event loop per process, which interleaves them over a pool of
+keep-alive HTTP/1.1 connections to Snuba. Each connection carries one query at a time, so the pool
+size bounds the number of queries in flight per process.
+
+Each query has a deadline, and the number of queries which are in flight for the same referrer is
+capped by ``snuba.async-transport.max-concurrent-per-referrer``, so that a single noisy referrer
+cannot take up all the connections. `bulk_request` is a blocking facade over the event loop, so
+callers of `bulk_snuba_queries` don't need to change.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import os
+import threading
+import time
+from collections.abc import Mapping, Sequence
+
+import httpx
+import sentry_sdk
+import sentry_sdk.scope
+import urllib3
+from django.conf import settings
+
+from sentry import options
+from sentry.utils import metrics
+
+
+class TransportError(Exception):
+    pass
+
+
+class DeadlineExceeded(TransportError):
+    pass
+
+
+@dataclasses.dataclass(frozen=True)
+class HttpRequest:
+    method: str
+    path: str
+    body: str
+    headers: Mapping[str, str]
+
+    @property
+    def referrer(self) -> str:
+        return self.headers.get("referer", "<unknown>")
+
+
+class AsyncTransport:
+    """
+    Sends requests to `base_url` from an event loop running in a daemon thread of its own, which
+    is started on first use (and again in forked children).
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 50, retries: int = 5) -> None:
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.retries = retries
+
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: httpx.AsyncClient | None = None
+        # Only accessed from the event loop
+        self._semaphores: dict[str, tuple[int, asyncio.Semaphore]] = {}
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="snuba-async-transport", daemon=True
+                ).start()
+                self._loop = loop
+                self._pid = os.getpid()
+                self._client = None
+                self._semaphores = {}
+            return self._loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                # Only connection failures are retried, as retrying after a timeout adds useless
+                # load to Snuba (see `RetrySkipTimeout`)
+                transport=httpx.AsyncHTTPTransport(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                    ),
+                    retries=self.retries,
+                ),
+                # Deadlines are enforced per request
+                timeout=None,
+            )
+        return self._client
+
+    def _get_semaphore(self, referrer: str) -> asyncio.Semaphore:
+        limit = options.get("snuba.async-transport.max-concurrent-per-referrer")
+        current = self._semaphores.get(referrer)
+        if current is None or current[0] != limit:
+            current = self._semaphores[referrer] = (limit, asyncio.Semaphore(limit))
+        return current[1]
+
+    async def _request(
+        self,
+        request: HttpRequest,
+        deadline: float,
+        isolation_scope: sentry_sdk.Scope,
+        current_scope: sentry_sdk.Scope,
+    ) -> urllib3.response.HTTPResponse:
+        with sentry_sdk.scope.use_isolation_scope(isolation_scope):
+            with sentry_sdk.scope.use_scope(current_scope):
+                with sentry_sdk.start_span(op="snuba_async.run", name=request.referrer) as span:
+                    span.set_tag("snuba.referrer", request.referrer)
+                    try:
+                        async with asyncio.timeout_at(deadline):
+                            async with self._get_semaphore(request.referrer):
+                                response = await self._get_client().request(
+                                    request.method,
+                                    request.path,
+                                    content=request.body,
+                                    headers=dict(request.headers),
+                                )
+                    except TimeoutError:
+                        metrics.incr(
+                            "snuba.async_transport.deadline_exceeded",
+                            tags={"referrer": request.referrer},
+                        )
+                        raise DeadlineExceeded(f"Deadline exceeded for {request.path}")
+                    except httpx.HTTPError as e:
+                        raise TransportError(e) from e
+
+                    span.set_tag("snuba.response.status", response.status_code)
+                    # Mimic the responses of `_snuba_pool`, which is what callers expect
+                    return urllib3.response.HTTPResponse(
+                        body=response.content,
+                        headers=dict(response.headers),
+                        status=response.status_code,
+                    )
+
+    async def _bulk_request(
+        self,
+        requests: Sequence[HttpRequest],
+        timeout: float,
+        isolation_scope: sentry_sdk.Scope,
+        current_scope: sentry_sdk.Scope,
+    ) -> list[urllib3.response.HTTPResponse]:
+        deadline = asyncio.get_running_loop().time() + timeout
+        return list(
+            await asyncio.gather(
+                *(
+                    self._request(request, deadline, isolation_scope, current_scope)
+                    for request in requests
+                )
+            )
+        )
+
+    def bulk_request(
+        self, requests: Sequence[HttpRequest], timeout: float | None = None
+    ) -> list[urllib3.response.HTTPResponse]:
+        """
+        Sends all `requests` concurrently, and blocks until all of them have a response (which are
+        returned in the same order) or one has failed. Raises `DeadlineExceeded` unless all of them
+        complete within `timeout` seconds (`SENTRY_SNUBA_TIMEOUT` by default).
+        """
+        if timeout is None:
+            timeout = settings.SENTRY_SNUBA_TIMEOUT
+
+        start = time.monotonic()
+        future = asyncio.run_coroutine_threadsafe(
+            self._bulk_request(
+                requests,
+                timeout,
+                sentry_sdk.get_isolation_scope(),
+                sentry_sdk.get_current_scope(),
+            ),
+            self._get_loop(),
+        )
+        try:
+            # The event loop enforces the deadline, this only guards against it being stuck
+            return future.result(timeout + 1)
+        except TimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(f"Requests did not complete within {timeout}s")
+        finally:
+            metrics.timing("snuba.async_transport.bulk_request", time.monotonic() - start)
+
+
+_transport: AsyncTransport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> AsyncTransport:
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = AsyncTransport(
+                settings.SENTRY_SNUBA,
+                max_connections=options.get("snuba.async-transport.max-connections"),
+            )
+        return _transport
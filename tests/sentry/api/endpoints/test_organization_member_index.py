@@ -13,10 +13,12 @@ from sentry.roles import organization_roles
 from sentry.silo.base import SiloMode
 from sentry.testutils.cases import APITestCase, TestCase
 from sentry.testutils.helpers import Feature, with_feature
+from sentry.testutils.helpers.queries import capture_model_queries
 from sentry.testutils.hybrid_cloud import HybridCloudTestMixin
 from sentry.testutils.outbox import outbox_runner
 from sentry.testutils.silo import assume_test_silo_mode
 from sentry.users.models.authenticator import Authenticator
+from sentry.users.models.user import User
 from sentry.users.models.useremail import UserEmail
 
 
@@ -201,6 +203,27 @@ class OrganizationMemberListTest(OrganizationMemberListTestBase, HybridCloudTest
         assert not response.data[0]["pending"]
         assert not response.data[0]["expired"]
 
+    def test_user_lookups_are_batched(self):
+        def create_member() -> None:
+            self.create_member(
+                organization=self.organization,
+                user=self.create_user(),
+                inviter_id=self.create_user().id,
+            )
+
+        def count_user_queries() -> int:
+            with capture_model_queries(User) as queries:
+                self.get_success_response(self.organization.slug)
+            return queries[User]
+
+        create_member()
+        count_user_queries()
+        expected = count_user_queries()
+
+        for _ in range(3):
+            create_member()
+        assert count_user_queries() == expected
+
     def test_staff_simple(self):
         staff_user = self.create_user("staff@localhost", is_staff=True)
         self.login_as(user=staff_user, staff=True)
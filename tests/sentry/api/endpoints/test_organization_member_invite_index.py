@@ -6,6 +6,8 @@ from sentry.roles import organization_roles
 from sentry.testutils.cases import APITestCase
 from sentry.testutils.helpers import Feature
 from sentry.testutils.helpers.features import apply_feature_flag_on_cls
+from sentry.testutils.helpers.queries import capture_model_queries
+from sentry.users.models.user import User
 
 
 def mock_organization_roles_get_factory(original_organization_roles_get):
@@ -47,6 +49,27 @@ class OrganizationMemberInviteListTest(APITestCase):
         # make sure we don't serialize token
         assert not response.data[0].get("token")
 
+    def test_user_lookups_are_batched(self):
+        self.login_as(self.user)
+
+        def create_invite() -> None:
+            self.create_member_invite(
+                organization=self.organization, inviter_id=self.create_user().id
+            )
+
+        def count_user_queries() -> int:
+            with capture_model_queries(User) as queries:
+                self.get_success_response(self.organization.slug)
+            return queries[User]
+
+        create_invite()
+        count_user_queries()
+        expected = count_user_queries()
+
+        for _ in range(3):
+            create_invite()
+        assert count_user_queries() == expected
+
 
 @apply_feature_flag_on_cls("organizations:new-organization-member-invite")
 class OrganizationMemberInvitePermissionRoleTest(APITestCase):
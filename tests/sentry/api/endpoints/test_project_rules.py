@@ -20,6 +20,7 @@ from sentry.models.rule import Rule, RuleActivity, RuleActivityType
 from sentry.silo.base import SiloMode
 from sentry.testutils.cases import APITestCase
 from sentry.testutils.helpers import install_slack, with_feature
+from sentry.testutils.helpers.queries import capture_model_queries
 from sentry.testutils.silo import assume_test_silo_mode
 from sentry.types.actor import Actor
 from sentry.users.models.user import User
@@ -81,6 +82,27 @@ class ProjectRuleListTest(ProjectRuleBaseTestCase):
         )
         assert len(response.data) == Rule.objects.filter(project=self.project).count()
 
+    def test_user_lookups_are_batched(self):
+        def create_rule() -> None:
+            rule = self.create_project_rule(project=self.project)
+            RuleActivity.objects.create(
+                rule=rule, user_id=self.create_user().id, type=RuleActivityType.CREATED.value
+            )
+            self.snooze_rule(owner_id=self.create_user().id, rule=rule)
+
+        def count_user_queries() -> int:
+            with capture_model_queries(User) as queries:
+                self.get_success_response(self.organization.slug, self.project.slug)
+            return queries[User]
+
+        create_rule()
+        count_user_queries()
+        expected = count_user_queries()
+
+        for _ in range(3):
+            create_rule()
+        assert count_user_queries() == expected
+
 
 class GetMaxAlertsTest(ProjectRuleBaseTestCase):
     @override_settings(MAX_SLOW_CONDITION_ISSUE_ALERTS=1)
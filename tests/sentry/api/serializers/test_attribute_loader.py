@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+from django.db import router, transaction
+
+from sentry.api.serializers.attribute_loader import AttributeLoader, AttributeLoadTimeout
+from sentry.models.group import Group
+from sentry.testutils.cases import TransactionTestCase
+from sentry.testutils.helpers.options import override_options
+
+
+class AttributeLoaderTest(TransactionTestCase):
+    """
+    Not a `TestCase`, since loading is never concurrent inside of the transaction that wraps each
+    of its tests.
+    """
+
+    def _load(self) -> dict[str, object]:
+        loader = AttributeLoader()
+        loader.add("a", lambda: 1)
+        loader.add("b", lambda: 2)
+        loader.add("c", lambda a, b: a + b, depends_on=["a", "b"])
+        loader.add("d", lambda c: c * 10, depends_on=["c"])
+        return {key: loader.get(key) for key in "abcd"}
+
+    def test_serial(self):
+        assert self._load() == {"a": 1, "b": 2, "c": 3, "d": 30}
+
+    @override_options({"api.serializers.concurrent-attrs.enabled": True})
+    def test_concurrent(self):
+        assert self._load() == {"a": 1, "b": 2, "c": 3, "d": 30}
+
+    @override_options({"api.serializers.concurrent-attrs.enabled": True})
+    def test_independent_loads_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        loader = AttributeLoader()
+        # Each load can only complete if the other one runs at the same time
+        loader.add("a", lambda: barrier.wait())
+        loader.add("b", lambda: barrier.wait())
+        assert {loader.get("a"), loader.get("b")} == {0, 1}
+
+    @override_options({"api.serializers.concurrent-attrs.enabled": True})
+    def test_serial_in_transaction(self):
+        assert AttributeLoader().concurrent
+        with transaction.atomic(router.db_for_write(Group)):
+            assert not AttributeLoader().concurrent
+            assert self._load() == {"a": 1, "b": 2, "c": 3, "d": 30}
+
+    @override_options({"api.serializers.concurrent-attrs.enabled": True})
+    def test_failures_propagate(self):
+        def fail():
+            raise ValueError("nope")
+
+        loader = AttributeLoader()
+        loader.add("a", fail)
+        loader.add("b", lambda a: a, depends_on=["a"])
+        with pytest.raises(ValueError):
+            loader.get("b")
+
+    @override_options({"api.serializers.concurrent-attrs.enabled": True})
+    def test_deadline(self):
+        release = threading.Event()
+
+        loader = AttributeLoader(timeout=0.1)
+        loader.add("a", lambda: release.wait(5))
+        with pytest.raises(AttributeLoadTimeout):
+            loader.get("a")
+        release.set()
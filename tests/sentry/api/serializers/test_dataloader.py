@@ -0,0 +1,102 @@
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+from sentry.api.serializers import Serializer, serialize
+from sentry.api.serializers.dataloader import (
+    DataLoader,
+    get_loader,
+    get_team_loader,
+    loader_scope,
+)
+from sentry.testutils.cases import TestCase
+
+
+class DataLoaderTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.batches: list[list[int]] = []
+
+    def _batch_load(self, keys: list[int]) -> dict[int, str]:
+        self.batches.append(sorted(keys))
+        return {key: str(key) for key in keys if key < 10}
+
+    def test_load_many(self):
+        loader = DataLoader("test", self._batch_load)
+        assert loader.load_many([1, 2, 11]) == {1: "1", 2: "2"}
+        assert loader.load_many([2, 3, 11]) == {2: "2", 3: "3"}
+        assert loader.load(11) is None
+        assert self.batches == [[1, 2, 11], [3]]
+
+    def test_prime(self):
+        loader = DataLoader("test", self._batch_load)
+        loader.prime([1, 2])
+        loader.prime([3])
+        assert loader.load(1) == "1"
+        assert loader.load_many([2, 3]) == {2: "2", 3: "3"}
+        assert self.batches == [[1, 2, 3]]
+
+    def test_scope(self):
+        assert get_loader("test", self._batch_load) is not get_loader("test", self._batch_load)
+
+        with loader_scope():
+            loader = get_loader("test", self._batch_load)
+            with loader_scope():
+                assert get_loader("test", self._batch_load) is loader
+
+        assert get_loader("test", self._batch_load) is not loader
+
+
+class TeamSerializer(Serializer):
+    def get_attrs(self, item_list, user, **kwargs):
+        teams = get_team_loader().load_many(item_list)
+        return {team_id: {"slug": teams[team_id].slug} for team_id in item_list}
+
+    def serialize(self, obj, attrs, user, **kwargs):
+        return attrs["slug"]
+
+
+class ParentSerializer(Serializer):
+    def get_attrs(self, item_list, user, **kwargs):
+        get_team_loader().prime(team_id for team_ids in item_list for team_id in team_ids)
+        return {}
+
+    def serialize(self, obj, attrs, user, **kwargs):
+        return serialize(list(obj), user, TeamSerializer())
+
+
+class NestedSerializationTest(TestCase):
+    def _count_team_queries(self, queries: CaptureQueriesContext) -> int:
+        return sum('FROM "sentry_team"' in query["sql"] for query in queries.captured_queries)
+
+    def test_nested_lookups_are_batched(self):
+        teams = [self.create_team() for _ in range(4)]
+        parents = [
+            (teams[0].id, teams[1].id),
+            (teams[1].id, teams[2].id),
+            (teams[3].id,),
+        ]
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            result = serialize(parents, self.user, ParentSerializer())
+
+        assert result == [
+            [teams[0].slug, teams[1].slug],
+            [teams[1].slug, teams[2].slug],
+            [teams[3].slug],
+        ]
+        assert self._count_team_queries(queries) == 1
+
+    def test_lookups_are_memoized_within_scope(self):
+        teams = [self.create_team() for _ in range(2)]
+        team_ids = [team.id for team in teams]
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            with loader_scope():
+                for _ in range(3):
+                    serialize(team_ids, self.user, TeamSerializer())
+        assert self._count_team_queries(queries) == 1
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            for _ in range(3):
+                serialize(team_ids, self.user, TeamSerializer())
+        assert self._count_team_queries(queries) == 3
@@ -1,5 +1,8 @@
+import threading
 from unittest import mock
 
+from django.db import connections
+
 from sentry import tsdb
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.group_stream import (
@@ -8,8 +11,15 @@ from sentry.api.serializers.models.group_stream import (
 )
 from sentry.issues.grouptype import GroupCategory, ProfileFileIOGroupType
 from sentry.models.environment import Environment
-from sentry.testutils.cases import BaseMetricsTestCase, PerformanceIssueTestCase, TestCase
+from sentry.testutils.cases import (
+    BaseMetricsTestCase,
+    PerformanceIssueTestCase,
+    SnubaTestCase,
+    TestCase,
+    TransactionTestCase,
+)
 from sentry.testutils.helpers.datetime import before_now, freeze_time
+from sentry.testutils.helpers.options import override_options
 from tests.sentry.issues.test_utils import SearchIssueTestMixin
 
 
@@ -82,3 +92,57 @@ class StreamGroupSerializerTestCase(
         assert serialized["issueType"] == str(ProfileFileIOGroupType.slug)
         assert [stat[1] for stat in serialized["stats"]["24h"][:-1]] == [0] * 23
         assert serialized["stats"]["24h"][-1][1] == 1
+
+
+class StreamGroupSerializerSnubaConcurrentTest(TransactionTestCase, SnubaTestCase):
+    """
+    Attributes loaded in the attribute loader's threads, with database connections of their own.
+    """
+
+    @freeze_time(before_now(days=1).replace(hour=13, minute=30, second=0, microsecond=0))
+    def test_concurrent_attrs(self):
+        event = self.store_event(
+            data={
+                "timestamp": before_now(minutes=5).isoformat(),
+                "environment": "production",
+                "user": {"id": "1"},
+            },
+            project_id=self.project.id,
+        )
+        environment = Environment.objects.get(
+            organization_id=self.organization.id, name="production"
+        )
+
+        def serialize_group():
+            return serialize(
+                event.group,
+                serializer=StreamGroupSerializerSnuba(
+                    environment_ids=[environment.id],
+                    stats_period="24h",
+                    organization_id=self.organization.id,
+                ),
+                request=self.make_request(),
+            )
+
+        closing_threads = []
+
+        def close_all() -> None:
+            closing_threads.append(threading.current_thread())
+            connections.close_all()
+
+        with (
+            override_options({"api.serializers.concurrent-attrs.enabled": True}),
+            mock.patch("sentry.api.serializers.attribute_loader.connections") as mock_connections,
+        ):
+            mock_connections.all.side_effect = connections.all
+            mock_connections.close_all.side_effect = close_all
+            serialized = serialize_group()
+
+        assert serialized["count"] == "1"
+        assert serialized["userCount"] == 1
+        assert serialized["firstSeen"] is not None
+        assert serialized["stats"]["24h"][-1][1] == 1
+        assert serialized == serialize_group()
+        # Each fetch ran in a thread of the loader, which closed its connections
+        assert closing_threads
+        assert threading.current_thread() not in closing_threads
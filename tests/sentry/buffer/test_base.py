@@ -4,7 +4,7 @@ from unittest import mock
 from django.utils import timezone
 from pytest import raises
 
-from sentry.buffer.base import Buffer, BufferField
+from sentry.buffer.base import Buffer, BufferedIncr, BufferField
 from sentry.models.group import Group
 from sentry.models.organization import Organization
 from sentry.models.project import Project
@@ -84,6 +84,56 @@ class BufferTest(TestCase):
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
 
+    def test_process_many(self):
+        groups = [Group.objects.create(project=Project(id=1)) for _ in range(3)]
+        the_date = timezone.now() + timedelta(days=5)
+        release_filters = {"project_id": self.project.id, "release_id": self.release.id}
+        incrs = [
+            BufferedIncr(Group, {"times_seen": i + 1}, {"id": group.id}, {"last_seen": the_date})
+            for i, group in enumerate(groups)
+        ]
+        incrs.append(BufferedIncr(ReleaseProject, {"new_groups": 1}, release_filters))
+
+        with mock.patch.object(self.buf, "process", wraps=self.buf.process) as process:
+            self.buf.process_many(incrs)
+
+        # Only the entry with composite filters needs its own query
+        process.assert_called_once_with(
+            ReleaseProject, {"new_groups": 1}, release_filters, None, None
+        )
+        for i, group in enumerate(groups):
+            reload = Group.objects.get(id=group.id)
+            assert reload.times_seen == group.times_seen + i + 1
+            assert reload.last_seen == the_date
+        assert ReleaseProject.objects.filter(new_groups=1, **release_filters).exists()
+
+    def test_process_many_explicit_none(self):
+        the_date = timezone.now() + timedelta(days=5)
+        resolved = Group.objects.create(project=Project(id=1), resolved_at=timezone.now())
+        untouched = Group.objects.create(project=Project(id=1), resolved_at=timezone.now())
+        self.buf.process_many(
+            [
+                BufferedIncr(Group, {"times_seen": 1}, {"id": resolved.id}, {"resolved_at": None}),
+                BufferedIncr(
+                    Group, {"times_seen": 1}, {"id": untouched.id}, {"last_seen": the_date}
+                ),
+            ]
+        )
+
+        reload = Group.objects.get(id=resolved.id)
+        assert reload.resolved_at is None
+        assert reload.last_seen == resolved.last_seen
+        reload = Group.objects.get(id=untouched.id)
+        assert reload.resolved_at == untouched.resolved_at
+        assert reload.last_seen == the_date
+
+    def test_process_many_signal_only(self):
+        group = Group.objects.create(project=Project(id=1))
+        self.buf.process_many(
+            [BufferedIncr(Group, {"times_seen": 1}, {"id": group.id}, signal_only=True)]
+        )
+        assert Group.objects.get(id=group.id).times_seen == group.times_seen
+
     def test_push_to_hash_bulk(self):
         raises(NotImplementedError, self.buf.push_to_hash_bulk, Group, {"id": 1}, {"foo": "bar"})
 
@@ -0,0 +1,34 @@
+import pytest
+from django.utils import timezone
+
+from sentry.buffer.redis import RedisBuffer
+from sentry.models.group import Group
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.pytest.fixtures import django_db_all
+
+PENDING_KEYS = 10_000
+
+
+@django_db_all
+@pytest.mark.parametrize("bulk", [False, True], ids=["per_key", "bulk"])
+def test_benchmark_flush(bulk, benchmark, default_project):
+    buf = RedisBuffer()
+    groups = Group.objects.bulk_create(
+        [Group(project=default_project) for _ in range(PENDING_KEYS)]
+    )
+    keys = [buf._make_key(Group, {"id": group.id}) for group in groups]
+
+    def setup():
+        last_seen = timezone.now()
+        for group in groups:
+            buf.incr(Group, {"times_seen": 1}, {"id": group.id}, {"last_seen": last_seen})
+        return (), {}
+
+    def flush():
+        buf.process(batch_keys=keys)
+
+    with override_options({"buffer.bulk-flush.enabled": bulk}):
+        benchmark.pedantic(flush, setup=setup, rounds=3)
+
+    benchmark.extra_info["keys"] = PENDING_KEYS
+    assert Group.objects.get(id=groups[0].id).times_seen == 1 + 3
@@ -0,0 +1,107 @@
+from unittest import mock
+
+import pytest
+
+from sentry.buffer.coalescing import (
+    CoalescingBuffer,
+    disable_local_buffer,
+    enable_local_buffer,
+    flush_before_commit,
+    get_local_buffer,
+)
+from sentry.models.group import Group
+from sentry.models.project import Project
+from sentry.tasks.process_buffer import buffer_incr
+from sentry.testutils.helpers.datetime import before_now
+from sentry.testutils.helpers.options import override_options
+
+
+@pytest.fixture
+def backend():
+    with mock.patch("sentry.buffer.backend") as backend:
+        yield backend
+
+
+@pytest.fixture
+def local_buffer():
+    with override_options({"buffer.coalescing.consumers": ["test-consumer"]}):
+        local_buffer = enable_local_buffer("test-consumer")
+    yield local_buffer
+    disable_local_buffer()
+
+
+def test_incr_coalesces(backend):
+    buf = CoalescingBuffer(max_keys=100, max_age=60)
+    earlier, later = before_now(minutes=2), before_now(minutes=1)
+
+    buf.incr(Group, {"times_seen": 1}, {"id": 1}, {"last_seen": earlier})
+    buf.incr(Group, {"times_seen": 2}, {"id": 1}, {"last_seen": later})
+    buf.incr(Group, {"times_seen": 1}, {"id": 2})
+    buf.incr(Group, {"times_seen": 1}, {"id": 2}, signal_only=True)
+    assert len(buf) == 3
+    assert backend.incr.call_count == 0
+
+    buf.flush()
+    assert len(buf) == 0
+    assert backend.incr.call_args_list == [
+        mock.call(
+            Group, {"times_seen": 3}, {"id": 1}, extra={"last_seen": later}, signal_only=None
+        ),
+        mock.call(Group, {"times_seen": 1}, {"id": 2}, extra=None, signal_only=None),
+        mock.call(Group, {"times_seen": 1}, {"id": 2}, extra=None, signal_only=True),
+    ]
+
+
+def test_incr_model_filters_are_coalesced(backend):
+    buf = CoalescingBuffer(max_keys=100, max_age=60)
+    buf.incr(Group, {"times_seen": 1}, {"project": Project(id=1)})
+    buf.incr(Group, {"times_seen": 1}, {"project": 1})
+    assert len(buf) == 1
+
+
+def test_flush_on_max_keys(backend):
+    buf = CoalescingBuffer(max_keys=2, max_age=60)
+    buf.incr(Group, {"times_seen": 1}, {"id": 1})
+    assert backend.incr.call_count == 0
+    buf.incr(Group, {"times_seen": 1}, {"id": 2})
+    assert backend.incr.call_count == 2
+    assert len(buf) == 0
+
+
+def test_flush_on_max_age(backend):
+    buf = CoalescingBuffer(max_keys=100, max_age=0)
+    buf.incr(Group, {"times_seen": 1}, {"id": 1})
+    assert backend.incr.call_count == 1
+
+
+def test_flush_drops_on_error(backend):
+    buf = CoalescingBuffer(max_keys=100, max_age=60)
+    buf.incr(Group, {"times_seen": 1}, {"id": 1})
+    buf.incr(Group, {"times_seen": 1}, {"id": 2})
+    backend.incr.side_effect = Exception("boom")
+
+    with pytest.raises(Exception, match="boom"):
+        buf.flush()
+    assert len(buf) == 0
+
+
+def test_enable_requires_option():
+    assert enable_local_buffer("test-consumer") is None
+    assert get_local_buffer() is None
+
+
+def test_buffer_incr_uses_local_buffer(backend, local_buffer):
+    assert local_buffer is not None
+    buffer_incr(Group, {"times_seen": 1}, {"id": 1})
+    buffer_incr(Group, {"times_seen": 1}, {"id": 1})
+    assert backend.incr.call_count == 0
+
+    commit = mock.Mock()
+    flush_before_commit(commit)({}, False)
+    assert backend.incr.call_count == 0
+    commit.assert_called_once_with({}, False)
+
+    flush_before_commit(commit)({mock.sentinel.partition: 1}, False)
+    backend.incr.assert_called_once_with(
+        Group, {"times_seen": 2}, {"id": 1}, extra=None, signal_only=None
+    )
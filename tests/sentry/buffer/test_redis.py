@@ -22,6 +22,7 @@ from sentry.models.project import Project
 from sentry.rules.processing.buffer_processing import process_buffer
 from sentry.rules.processing.processor import PROJECT_ID_BUFFER_LIST_KEY
 from sentry.testutils.helpers.datetime import freeze_time
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import json
 from sentry.utils.redis import get_cluster_routing_client
@@ -627,6 +628,55 @@ class TestRedisBuffer:
         # signal_only should not increment the times_seen column
         assert group.times_seen == orig_times_seen
 
+    @django_db_all
+    @freeze_time()
+    @override_options({"buffer.bulk-flush.enabled": True, "buffer.bulk-flush.batch-size": 100})
+    def test_bulk_flush(self, default_project, task_runner):
+        groups = [Group.objects.create(project=default_project) for _ in range(3)]
+        last_seen = timezone.now() + datetime.timedelta(minutes=5)
+        for i, group in enumerate(groups):
+            for _ in range(i + 1):
+                self.buf.incr(Group, {"times_seen": 2}, {"id": group.id}, {"last_seen": last_seen})
+        # Composite filters can't be bulk updated and go through `Buffer.process`.
+        self.buf.incr(
+            Group, {"times_seen": 1}, {"id": groups[0].id, "project_id": default_project.id}
+        )
+        # Groups deleted before the flush are skipped.
+        self.buf.incr(Group, {"times_seen": 1}, {"id": groups[-1].id + 1000})
+
+        with (
+            task_runner(),
+            mock.patch("sentry.buffer.backend", self.buf),
+            mock.patch.object(
+                self.buf, "_process_single_incr", wraps=self.buf._process_single_incr
+            ) as process_single_incr,
+        ):
+            self.buf.process_pending()
+
+        assert process_single_incr.call_count == 0
+        for i, group in enumerate(groups):
+            group.refresh_from_db()
+            assert group.times_seen == 1 + 2 * (i + 1) + (1 if i == 0 else 0)
+            assert group.last_seen == last_seen
+            assert Group.objects.get_from_cache(id=group.id).times_seen == group.times_seen
+
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        assert client.zrange("b:p", 0, -1) == []
+
+    @django_db_all
+    @override_options({"buffer.bulk-flush.enabled": True})
+    def test_bulk_flush_skips_locked_keys(self, default_group):
+        key = self.buf._make_key(Group, {"id": default_group.id})
+        self.buf.incr(Group, {"times_seen": 1}, {"id": default_group.id})
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        client.set(self.buf._make_lock_key(key), "1", ex=10)
+
+        with mock.patch("sentry.buffer.base.Buffer.process_many") as process_many:
+            self.buf.process(batch_keys=[key, "b:k:sentry.group:missing"])
+
+        process_many.assert_called_once_with([])
+        assert client.hgetall(key)
+
 
 @pytest.mark.parametrize(
     "value",
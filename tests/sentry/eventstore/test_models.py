@@ -1,3 +1,4 @@
+import copy
 import pickle
 from unittest import mock
 
@@ -58,6 +59,24 @@ class EventTest(TestCase, PerformanceIssueTestCase):
         event2 = pickle.loads(data)
         assert event2.data == event.data
 
+    def test_deepcopy_keeps_frame_index(self):
+        event = self.store_event(
+            data={"stacktrace": {"frames": [{"function": "foo"}, {"function": "bar"}]}},
+            project_id=self.project.id,
+        )
+        (stacktrace,) = event.frame_index.get_stacktrace_infos()
+
+        with mock.patch("sentry.stacktraces.processing.FrameIndex.__init__") as build_index:
+            event_copy = copy.deepcopy(event)
+            (copied_stacktrace,) = event_copy.frame_index.get_stacktrace_infos()
+        assert build_index.call_count == 0
+
+        # The copied index points into the copied data
+        assert stacktrace.stacktrace is event.data["stacktrace"]
+        assert copied_stacktrace.stacktrace is event_copy.data["stacktrace"]
+        assert copied_stacktrace.stacktrace == stacktrace.stacktrace
+        assert copied_stacktrace.stacktrace is not stacktrace.stacktrace
+
     def test_event_as_dict(self):
         event = self.store_event(data={"message": "Hello World!"}, project_id=self.project.id)
 
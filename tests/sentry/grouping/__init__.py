@@ -160,6 +160,90 @@ fingerprint_input = list(
 )
 
 
+def make_fingerprinting_rules(num_rules: int) -> FingerprintingRules:
+    """
+    Custom fingerprinting rules of the kinds commonly used by projects with many rules: literal
+    and glob patterns on exception types, frames, messages and tags.
+    """
+    lines = []
+    for i in range(num_rules):
+        kind = i % 5
+        if kind == 0:
+            lines.append(f"type:Error{i} -> error-{i}")
+        elif kind == 1:
+            lines.append(f"function:handler_{i} module:app.views{i % 10} -> handler-{i}")
+        elif kind == 2:
+            lines.append(f'message:"*timed out after {i}s*" -> timeout-{i}')
+        elif kind == 3:
+            lines.append(f"tags.server_name:web-{i} level:error -> server-{i}")
+        else:
+            lines.append(f"type:*Warning{i} !app:yes -> warning-{i}")
+    return FingerprintingRules.from_config_string("\n".join(lines))
+
+
+def make_fingerprinting_events(num_events: int) -> list[dict[str, Any]]:
+    """
+    Events for `make_fingerprinting_rules`, of which only some match one of the rules.
+    """
+    return [
+        {
+            "platform": "python",
+            "level": "error" if i % 3 else "warning",
+            "exception": {
+                "values": [
+                    {
+                        "type": f"Error{i % 1000}" if i % 2 else f"DeprecationWarning{i % 1000}",
+                        "value": f"Request timed out after {i % 700}s",
+                        "stacktrace": {
+                            "frames": [
+                                {
+                                    "function": f"handler_{(i + j) % 800}",
+                                    "module": f"app.views{(i + j) % 10}",
+                                    "in_app": bool(j % 2),
+                                }
+                                for j in range(10)
+                            ]
+                        },
+                    }
+                ]
+            },
+            "tags": [["server_name", f"web-{i % 900}"]],
+        }
+        for i in range(num_events)
+    ]
+
+
+def make_huge_stacktrace_event(num_threads: int, frames_per_thread: int) -> dict[str, Any]:
+    """
+    A native event with many long thread stacktraces, as sent by crash reporters, whose frames
+    share a small number of (templated) function names and files.
+    """
+    return {
+        "platform": "native",
+        "threads": {
+            "values": [
+                {
+                    "id": i,
+                    "crashed": i == 0,
+                    "stacktrace": {
+                        "frames": [
+                            {
+                                "function": f"Namespace::Worker<int>::handle_{j % 50}(int, char const*)",
+                                "raw_function": f"_ZN9Namespace6Worker8handle_{j % 50}Ei",
+                                "filename": f"worker_{j % 20}.cpp",
+                                "instruction_addr": hex(0x1000 + j),
+                                "in_app": bool(j % 3),
+                            }
+                            for j in range(frames_per_thread)
+                        ]
+                    },
+                }
+                for i in range(num_threads)
+            ]
+        },
+    }
+
+
 def with_fingerprint_input(name):
     return pytest.mark.parametrize(
         name, fingerprint_input, ids=lambda x: x.filename[:-5].replace("-", "_")
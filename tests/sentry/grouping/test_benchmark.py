@@ -1,21 +1,28 @@
+import copy
+
 import pytest
 
+from sentry.grouping.api import (
+    clear_compiled_config_caches,
+    get_grouping_variants_for_event,
+    load_grouping_config,
+)
+from sentry.grouping.fingerprinting import EventDatastore
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
-from tests.sentry.grouping import GROUPING_INPUTS_DIR, GroupingInput, get_grouping_inputs
+from sentry.projectoptions.defaults import DEFAULT_GROUPING_CONFIG
+from sentry.stacktraces.processing import normalize_stacktraces_for_grouping
+from tests.sentry.grouping import (
+    GROUPING_INPUTS_DIR,
+    GroupingInput,
+    get_grouping_inputs,
+    make_fingerprinting_events,
+    make_fingerprinting_rules,
+    make_huge_stacktrace_event,
+)
 
 GROUPING_INPUTS = get_grouping_inputs(GROUPING_INPUTS_DIR)
 
 
-def benchmark_available() -> bool:
-    try:
-        __import__("pytest_benchmark")
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
 @pytest.mark.parametrize(
     "config_name",
     sorted(CONFIGURATIONS.keys()),
@@ -37,3 +44,54 @@ def run_configuration(grouping_input: GroupingInput, config_name: str) -> None:
     event.project = None  # type: ignore[assignment]
 
     event.get_hashes()
+
+
+@pytest.mark.parametrize("compiled_configs", ["cold", "warm"])
+def test_benchmark_grouping_config_cache(compiled_configs, benchmark):
+    events = []
+    for grouping_input in GROUPING_INPUTS:
+        event = grouping_input.create_event(DEFAULT_GROUPING_CONFIG, use_full_ingest_pipeline=False)
+        event.project = None  # type: ignore[assignment]
+        events.append(event)
+
+    def setup():
+        if compiled_configs == "cold":
+            clear_compiled_config_caches()
+        return (), {}
+
+    def run():
+        for event in events:
+            get_grouping_variants_for_event(
+                event, load_grouping_config(event.data["grouping_config"])
+            )
+
+    benchmark.pedantic(run, setup=setup, rounds=10, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("lookup", ["linear", "indexed"])
+def test_benchmark_fingerprinting_rules(lookup, benchmark):
+    rules = make_fingerprinting_rules(500)
+    events = make_fingerprinting_events(10_000)
+
+    def linear():
+        for event in events:
+            event_datastore = EventDatastore(event)
+            for rule in rules.iter_rules():
+                if rule.test_for_match_with_event(event_datastore) is not None:
+                    break
+
+    def indexed():
+        for event in events:
+            rules.get_fingerprint_values_for_event(event)
+
+    benchmark.pedantic(linear if lookup == "linear" else indexed, rounds=3)
+
+
+def test_benchmark_normalize_huge_stacktraces(benchmark):
+    event = make_huge_stacktrace_event(num_threads=50, frames_per_thread=200)
+    grouping_config = load_grouping_config({"id": DEFAULT_GROUPING_CONFIG})
+
+    def setup():
+        return (copy.deepcopy(event), grouping_config), {}
+
+    benchmark.pedantic(normalize_stacktraces_for_grouping, setup=setup, rounds=10)
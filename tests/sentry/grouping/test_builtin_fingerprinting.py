@@ -742,3 +742,13 @@ class BuiltInFingerprintingTest(TestCase):
             ],
             "text": 'family:"javascript" tags.transaction:"*" message:"Text content does not match server-rendered HTML." -> "hydrationerror{{tags.transaction}}"',
         }
+
+    def test_compiled_rules_are_cached_per_process(self):
+        fingerprinting_config = get_fingerprinting_config_for_project(project=self.project)
+        assert get_fingerprinting_config_for_project(project=self.project) is fingerprinting_config
+
+        self.project.update_option("sentry:fingerprinting_rules", "message:foo -> bar")
+        custom_config = get_fingerprinting_config_for_project(project=self.project)
+        assert custom_config is not fingerprinting_config
+        assert [rule.fingerprint for rule in custom_config.rules] == [["bar"]]
+        assert get_fingerprinting_config_for_project(project=self.project) is custom_config
@@ -639,6 +639,25 @@ class EnhancementsTest(TestCase):
             # We didn't parse again because the result was cached
             assert parse_enhancements_spy.call_count == 1
 
+    @patch("sentry.grouping.enhancer.parse_enhancements", wraps=parse_enhancements)
+    def test_caches_enhancements_per_process(self, parse_enhancements_spy: MagicMock):
+        self.project.update_option("sentry:grouping_enhancements", "function:playFetch +app")
+        config = get_grouping_config_dict_for_project(self.project)
+        assert parse_enhancements_spy.call_count == 1
+
+        # Not even the Django cache is asked again for the same rules
+        with patch("sentry.utils.cache.cache.get") as cache_get:
+            assert get_grouping_config_dict_for_project(self.project) == config
+        assert cache_get.call_count == 0
+        assert load_grouping_config(config) is load_grouping_config(dict(config))
+
+        # Changing the rules changes the cache key
+        self.project.update_option("sentry:grouping_enhancements", "function:playFetch -app")
+        new_config = get_grouping_config_dict_for_project(self.project)
+        assert parse_enhancements_spy.call_count == 2
+        assert new_config["enhancements"] != config["enhancements"]
+        assert load_grouping_config(new_config) is not load_grouping_config(config)
+
     def test_loads_enhancements_from_base64_string(self):
         enhancements = Enhancements.from_rules_text("function:playFetch +app")
         assert len(enhancements.rules) == 1
@@ -4,11 +4,20 @@ import pytest
 
 from sentry.db.models.fields.node import NodeData
 from sentry.grouping.api import get_default_grouping_config_dict
-from sentry.grouping.fingerprinting import FingerprintingRules, InvalidFingerprintingConfig
+from sentry.grouping.fingerprinting import (
+    EventDatastore,
+    FingerprintingRules,
+    InvalidFingerprintingConfig,
+)
 from sentry.grouping.utils import resolve_fingerprint_values
 from sentry.grouping.variants import BaseVariant
 from sentry.testutils.pytest.fixtures import InstaSnapshotter, django_db_all
-from tests.sentry.grouping import FingerprintInput, with_fingerprint_input
+from tests.sentry.grouping import (
+    FingerprintInput,
+    make_fingerprinting_events,
+    make_fingerprinting_rules,
+    with_fingerprint_input,
+)
 
 GROUPING_CONFIG = get_default_grouping_config_dict()
 
@@ -304,3 +313,26 @@ def test_event_hash_variant(insta_snapshot: InstaSnapshotter, input: Fingerprint
             },
         }
     )
+
+
+def test_rule_index_finds_first_matching_rule() -> None:
+    rules = make_fingerprinting_rules(100)
+    events = make_fingerprinting_events(1000)
+
+    matched = 0
+    for event in events:
+        expected = next(
+            (
+                rule
+                for rule in rules.iter_rules()
+                if rule.test_for_match_with_event(EventDatastore(event)) is not None
+            ),
+            None,
+        )
+        match = rules.get_fingerprint_values_for_event(event)
+
+        assert (match and match.matched_rule) is expected
+        matched += expected is not None
+
+    # Make sure the events exercise literal, glob and negated matchers
+    assert 0 < matched < len(events)
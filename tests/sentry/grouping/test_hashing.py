@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import threading
 from time import time
 from unittest.mock import MagicMock, patch
 
+from django.db import connection
+
 from sentry.eventstore.models import Event
 from sentry.grouping.api import GroupingConfig
+from sentry.grouping.ingest import grouphash_cache
 from sentry.grouping.ingest.hashing import (
+    _calculate_background_grouping,
     _calculate_event_grouping,
     _calculate_secondary_hashes,
+    _submit_grouping_task,
     get_or_create_grouphashes,
 )
 from sentry.grouping.variants import BaseVariant
@@ -15,10 +21,12 @@ from sentry.models.group import Group
 from sentry.models.grouphash import GroupHash
 from sentry.models.project import Project
 from sentry.projectoptions.defaults import DEFAULT_GROUPING_CONFIG, LEGACY_GROUPING_CONFIG
-from sentry.testutils.cases import TestCase
+from sentry.tasks.merge import merge_groups
+from sentry.testutils.cases import TestCase, TransactionTestCase
 from sentry.testutils.helpers.eventprocessing import save_new_event
 from sentry.testutils.helpers.options import override_options
 from sentry.testutils.skips import requires_snuba
+from sentry.utils.concurrent import SynchronousExecutor, ThreadedExecutor
 
 pytestmark = [requires_snuba]
 
@@ -201,3 +209,170 @@ class SecondaryGroupingTest(TestCase):
                 legacy_config_hash,
                 default_config_hash,
             }
+
+
+class AsyncGroupingTest(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        # Grouping tasks have to run in the test's thread to see its database transaction, so
+        # this only tests handing the tasks to the executor
+        executor_patcher = patch(
+            "sentry.grouping.ingest.hashing._get_grouping_executor",
+            return_value=SynchronousExecutor(),
+        )
+        executor_patcher.start()
+        self.addCleanup(executor_patcher.stop)
+
+    def test_runs_secondary_grouping_inline(self) -> None:
+        project = self.project
+        project.update_option("sentry:grouping_config", LEGACY_GROUPING_CONFIG)
+        event = save_new_event({"message": "Dogs are great! 1121"}, project)
+
+        project.update_option("sentry:grouping_config", DEFAULT_GROUPING_CONFIG)
+        project.update_option("sentry:secondary_grouping_config", LEGACY_GROUPING_CONFIG)
+        project.update_option("sentry:secondary_grouping_expiry", time() + 3600)
+        with patch("sentry.grouping.ingest.hashing._submit_grouping_task") as submit:
+            event2 = save_new_event({"message": "Dogs are great! 1121"}, project)
+
+        submit.assert_not_called()
+        assert not set(event.get_hashes()) & set(event2.get_hashes())
+        assert event.group_id == event2.group_id
+
+    @override_options({"store.background-grouping-config-id": LEGACY_GROUPING_CONFIG})
+    @override_options({"store.background-grouping-sample-rate": 1.0})
+    @patch("sentry_sdk.capture_exception")
+    def test_handles_errors_with_background_grouping(
+        self, mock_capture_exception: MagicMock
+    ) -> None:
+        background_grouping_error = Exception("nope")
+
+        with patch(
+            "sentry.grouping.ingest.hashing._calculate_background_grouping",
+            side_effect=background_grouping_error,
+        ):
+            event = save_new_event({"message": "Dogs are great! 1231"}, self.project)
+
+        mock_capture_exception.assert_called_with(background_grouping_error)
+        assert event.group
+
+    @patch("sentry.grouping.ingest.hashing.metrics.incr")
+    def test_drops_tasks_on_overload(self, mock_metrics_incr: MagicMock) -> None:
+        started = threading.Event()
+        release = threading.Event()
+
+        def block() -> None:
+            started.set()
+            release.wait(5)
+
+        executor = ThreadedExecutor(worker_count=1, maxsize=1)
+        try:
+            # One task runs, one is queued, and the next one doesn't fit anymore
+            assert _submit_grouping_task(executor, block) is not None
+            started.wait(5)
+            assert _submit_grouping_task(executor, block) is not None
+            assert _submit_grouping_task(executor, block) is None
+        finally:
+            release.set()
+
+        mock_metrics_incr.assert_any_call("grouping.async_grouping.dropped")
+
+
+@override_options({"grouping.async_grouping.enabled": True})
+class ThreadedGroupingTest(TransactionTestCase):
+    """
+    Grouping tasks running in the executor's threads, with database connections of their own.
+    """
+
+    @override_options({"store.background-grouping-config-id": LEGACY_GROUPING_CONFIG})
+    @override_options({"store.background-grouping-sample-rate": 1.0})
+    def test_runs_background_grouping(self) -> None:
+        closed = threading.Event()
+        closing_threads = []
+
+        def close_connection() -> None:
+            closing_threads.append(threading.current_thread())
+            connection.close()
+            closed.set()
+
+        with (
+            patch("sentry.grouping.ingest.hashing.connection") as mock_connection,
+            patch(
+                "sentry.grouping.ingest.hashing._calculate_background_grouping",
+                wraps=_calculate_background_grouping,
+            ) as background_grouping_spy,
+        ):
+            mock_connection.close.side_effect = close_connection
+            event = save_new_event({"message": "Dogs are great! 1121"}, self.project)
+            assert closed.wait(5)
+
+        assert event.group
+        background_grouping_spy.assert_called_once()
+        # The thread which ran background grouping closed its connection
+        assert len(closing_threads) == 1
+        assert closing_threads[0] is not threading.current_thread()
+
+
+@override_options({"grouping.grouphash_cache.enabled": True})
+class GroupHashCacheTest(TestCase):
+    @patch(
+        "sentry.grouping.ingest.grouphash_cache._fetch_grouphashes",
+        wraps=grouphash_cache._fetch_grouphashes,
+    )
+    def test_existing_grouphashes_are_cached(self, fetch_spy: MagicMock) -> None:
+        event1 = save_new_event({"message": "Dogs are great!"}, self.project)
+        # The grouphash didn't have a group yet when it was looked up for the first event, so it
+        # only gets cached when it's looked up for the second one
+        event2 = save_new_event({"message": "Dogs are great!"}, self.project)
+        assert fetch_spy.call_count == 2
+
+        event3 = save_new_event({"message": "Dogs are great!"}, self.project)
+        assert fetch_spy.call_count == 2
+        assert event1.group_id == event2.group_id == event3.group_id
+
+    @patch(
+        "sentry.grouping.ingest.grouphash_cache._fetch_grouphashes",
+        wraps=grouphash_cache._fetch_grouphashes,
+    )
+    def test_missing_grouphashes_are_cached(self, fetch_spy: MagicMock) -> None:
+        hash_value = "a" * 32
+
+        for _ in range(2):
+            assert grouphash_cache.get_grouphashes(
+                self.project.id, [hash_value], cache_missing=True
+            ) == {hash_value: None}
+        assert fetch_spy.call_count == 1
+
+        # Creating the grouphash replaces the negative entry
+        get_or_create_grouphashes(
+            Event(self.project.id, "11212012123120120415201309082013", data={}),
+            self.project,
+            {},
+            [hash_value],
+            DEFAULT_GROUPING_CONFIG,
+        )
+        grouphash = grouphash_cache.get_grouphashes(self.project.id, [hash_value])[hash_value]
+        assert grouphash is not None and grouphash.hash == hash_value
+
+    def test_merge_invalidates_grouphashes(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        assert event.group
+        hash_value = event.get_primary_hash()
+        grouphash_cache.get_grouphashes(self.project.id, [hash_value])
+
+        new_group = self.create_group(self.project)
+        with self.tasks():
+            merge_groups([event.group.id], new_group.id)
+
+        grouphash = grouphash_cache.get_grouphashes(self.project.id, [hash_value])[hash_value]
+        assert grouphash is not None and grouphash.group_id == new_group.id
+
+    def test_delete_invalidates_grouphashes(self) -> None:
+        event = save_new_event({"message": "Dogs are great!"}, self.project)
+        hash_value = event.get_primary_hash()
+        grouphash_cache.get_grouphashes(self.project.id, [hash_value])
+
+        grouphashes = GroupHash.objects.filter(project=self.project, hash=hash_value)
+        with grouphash_cache.invalidating(grouphashes):
+            grouphashes.delete()
+
+        assert grouphash_cache.get_grouphashes(self.project.id, [hash_value]) == {hash_value: None}
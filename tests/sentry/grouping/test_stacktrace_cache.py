@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from unittest import mock
+
+import pytest
+
+from sentry.grouping.api import get_grouping_variants_for_event, load_grouping_config
+from sentry.grouping.component import StacktraceGroupingComponent
+from sentry.grouping.strategies import stacktrace_cache
+from sentry.projectoptions.defaults import DEFAULT_GROUPING_CONFIG
+from sentry.testutils.helpers.options import override_options
+from tests.sentry.grouping import GROUPING_INPUTS_DIR, GroupingInput, get_grouping_inputs
+
+CACHE_OPTIONS = {
+    "grouping.stacktrace_cache.enabled": True,
+    "grouping.stacktrace_cache.max_entries": 10_000,
+    "grouping.stacktrace_cache.validation_sample_rate": 0.0,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    stacktrace_cache.clear()
+    yield
+    stacktrace_cache.clear()
+
+
+def _get_variants(grouping_input: GroupingInput) -> dict[str, dict]:
+    event = grouping_input.create_event(DEFAULT_GROUPING_CONFIG, use_full_ingest_pipeline=False)
+    config = load_grouping_config(event.data["grouping_config"])
+    return {
+        name: variant.as_dict()
+        for name, variant in get_grouping_variants_for_event(event, config).items()
+    }
+
+
+@pytest.mark.parametrize(
+    "grouping_input",
+    get_grouping_inputs(GROUPING_INPUTS_DIR),
+    ids=lambda grouping_input: grouping_input.filename.replace("-", "_").replace(".json", ""),
+)
+def test_cached_variants_match(grouping_input: GroupingInput) -> None:
+    expected = _get_variants(grouping_input)
+
+    with override_options(CACHE_OPTIONS):
+        # The first pass fills the cache and the second one is served from it
+        assert _get_variants(grouping_input) == expected
+        assert _get_variants(grouping_input) == expected
+
+
+def _compute() -> StacktraceGroupingComponent:
+    return StacktraceGroupingComponent(hint="computed")
+
+
+def test_get_or_compute_returns_copies() -> None:
+    compute = mock.Mock(side_effect=_compute)
+
+    with override_options(CACHE_OPTIONS):
+        stacktrace_cache.get_or_compute(b"key", compute).update(hint="mutated")
+        assert stacktrace_cache.get_or_compute(b"key", compute).hint == "computed"
+
+    assert compute.call_count == 1
+
+
+def test_validation_replaces_wrong_entries() -> None:
+    with override_options(CACHE_OPTIONS):
+        stacktrace_cache.get_or_compute(b"key", lambda: StacktraceGroupingComponent(hint="wrong"))
+
+    with override_options(
+        {**CACHE_OPTIONS, "grouping.stacktrace_cache.validation_sample_rate": 1.0}
+    ):
+        assert stacktrace_cache.get_or_compute(b"key", _compute).hint == "computed"
+
+    with override_options(CACHE_OPTIONS):
+        assert stacktrace_cache.get_or_compute(b"key", mock.Mock()).hint == "computed"
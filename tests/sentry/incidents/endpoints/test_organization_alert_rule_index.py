@@ -41,6 +41,7 @@ from sentry.integrations.slack.utils.channel import SlackChannelIdData
 from sentry.models.auditlogentry import AuditLogEntry
 from sentry.models.organizationmember import OrganizationMember
 from sentry.models.projectteam import ProjectTeam
+from sentry.models.team import Team
 from sentry.seer.anomaly_detection.store_data import seer_anomaly_detection_connection_pool
 from sentry.seer.anomaly_detection.types import StoreDataResponse
 from sentry.sentry_metrics import indexer
@@ -55,9 +56,11 @@ from sentry.testutils.cases import APITestCase, SnubaTestCase
 from sentry.testutils.factories import EventType
 from sentry.testutils.helpers.datetime import before_now, freeze_time
 from sentry.testutils.helpers.features import with_feature
+from sentry.testutils.helpers.queries import capture_model_queries
 from sentry.testutils.outbox import outbox_runner
 from sentry.testutils.silo import assume_test_silo_mode
 from sentry.testutils.skips import requires_snuba
+from sentry.users.models.user import User
 from sentry.utils.snuba import _snuba_pool
 from sentry.workflow_engine.models import (
     Action,
@@ -226,6 +229,36 @@ class AlertRuleListEndpointTest(AlertRuleIndexBase, TestWorkflowEngineSerializer
         assert resp[ALERT_RULES_COUNT_HEADER] == "1"
         assert resp[MAX_QUERY_SUBSCRIPTIONS_HEADER] == "1000"
 
+    def test_user_and_team_lookups_are_batched(self):
+        team = self.create_team(organization=self.organization, members=[self.user])
+        ProjectTeam.objects.create(project=self.project, team=team)
+        self.login_as(self.user)
+
+        def create_alert_rule() -> None:
+            alert_rule = self.create_alert_rule(user=self.create_user())
+            trigger = self.create_alert_rule_trigger(alert_rule=alert_rule)
+            self.create_alert_rule_trigger_action(
+                alert_rule_trigger=trigger,
+                target_type=AlertRuleTriggerAction.TargetType.TEAM,
+                target_identifier=str(self.create_team(organization=self.organization).id),
+            )
+
+        def count_queries() -> tuple[int, int]:
+            with (
+                self.feature("organizations:incidents"),
+                capture_model_queries(User, Team) as queries,
+            ):
+                self.get_success_response(self.organization.slug)
+            return queries[User], queries[Team]
+
+        create_alert_rule()
+        count_queries()
+        expected = count_queries()
+
+        for _ in range(3):
+            create_alert_rule()
+        assert count_queries() == expected
+
 
 @freeze_time()
 class AlertRuleCreateEndpointTest(AlertRuleIndexBase, SnubaTestCase):
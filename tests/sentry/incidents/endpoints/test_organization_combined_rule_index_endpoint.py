@@ -3,17 +3,20 @@ from datetime import UTC, datetime
 import requests
 
 from sentry.constants import ObjectStatus
-from sentry.incidents.models.alert_rule import AlertRuleThresholdType
+from sentry.incidents.models.alert_rule import AlertRuleThresholdType, AlertRuleTriggerAction
 from sentry.incidents.models.incident import IncidentTrigger, TriggerStatus
-from sentry.models.rule import Rule, RuleSource
+from sentry.models.rule import Rule, RuleActivity, RuleActivityType, RuleSource
 from sentry.models.rulefirehistory import RuleFireHistory
+from sentry.models.team import Team
 from sentry.monitors.models import MonitorStatus
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.cases import APITestCase
 from sentry.testutils.helpers.datetime import before_now, freeze_time
+from sentry.testutils.helpers.queries import capture_model_queries
 from sentry.types.actor import Actor
 from sentry.uptime.models import UptimeStatus
 from sentry.uptime.types import UptimeMonitorMode
+from sentry.users.models.user import User
 from tests.sentry.incidents.endpoints.serializers.test_alert_rule import BaseAlertRuleSerializerTest
 
 
@@ -128,6 +131,40 @@ class OrganizationCombinedRuleIndexEndpointTest(BaseAlertRuleSerializerTest, API
         self.assert_alert_rule_serialized(self.alert_rule_2, result[2], skip_dates=True)
         self.assert_alert_rule_serialized(self.alert_rule, result[3], skip_dates=True)
 
+    def test_user_and_team_lookups_are_batched(self):
+        def create_rules() -> None:
+            alert_rule = self.create_alert_rule(
+                organization=self.organization, projects=[self.project], user=self.create_user()
+            )
+            trigger = self.create_alert_rule_trigger(alert_rule=alert_rule)
+            self.create_alert_rule_trigger_action(
+                alert_rule_trigger=trigger,
+                target_type=AlertRuleTriggerAction.TargetType.TEAM,
+                target_identifier=str(self.create_team(organization=self.organization).id),
+            )
+
+            rule = self.create_project_rule(project=self.project)
+            RuleActivity.objects.create(
+                rule=rule, user_id=self.create_user().id, type=RuleActivityType.CREATED.value
+            )
+            self.snooze_rule(owner_id=self.create_user().id, rule=rule)
+
+        def count_queries() -> tuple[int, int]:
+            with (
+                self.feature(["organizations:incidents", "organizations:performance-view"]),
+                capture_model_queries(User, Team) as queries,
+            ):
+                self.get_success_response(self.organization.slug)
+            return queries[User], queries[Team]
+
+        create_rules()
+        count_queries()
+        expected = count_queries()
+
+        for _ in range(3):
+            create_rules()
+        assert count_queries() == expected
+
     def test_snoozed_rules(self):
         """
         Test that we properly serialize snoozed rules with and without an owner
@@ -52,6 +52,7 @@ from sentry.models.grouptombstone import GroupTombstone
 from sentry.models.release import Release
 from sentry.models.releaseprojectenvironment import ReleaseStages
 from sentry.models.savedsearch import SavedSearch, Visibility
+from sentry.models.team import Team
 from sentry.search.events.constants import (
     RELEASE_STAGE_ALIAS,
     SEMVER_ALIAS,
@@ -66,9 +67,11 @@ from sentry.testutils.helpers import parse_link_header
 from sentry.testutils.helpers.datetime import before_now
 from sentry.testutils.helpers.features import Feature, apply_feature_flag_on_cls, with_feature
 from sentry.testutils.helpers.options import override_options
+from sentry.testutils.helpers.queries import capture_model_queries
 from sentry.testutils.silo import assume_test_silo_mode
 from sentry.types.activity import ActivityType
 from sentry.types.group import GroupSubStatus, PriorityLevel
+from sentry.users.models.user import User
 from sentry.users.models.user_option import UserOption
 from sentry.utils import json
 from tests.sentry.feedback.usecases.test_create_feedback import mock_feedback_event
@@ -406,6 +409,35 @@ class GroupListTest(APITestCase, SnubaTestCase, SearchIssueTestMixin):
         response = self.get_response(sort_by="date", query="timesSeen:>1k")
         assert response.status_code == 200
 
+    def test_user_and_team_lookups_are_batched(self, _: MagicMock) -> None:
+        self.login_as(user=self.user)
+
+        def create_groups() -> None:
+            user = self.create_user()
+            self.create_member(organization=self.organization, user=user)
+            for assignee in (user, self.create_team(organization=self.organization)):
+                event = self.store_event(
+                    data={
+                        "timestamp": before_now(seconds=10).isoformat(),
+                        "fingerprint": [uuid4().hex],
+                    },
+                    project_id=self.project.id,
+                )
+                GroupAssignee.objects.assign(event.group, assignee)
+
+        def count_queries() -> tuple[int, int]:
+            with capture_model_queries(User, Team) as queries:
+                self.get_success_response(sort_by="date", limit=25)
+            return queries[User], queries[Team]
+
+        create_groups()
+        count_queries()
+        expected = count_queries()
+
+        for _ in range(3):
+            create_groups()
+        assert count_queries() == expected
+
     def test_invalid_sort_key(self, _: MagicMock) -> None:
         now = timezone.now()
         self.create_group(last_seen=now - timedelta(seconds=1))
@@ -8,7 +8,9 @@ from google.cloud.bigtable import table
 from google.cloud.bigtable.row_data import DEFAULT_RETRY_READ_ROWS
 from google.rpc.status_pb2 import Status
 
+from sentry.nodestore.base import FRAMED_MAGIC
 from sentry.nodestore.bigtable.backend import BigtableNodeStorage
+from sentry.testutils.helpers import override_options
 from sentry.utils.kvstore.bigtable import BigtableKVStorage
 
 
@@ -175,3 +177,25 @@ def test_compression() -> None:
     assert ns.store.compression == "zlib"
     ns = BigtableNodeStorage(compression=False)
     assert ns.store.compression is None
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_framed_nodes_are_not_compressed_again() -> None:
+    ns = MockedBigtableNodeStorage(project="test", compression="zstd")
+    with override_options({"nodestore.framed-encoding.enabled": False}):
+        ns.set_multi({"legacy": {"foo": "a"}})
+    with override_options({"nodestore.framed-encoding.enabled": True}):
+        ns.set_multi({"framed": {"foo": "a"}})
+        ns.set("framed_2", {"foo": "b"})
+
+    rows = ns.store._get_table()._rows
+    assert ns.store.flags_column in rows[b"legacy"]
+    for key in (b"framed", b"framed_2"):
+        assert ns.store.flags_column not in rows[key]
+        assert rows[key][ns.store.data_column][0].value.startswith(FRAMED_MAGIC)
+
+    assert ns.get_multi(["legacy", "framed", "framed_2"]) == {
+        "legacy": {"foo": "a"},
+        "framed": {"foo": "a"},
+        "framed_2": {"foo": "b"},
+    }
@@ -4,9 +4,12 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 """
 
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
+import zstandard
 
+from sentry.nodestore.base import FRAMED_MAGIC
 from sentry.nodestore.django.backend import DjangoNodeStorage
 from sentry.testutils.helpers import override_options
 from tests.sentry.nodestore.bigtable.test_backend import (
@@ -112,3 +115,79 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_multi(ns):
+    ns.set("node_1", {"foo": "old"})
+
+    ns.set_multi({"node_1": {"foo": "a"}, "node_2": {"foo": "b"}})
+    assert ns.get_multi(["node_1", "node_2"]) == {"node_1": {"foo": "a"}, "node_2": {"foo": "b"}}
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_subkeys_multi(ns):
+    ns.set_subkeys_multi(
+        {
+            "node_1": {None: {"foo": "a"}, "other": {"foo": "b"}},
+            "node_2": {None: {"foo": "c"}},
+        }
+    )
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get("node_2") == {"foo": "c"}
+    assert ns.get("node_2", subkey="other") is None
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.framed-encoding.enabled": True,
+    }
+)
+def test_set_subkeys_framed(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}, "": {"foo": "c"}})
+    assert ns.get_bytes("node_1").startswith(FRAMED_MAGIC)
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+    assert ns.get("node_1", subkey="") == {"foo": "c"}
+    assert ns.get("node_1", subkey="missing") is None
+    assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b"}}
+
+    # Values which only the fallback parser reads
+    ns.set_subkeys("node_2", {None: {"foo": 2**64}, "other": {"foo": float("inf")}})
+    assert ns.get("node_2") == {"foo": 2**64}
+    assert ns.get("node_2", subkey="other") == {"foo": float("inf")}
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.framed-encoding.enabled": True,
+    }
+)
+def test_framed_segments_are_compressed_separately(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a" * 10000}, "other": {"foo": "b" * 10000}})
+    assert len(ns.get_bytes("node_1")) < 1000
+
+    with mock.patch(
+        "sentry.nodestore.base.zstandard.ZstdDecompressor", wraps=zstandard.ZstdDecompressor
+    ) as decompressor:
+        assert ns.get("node_1", subkey="other") == {"foo": "b" * 10000}
+    # Only the requested segment is decompressed
+    assert decompressor.call_count == 1
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_read_legacy_and_framed(ns):
+    with override_options({"nodestore.framed-encoding.enabled": False}):
+        ns.set_subkeys("legacy", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    with override_options({"nodestore.framed-encoding.enabled": True}):
+        ns.set_subkeys("framed", {None: {"foo": "a"}, "other": {"foo": "b"}})
+
+    assert not ns.get_bytes("legacy").startswith(FRAMED_MAGIC)
+    assert ns.get_multi(["legacy", "framed"]) == {"legacy": {"foo": "a"}, "framed": {"foo": "a"}}
+    assert ns.get_multi(["legacy", "framed"], subkey="other") == {
+        "legacy": {"foo": "b"},
+        "framed": {"foo": "b"},
+    }
@@ -0,0 +1,134 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.nodestore.lru import NodeLRUCache, clear
+from sentry.testutils.helpers import override_options
+
+
+def test_get_many_caches_per_subkey():
+    cache = NodeLRUCache(max_bytes=1024 * 1024, ttl=60)
+    load = mock.Mock(side_effect=lambda ids: {id: {"id": id} for id in ids})
+
+    assert cache.get_many(["a", "b"], None, load) == {"a": {"id": "a"}, "b": {"id": "b"}}
+    assert cache.get_many(["a", "b"], None, load) == {"a": {"id": "a"}, "b": {"id": "b"}}
+    assert load.call_args_list == [mock.call(["a", "b"])]
+
+    cache.get_many(["a"], "unprocessed", load)
+    assert load.call_count == 2
+    assert len(cache) == 3
+
+    cache.delete(["a"])
+    assert len(cache) == 1
+
+
+def test_get_many_returns_copies():
+    cache = NodeLRUCache(max_bytes=1024 * 1024, ttl=60)
+
+    def load(ids):
+        return {id: {"tags": []} for id in ids}
+
+    cache.get_many(["a"], None, load)["a"]["tags"].append("mutated")
+    assert cache.get_many(["a"], None, load) == {"a": {"tags": []}}
+
+
+def test_missing_nodes_are_not_cached():
+    cache = NodeLRUCache(max_bytes=1024 * 1024, ttl=60)
+    load = mock.Mock(side_effect=lambda ids: {id: None for id in ids})
+
+    assert cache.get_many(["a"], None, load) == {"a": None}
+    assert cache.get_many(["a"], None, load) == {"a": None}
+    assert load.call_count == 2
+
+
+def test_eviction_by_size():
+    cache = NodeLRUCache(max_bytes=300, ttl=60)
+
+    def load(ids):
+        return {id: "x" * 100 for id in ids}
+
+    cache.get_many(["a", "b"], None, load)
+    # Touch "a" so that "b" is the least recently used entry.
+    cache.get_many(["a"], None, load)
+    cache.get_many(["c"], None, load)
+
+    assert len(cache) == 2
+    assert cache.size <= 300
+    assert cache._entries.keys() == {("a", None), ("c", None)}
+
+
+def test_eviction_by_ttl():
+    cache = NodeLRUCache(max_bytes=1024 * 1024, ttl=60)
+    load = mock.Mock(side_effect=lambda ids: {id: {} for id in ids})
+
+    cache.get_many(["a"], None, load)
+    with mock.patch("time.monotonic", return_value=time.monotonic() + 61):
+        cache.get_many(["a"], None, load)
+    assert load.call_count == 2
+
+
+def test_single_flight():
+    cache = NodeLRUCache(max_bytes=1024 * 1024, ttl=60)
+    loading = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def load(ids):
+        calls.append(ids)
+        loading.set()
+        release.wait(5)
+        return {id: {"id": id} for id in ids}
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(cache.get_many(["a"], None, load)))
+    first.start()
+    loading.wait(5)
+
+    second = threading.Thread(target=lambda: results.append(cache.get_many(["a"], None, load)))
+    second.start()
+    release.set()
+    first.join()
+    second.join()
+
+    assert calls == [["a"]]
+    assert results == [{"a": {"id": "a"}}, {"a": {"id": "a"}}]
+
+
+def test_failed_flight_is_retried():
+    cache = NodeLRUCache(max_bytes=1024 * 1024, ttl=60)
+
+    def load(ids):
+        raise Exception("boom")
+
+    with pytest.raises(Exception, match="boom"):
+        cache.get_many(["a"], None, load)
+    assert not cache._flights
+    assert cache.get_many(["a"], None, lambda ids: {"a": {}}) == {"a": {}}
+
+
+@pytest.mark.django_db
+@override_options(
+    {"nodestore.lru.enabled": True, "nodestore.set-subkeys.enable-set-cache-item": False}
+)
+def test_nodestore_invalidation():
+    ns = DjangoNodeStorage()
+    try:
+        ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+        assert ns.get("node_1") == {"foo": "a"}
+        assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b"}}
+
+        with mock.patch.object(ns, "_get_bytes", side_effect=AssertionError):
+            assert ns.get("node_1") == {"foo": "a"}
+            assert ns.get("node_1", subkey="other") == {"foo": "b"}
+
+        ns.set("node_1", {"foo": "c"})
+        assert ns.get("node_1") == {"foo": "c"}
+        assert ns.get("node_1", subkey="other") is None
+
+        ns.delete("node_1")
+        assert ns.get("node_1") is None
+    finally:
+        clear()
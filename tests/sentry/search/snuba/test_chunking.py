@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from sentry.api.event_search import SearchFilter, SearchKey, SearchValue
+from sentry.search.snuba.chunking import ChunkPlanner, get_selectivity_cache_key
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.datetime import freeze_time
+
+
+class ChunkPlannerTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_key = get_selectivity_cache_key(
+            [self.project], [SearchFilter(SearchKey("status"), "=", SearchValue("unresolved"))]
+        )
+
+    def _make_planner(self) -> ChunkPlanner:
+        return ChunkPlanner(
+            self.cache_key, limit=100, max_chunk_size=2000, growth_rate=1.5, headroom=1.25
+        )
+
+    def test_first_chunk_without_stats(self):
+        assert self._make_planner().next_chunk_size(0) == 150
+
+    def test_sizes_chunks_from_selectivity(self):
+        planner = self._make_planner()
+        planner.record_chunk(scanned=150, matched=15)
+        # 85 results are missing, and 1 in 10 groups is a match
+        assert planner.next_chunk_size(15) == 1063
+
+        planner.record_chunk(scanned=1063, matched=150)
+        assert planner.next_chunk_size(100) == 100
+
+    def test_no_matches(self):
+        planner = self._make_planner()
+        planner.record_chunk(scanned=150, matched=0)
+        assert planner.next_chunk_size(0) == 2000
+
+    def test_remembers_selectivity(self):
+        planner = self._make_planner()
+        planner.record_chunk(scanned=1000, matched=50)
+        planner.save()
+
+        planner = self._make_planner()
+        assert planner.prior == 0.05
+        assert planner.next_chunk_size(0) == 2000
+
+        planner.record_chunk(scanned=1000, matched=150)
+        planner.save()
+        assert self._make_planner().prior == 0.1
+
+    def test_cache_key(self):
+        other_project = self.create_project()
+        assert get_selectivity_cache_key([self.project, other_project], []) == (
+            get_selectivity_cache_key([other_project, self.project], None)
+        )
+        assert get_selectivity_cache_key([self.project], []) != self.cache_key
+
+    def test_cache_key_normalizes_values(self):
+        def get_cache_key(*search_filters: SearchFilter) -> str:
+            return get_selectivity_cache_key([self.project], search_filters)
+
+        def first_seen_within(delta: timedelta) -> SearchFilter:
+            return SearchFilter(SearchKey("firstSeen"), ">", SearchValue(timezone.now() - delta))
+
+        now = timezone.now()
+        with freeze_time(now):
+            key = get_cache_key(first_seen_within(timedelta(hours=24)))
+            other_key = get_cache_key(first_seen_within(timedelta(hours=12)))
+        # The same relative date, a few minutes later
+        with freeze_time(now + timedelta(minutes=5)):
+            assert get_cache_key(first_seen_within(timedelta(hours=24))) == key
+            assert get_cache_key(first_seen_within(timedelta(hours=24))) != other_key
+
+        assert get_cache_key(
+            SearchFilter(SearchKey("level"), "IN", SearchValue(["error", "fatal"]))
+        ) == get_cache_key(SearchFilter(SearchKey("level"), "IN", SearchValue(["fatal", "error"])))
@@ -0,0 +1,150 @@
+import threading
+from typing import Any
+from unittest import mock
+from unittest.mock import MagicMock
+
+import pytest
+from urllib3.response import HTTPResponse
+
+from sentry.seer.similarity import similar_issues_cache
+from sentry.seer.similarity.similar_issues import get_similarity_data_from_seer
+from sentry.seer.similarity.types import SeerSimilarIssueData, SimilarIssuesEmbeddingsRequest
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.eventprocessing import save_new_event
+from sentry.testutils.helpers.options import override_options
+from sentry.utils import json
+
+CACHE_OPTIONS = {
+    "seer.similarity.ingest.request_cache.enabled": True,
+    "seer.similarity.ingest.request_cache.max_entries": 100,
+    "seer.similarity.ingest.request_cache.ttl_seconds": 60.0,
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    similar_issues_cache.clear()
+    yield
+    similar_issues_cache.clear()
+
+
+def _make_request(
+    event_id: str, stacktrace: str = "<stringified stacktrace>", project_id: int = 1
+) -> SimilarIssuesEmbeddingsRequest:
+    return {
+        "event_id": event_id,
+        "hash": event_id,
+        "project_id": project_id,
+        "stacktrace": stacktrace,
+        "exception_type": "FailedToFetchError",
+        "k": 1,
+        "referrer": "ingest",
+    }
+
+
+def _make_results() -> list[SeerSimilarIssueData]:
+    return [
+        SeerSimilarIssueData(
+            stacktrace_distance=0.01, should_group=True, parent_group_id=1, parent_hash="a" * 32
+        )
+    ]
+
+
+def test_cache_key_ignores_event() -> None:
+    assert similar_issues_cache.get_cache_key(
+        _make_request("1" * 32)
+    ) == similar_issues_cache.get_cache_key(_make_request("2" * 32))
+    assert similar_issues_cache.get_cache_key(
+        _make_request("1" * 32)
+    ) != similar_issues_cache.get_cache_key(_make_request("1" * 32, stacktrace="<other>"))
+
+
+@override_options(CACHE_OPTIONS)
+def test_results_are_cached() -> None:
+    fetch = mock.Mock(side_effect=lambda request, tags: _make_results())
+
+    results = similar_issues_cache.get_similarity_data(_make_request("1" * 32), {}, fetch)
+    # Callers get copies, so changing them doesn't change the cached results
+    results[0].parent_group_id = 2
+    assert similar_issues_cache.get_similarity_data(_make_request("2" * 32), {}, fetch) == (
+        _make_results()
+    )
+    assert fetch.call_count == 1
+
+    similar_issues_cache.get_similarity_data(_make_request("3" * 32, "<other>"), {}, fetch)
+    assert fetch.call_count == 2
+
+
+@override_options(CACHE_OPTIONS)
+def test_empty_results_are_not_cached() -> None:
+    fetch = mock.Mock(return_value=[])
+
+    for event_id in ("1" * 32, "2" * 32):
+        assert similar_issues_cache.get_similarity_data(_make_request(event_id), {}, fetch) == []
+    assert fetch.call_count == 2
+
+
+@override_options(CACHE_OPTIONS)
+def test_concurrent_requests_are_coalesced() -> None:
+    fetching = threading.Event()
+    release = threading.Event()
+    requests = []
+
+    def fetch(request, metric_tags):
+        requests.append(request)
+        fetching.set()
+        release.wait(5)
+        return _make_results()
+
+    results = []
+
+    def get(event_id: str) -> None:
+        results.append(similar_issues_cache.get_similarity_data(_make_request(event_id), {}, fetch))
+
+    first = threading.Thread(target=get, args=("1" * 32,))
+    first.start()
+    fetching.wait(5)
+
+    second = threading.Thread(target=get, args=("2" * 32,))
+    second.start()
+    release.set()
+    first.join()
+    second.join()
+
+    assert [request["event_id"] for request in requests] == ["1" * 32]
+    assert results == [_make_results(), _make_results()]
+
+
+@override_options(CACHE_OPTIONS)
+class SeerStubTest(TestCase):
+    def setUp(self) -> None:
+        self.similar_event = save_new_event({"message": "Dogs are great!"}, self.project)
+
+    def _respond(self, *args: Any, **kwargs: Any) -> HTTPResponse:
+        raw_data = {
+            "parent_hash": self.similar_event.get_primary_hash(),
+            "should_group": True,
+            "stacktrace_distance": 0.01,
+        }
+        return HTTPResponse(json.dumps({"responses": [raw_data]}).encode("utf-8"), status=200)
+
+    @mock.patch("sentry.seer.similarity.similar_issues.seer_grouping_connection_pool.urlopen")
+    def test_identical_requests_call_seer_once(self, mock_seer_request: MagicMock) -> None:
+        mock_seer_request.side_effect = self._respond
+        expected = [
+            SeerSimilarIssueData(
+                stacktrace_distance=0.01,
+                should_group=True,
+                parent_group_id=self.similar_event.group_id,
+                parent_hash=self.similar_event.get_primary_hash(),
+            )
+        ]
+
+        for event_id in ("1" * 32, "2" * 32, "3" * 32):
+            request = _make_request(event_id, project_id=self.project.id)
+            assert (
+                similar_issues_cache.get_similarity_data(request, {}, get_similarity_data_from_seer)
+                == expected
+            )
+
+        assert mock_seer_request.call_count == 1
@@ -123,3 +123,30 @@ def test_flusher_processes_limit(monkeypatch):
     assert total_shards == 4  # All 4 shards should be assigned
 
     step.join()
+
+
+def test_flusher_processes_per_core(monkeypatch):
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    monkeypatch.setattr("multiprocessing.cpu_count", lambda: 3)
+
+    topic = Topic("test")
+    messages: list[KafkaPayload] = []
+
+    fac = ProcessSpansStrategyFactory(
+        max_batch_size=10,
+        max_batch_time=10,
+        num_processes=1,
+        input_block_size=None,
+        output_block_size=None,
+        flusher_processes=0,  # One process per core
+        produce_to_pipe=messages.append,
+    )
+
+    partitions = {Partition(topic, i): 0 for i in range(8)}
+    step = fac.create_with_partitions(lambda offsets, force=False: None, partitions)
+
+    flusher = fac._flusher
+    assert flusher.num_processes == 3
+    assert sorted(len(shards) for shards in flusher.process_to_shards_map.values()) == [2, 3, 3]
+
+    step.join()
@@ -671,3 +671,109 @@ def test_max_segment_spans_limit(buffer: SpansBuffer):
     # NB: We currently accept that we leak redirect keys when we limit segments.
     # buffer.done_flush_segments(rv)
     # assert_clean(buffer.client)
+
+
+def test_server_side_assembly(buffer: SpansBuffer):
+    spans = [
+        Span(
+            payload=_payload(span_id),
+            trace_id="a" * 32,
+            span_id=span_id,
+            parent_span_id=None if span_id == "a" * 16 else "a" * 16,
+            project_id=1,
+            is_segment_span=span_id == "a" * 16,
+            end_timestamp_precise=1700000000.0 + i,
+        )
+        for i, span_id in enumerate(["b" * 16, "c" * 16, "d" * 16, "a" * 16])
+    ]
+
+    with override_options({"spans.buffer.compression.level": -1}):
+        for span in spans:
+            buffer.process_spans([span], now=0)
+
+    payload_size = len(_payload("a" * 16))
+    with override_options(
+        {
+            "spans.buffer.flusher.server-side-assembly": True,
+            "spans.buffer.segment-page-size": 1,
+            "spans.buffer.max-segment-bytes": 3 * payload_size,
+        }
+    ):
+        rv = buffer.flush_segments(now=11)
+
+    # The oldest span is trimmed away in Redis, and the rest is streamed back page by page.
+    segment = rv[_segment_id(1, "a" * 32, "a" * 16)]
+    retained_span_ids = {span.payload["span_id"] for span in segment.spans}
+    assert retained_span_ids == {"a" * 16, "c" * 16, "d" * 16}
+
+    # NB: Redirect keys of trimmed spans leak, see `test_max_segment_spans_limit`.
+    buffer.done_flush_segments(rv)
+    assert buffer.flush_segments(now=90) == {}
+
+
+def test_shards_at_limit(buffer: SpansBuffer):
+    spans = [
+        Span(
+            payload=_payload("a" * 16),
+            trace_id=f"{i:0>32x}",
+            span_id="a" * 16,
+            parent_span_id=None,
+            project_id=1,
+            is_segment_span=True,
+            end_timestamp_precise=1700000000.0,
+        )
+        for i in range(3)
+    ]
+    process_spans(spans, buffer, now=0)
+
+    with override_options({"spans.buffer.max-flush-segments": 2 * len(buffer.assigned_shards)}):
+        rv = buffer.flush_segments(now=11)
+
+    # Trace IDs 0..2 are spread over shards 0..2, so no shard has a full page
+    assert len(rv) == 3
+    assert buffer.shards_at_limit == set()
+    assert not buffer.any_shard_at_limit
+
+    with override_options({"spans.buffer.max-flush-segments": 1}):
+        rv = buffer.flush_segments(now=11)
+
+    assert len(rv) == 3
+    assert buffer.shards_at_limit == {0, 1, 2}
+    assert buffer.any_shard_at_limit
+
+
+def test_server_side_assembly_limits_decompressed_size(buffer: SpansBuffer):
+    spans = [
+        Span(
+            payload=orjson.dumps({"span_id": span_id, "description": "x" * 1000}),
+            trace_id="a" * 32,
+            span_id=span_id,
+            parent_span_id=None if span_id == "a" * 16 else "a" * 16,
+            project_id=1,
+            is_segment_span=span_id == "a" * 16,
+            end_timestamp_precise=1700000000.0 + i,
+        )
+        for i, span_id in enumerate(["b" * 16, "c" * 16, "a" * 16])
+    ]
+
+    with override_options({"spans.buffer.compression.level": 3}):
+        for span in spans:
+            buffer.process_spans([span], now=0)
+
+    segment_key = _segment_id(1, "a" * 32, "a" * 16)
+    stored_bytes = sum(len(payload) for payload in buffer.client.zrange(segment_key, 0, -1))
+    assert stored_bytes < 1000
+
+    with override_options(
+        {
+            "spans.buffer.flusher.server-side-assembly": True,
+            "spans.buffer.segment-page-size": 1,
+            "spans.buffer.max-segment-bytes": stored_bytes,
+        }
+    ):
+        rv = buffer.flush_segments(now=11)
+
+    # The segment fits once stored, so it isn't trimmed in Redis, but it is skipped because it
+    # decompresses to more than the limit.
+    assert buffer.client.zcard(segment_key) == 3
+    assert rv[segment_key].spans == []
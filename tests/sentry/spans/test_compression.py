@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import glob
+import os
+
+import orjson
+import pytest
+import zstandard
+
+from sentry.spans.buffer import Span, SpansBuffer
+from sentry.spans.compression import (
+    CURRENT_DICTIONARY_KEY,
+    TRAINING_LOCK_KEY,
+    get_dictionary_key,
+)
+from sentry.testutils.factories import get_fixture_path
+from sentry.testutils.helpers.options import override_options
+from tests.sentry.spans.test_buffer import DEFAULT_OPTIONS, assert_clean, assert_ttls
+
+DICTIONARY_OPTIONS = {
+    **DEFAULT_OPTIONS,
+    "spans.buffer.compression.level": 3,
+    "spans.buffer.compression.dictionary.enabled": True,
+    "spans.buffer.compression.dictionary.sample-rate": 1.0,
+    "spans.buffer.compression.dictionary.min-samples": 200,
+    "spans.buffer.compression.dictionary.size": 16 * 1024,
+    "spans.buffer.max-flush-segments": 32 * 1000,
+}
+
+
+def load_corpus() -> list[Span]:
+    """
+    Spans of all performance problem fixtures, each trace as its own segment.
+    """
+    spans = []
+    pattern = os.path.join(get_fixture_path("events", "performance_problems"), "**", "*.json")
+    for i, path in enumerate(sorted(glob.glob(pattern, recursive=True))):
+        with open(path, "rb") as f:
+            event = orjson.loads(f.read())
+
+        trace_id = f"{i:0>32x}"
+        for span in event.get("spans") or ():
+            payload = {**span, "trace_id": trace_id}
+            spans.append(
+                Span(
+                    payload=orjson.dumps(payload),
+                    trace_id=trace_id,
+                    span_id=span["span_id"],
+                    parent_span_id=span.get("parent_span_id"),
+                    project_id=1,
+                    end_timestamp_precise=span["timestamp"],
+                )
+            )
+    return spans
+
+
+def _stored_bytes(buffer: SpansBuffer) -> int:
+    return sum(
+        len(payload)
+        for key in buffer.client.keys(b"span-buf:z:*")
+        for payload in buffer.client.zrange(key, 0, -1)
+    )
+
+
+def test_dictionary_roundtrip():
+    corpus = load_corpus()
+    training, rest = corpus[::2], corpus[1::2]
+
+    with override_options(DICTIONARY_OPTIONS):
+        buffer = SpansBuffer(assigned_shards=list(range(32)))
+
+        # The first batch is compressed without a dictionary, but trains one.
+        buffer.process_spans(training, now=0)
+        buffer.dictionaries.wait_for_training()
+        current = buffer.client.get(CURRENT_DICTIONARY_KEY)
+        assert current is not None
+        dict_id = int(current.split(b":")[0])
+
+        buffer.process_spans(rest, now=0)
+        payloads = [
+            payload
+            for key in buffer.client.keys(b"span-buf:z:*")
+            for payload in buffer.client.zrange(key, 0, -1)
+        ]
+        assert {zstandard.get_frame_parameters(p).dict_id for p in payloads} == {0, dict_id}
+        assert_ttls(buffer.client)
+
+        # A fresh buffer, like the one in a flusher process, loads the dictionary from Redis.
+        flusher_buffer = SpansBuffer(assigned_shards=list(range(32)))
+        segments = flusher_buffer.flush_segments(now=100)
+
+        flushed_span_ids = {
+            span.payload["span_id"] for segment in segments.values() for span in segment.spans
+        }
+        assert flushed_span_ids == {span.span_id for span in corpus}
+
+        flusher_buffer.done_flush_segments(segments)
+        buffer.client.delete(CURRENT_DICTIONARY_KEY, TRAINING_LOCK_KEY, get_dictionary_key(dict_id))
+        assert_clean(buffer.client)
+
+
+def test_samples_are_kept_until_training():
+    corpus = load_corpus()
+
+    with override_options(DICTIONARY_OPTIONS):
+        buffer = SpansBuffer(assigned_shards=list(range(32)))
+        dictionaries = buffer.dictionaries
+
+        # Another consumer is training, so the sample is kept for later.
+        buffer.client.set(TRAINING_LOCK_KEY, b"1")
+        dictionaries.sample(span.payload for span in corpus)
+        dictionaries.maybe_train()
+        assert dictionaries._training_thread is None
+        assert len(dictionaries._samples) == len(corpus)
+
+        buffer.client.delete(TRAINING_LOCK_KEY)
+        dictionaries.maybe_train()
+        dictionaries.wait_for_training()
+        assert dictionaries._samples == []
+        current = buffer.client.get(CURRENT_DICTIONARY_KEY)
+        assert current is not None
+
+        # Payloads are compressed without a dictionary if it went missing.
+        dict_id = int(current.split(b":")[0])
+        buffer.client.delete(get_dictionary_key(dict_id))
+        fresh = SpansBuffer(assigned_shards=list(range(32))).dictionaries
+        assert fresh.get_compressor(3) is None
+        assert fresh.get_decompressor(dict_id) is None
+
+        buffer.client.delete(CURRENT_DICTIONARY_KEY, TRAINING_LOCK_KEY)
+        assert_clean(buffer.client)
+
+
+@pytest.mark.parametrize("dictionary", [False, True], ids=["plain", "dictionary"])
+def test_benchmark_compression(dictionary, benchmark):
+    corpus = load_corpus()
+    training, rest = corpus[::2], corpus[1::2]
+
+    with override_options(
+        {**DICTIONARY_OPTIONS, "spans.buffer.compression.dictionary.enabled": dictionary}
+    ):
+        buffer = SpansBuffer(assigned_shards=list(range(32)))
+        buffer.process_spans(training, now=0)
+        buffer.dictionaries.wait_for_training()
+
+        def setup():
+            buffer.client.delete(*buffer.client.keys(b"span-buf:[zq]:*"))
+            return (), {}
+
+        benchmark.pedantic(lambda: buffer.process_spans(rest, now=0), setup=setup, rounds=10)
+
+        benchmark.extra_info["stored_bytes"] = _stored_bytes(buffer)
+        benchmark.extra_info["original_bytes"] = sum(len(span.payload) for span in rest)
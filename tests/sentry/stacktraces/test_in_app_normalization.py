@@ -59,6 +59,28 @@ class NormalizeStacktracesFroGroupingTest(TestCase):
         assert frames[0]["data"].get("client_in_app") is None
         assert frames[1]["data"].get("client_in_app") is None
 
+    def test_normalizes_repeated_frames(self):
+        frames = [
+            {
+                "function": "bar",
+                "filename": "/app/foo.js?v=1",
+                "in_app": False,
+                "data": {"orig_in_app": 1},
+            }
+            for _ in range(3)
+        ]
+        event_data = {"platform": "javascript", "stacktrace": {"frames": frames}}
+
+        normalize_stacktraces_for_grouping(
+            event_data, load_grouping_config(get_default_grouping_config_dict())
+        )
+
+        frames = event_data["stacktrace"]["frames"]
+        assert frames[0] == frames[1] == frames[2]
+        assert frames[0]["filename"] == "/app/foo.js"
+        # The client value is the one from before the previous enhancers run
+        assert frames[0]["data"]["client_in_app"] is True
+
 
 class NormalizeInApptest(TestCase):
     def test_changes_in_app_None_into_in_app_False(self):
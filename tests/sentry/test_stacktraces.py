@@ -1,11 +1,22 @@
 from __future__ import annotations
 
 from typing import Any
+from unittest import mock
 
 import pytest
 
-from sentry.stacktraces.processing import find_stacktraces_in_data, get_crash_frame_from_event_data
+from sentry.stacktraces.processing import (
+    FrameIndex,
+    StacktraceProcessor,
+    find_stacktraces_in_data,
+    get_crash_frame_from_event_data,
+    lookup_frame_cache,
+    process_stacktraces,
+)
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.cache import cache
+from sentry.utils.hashlib import hash_values
 
 
 class FindStacktracesTest(TestCase):
@@ -155,6 +166,51 @@ class FindStacktracesTest(TestCase):
         # XXX: The null frame is still part of this stack trace!
         assert len(infos[0].stacktrace["frames"]) == 3
 
+    def test_frame_index(self):
+        frame = {"function": "main", "platform": "native"}
+        raw_frame = {"function": "0x1234"}
+        data: dict[str, Any] = {
+            "platform": "cocoa",
+            "exception": {
+                "values": [
+                    {
+                        "type": "Error",
+                        "stacktrace": {"frames": [frame]},
+                        "raw_stacktrace": {"frames": [raw_frame]},
+                    },
+                    {"type": "Error", "stacktrace": None, "raw_stacktrace": {"frames": [frame]}},
+                ]
+            },
+            "threads": {"values": [{"stacktrace": {"frames": [raw_frame]}}]},
+        }
+        index = FrameIndex(data)
+
+        def _frames(infos):
+            return [info.stacktrace and info.stacktrace["frames"] for info in infos]
+
+        assert _frames(index.get_stacktrace_infos()) == [[frame], [raw_frame]]
+        assert _frames(index.get_stacktrace_infos(include_empty_exceptions=True)) == [
+            [frame],
+            None,
+            [raw_frame],
+        ]
+        assert _frames(index.get_stacktrace_infos(include_raw=True)) == [
+            [frame],
+            [raw_frame],
+            [raw_frame],
+        ]
+        assert _frames(
+            index.get_stacktrace_infos(include_raw=True, include_empty_exceptions=True)
+        ) == [[frame], None, [raw_frame], [raw_frame], [frame]]
+        assert index.platforms == {"native", "cocoa"}
+        assert index.crash_frames == [raw_frame]
+
+        for include_raw in (False, True):
+            for include_empty_exceptions in (False, True):
+                assert _frames(
+                    find_stacktraces_in_data(data, include_raw, include_empty_exceptions)
+                ) == _frames(index.get_stacktrace_infos(include_raw, include_empty_exceptions))
+
 
 @pytest.mark.parametrize(
     "event",
@@ -170,3 +226,72 @@ class FindStacktracesTest(TestCase):
 )
 def test_get_crash_frame(event):
     assert get_crash_frame_from_event_data(event)["marco"] == "polo"
+
+
+class CachingProcessor(StacktraceProcessor):
+    def handles_frame(self, frame, stacktrace_info):
+        return True
+
+    def preprocess_frame(self, processable_frame):
+        processable_frame.set_cache_key_from_values([processable_frame["function"]])
+
+    def process_frame(self, processable_frame, processing_task):
+        if processable_frame.cache_value is None:
+            processable_frame.set_cache_value({"function": processable_frame["function"].upper()})
+            return None
+        return [dict(processable_frame.frame, **processable_frame.cache_value)], None, None
+
+
+class FrameCacheTest(TestCase):
+    def _process(self) -> list[str]:
+        data = {
+            "platform": "native",
+            "stacktrace": {"frames": [{"function": "foo"}, {"function": "bar"}]},
+        }
+        process_stacktraces(
+            data,
+            make_processors=lambda data, infos: [
+                CachingProcessor(data, infos, project=self.project)
+            ],
+        )
+        return [frame["function"] for frame in data["stacktrace"]["frames"]]
+
+    @override_options({"processing.frame-cache.local-max-entries": 0})
+    def test_batched_lookups_and_writes(self):
+        with (
+            mock.patch.object(cache, "get_many", wraps=cache.get_many) as get_many,
+            mock.patch.object(cache, "set_many", wraps=cache.set_many) as set_many,
+        ):
+            assert self._process() == ["foo", "bar"]
+            assert get_many.call_count == 1
+            assert set_many.call_count == 1
+
+            assert self._process() == ["FOO", "BAR"]
+            assert get_many.call_count == 2
+            assert set_many.call_count == 1
+
+    @override_options({"processing.frame-cache.local-max-entries": 100})
+    @mock.patch("sentry.stacktraces.processing._local_frame_cache", None)
+    def test_local_frame_cache(self):
+        assert self._process() == ["foo", "bar"]
+
+        with mock.patch.object(cache, "get_many", side_effect=AssertionError):
+            assert self._process() == ["FOO", "BAR"]
+
+            # Values are copied out of the local cache
+            key = "pf:%s" % hash_values(["foo"], seed=CachingProcessor.__name__)
+            lookup_frame_cache([key])[key]["function"] = "changed"
+            assert lookup_frame_cache([key]) == {key: {"function": "FOO"}}
+
+    @override_options({"processing.frame-cache.local-max-entries": 0})
+    @mock.patch("sentry.stacktraces.processing.logger")
+    def test_failed_cache_write(self, mock_logger):
+        with mock.patch.object(cache, "set_many", side_effect=ConnectionError):
+            assert self._process() == ["foo", "bar"]
+        assert mock_logger.exception.call_count == 1
+
+    @override_options({"processing.frame-cache.local-max-entries": 0})
+    @mock.patch("sentry.stacktraces.processing.pickle")
+    def test_no_pickling_without_local_frame_cache(self, mock_pickle):
+        assert self._process() == ["foo", "bar"]
+        assert mock_pickle.dumps.call_count == 0
@@ -145,6 +145,11 @@ class RedisTSDBTest(TestCase):
         )
         assert sum_results == {1: 0, 2: 0}
 
+        with pytest.raises(NotImplementedError):
+            self.db.get_timeseries_sums(
+                TSDBModel.project, [1, 2], dts[0], dts[-1], conditions=[["tag", "=", "value"]]
+            )
+
         self.db.merge(TSDBModel.project, 1, [2], now, environment_ids=[0, 1, 2])
 
         results = self.db.get_range(TSDBModel.project, [1], dts[0], dts[-1])
@@ -191,6 +196,31 @@ class RedisTSDBTest(TestCase):
         )
         assert sum_results == {1: 0, 2: 0}
 
+    def test_get_range_matrix(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+
+        self.db.incr(TSDBModel.group, 1, dts[0])
+        self.db.incr(TSDBModel.group, 1, dts[3], count=2)
+        self.db.incr(TSDBModel.group, "foo", dts[1], count=3)
+        self.db.incr(TSDBModel.group, "foo", dts[1], environment_id=1)
+
+        matrix = self.db.get_range_matrix(TSDBModel.group, [1, "foo", 2, 1], dts[0], dts[-1])
+        assert matrix.keys == [1, "foo", 2]
+        assert matrix.shape == (3, 4)
+        assert list(matrix.row(0)) == [1, 0, 0, 2]
+        assert list(matrix.row(1)) == [0, 3, 0, 0]
+        assert list(matrix.row(2)) == [0, 0, 0, 0]
+        assert matrix.sums() == {1: 3, "foo": 3, 2: 0}
+        assert matrix.to_range() == self.db.get_range(
+            TSDBModel.group, [1, "foo", 2], dts[0], dts[-1]
+        )
+
+        matrix = self.db.get_range_matrix(
+            TSDBModel.group, [1, "foo"], dts[0], dts[-1], environment_id=1
+        )
+        assert matrix.sums() == {1: 0, "foo": 1}
+
     def test_count_distinct(self):
         now = datetime.now(timezone.utc) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
@@ -309,6 +339,56 @@ class RedisTSDBTest(TestCase):
         )
         assert results == {1: 0, 2: 0}
 
+    @override_options({"tsdb.redis.distinct-counts-union-ttl": 60})
+    def test_count_distinct_union_cache(self):
+        # Results must not change with cached unions, including after merges and deletes.
+        self.test_count_distinct()
+
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(3)]
+        model = TSDBModel.users_affected_by_group
+
+        self.db.record(model, 1, ("foo",), dts[0])
+        self.db.record(model, 1, ("bar",), dts[1])
+        assert self.db.get_distinct_counts_totals(model, [1], dts[0], dts[1], rollup=3600) == {1: 2}
+
+        # Late data in a closed bucket is not counted until the cached union expires.
+        self.db.record(model, 1, ("baz",), dts[0])
+        assert self.db.get_distinct_counts_totals(model, [1], dts[0], dts[1], rollup=3600) == {1: 2}
+
+        # Extending the range merges the cached union with the next bucket.
+        self.db.record(model, 1, ("qux",), dts[2])
+        assert self.db.get_distinct_counts_totals(model, [1], dts[0], dts[2], rollup=3600) == {1: 3}
+
+        self.db.delete_distinct_counts([model], [1], dts[0], dts[-1])
+        assert self.db.get_distinct_counts_totals(model, [1], dts[0], dts[2], rollup=3600) == {1: 0}
+
+    @override_options({"tsdb.redis.distinct-counts-union-ttl": 60})
+    def test_count_distinct_union_cache_expiry(self):
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(3)]
+        model = TSDBModel.users_affected_by_group
+        client = self.db.cluster.get_local_client_for_key(1)
+        _, series = self.db.get_optimal_rollup_series(dts[0], dts[2], 3600)
+
+        self.db.record(model, 1, ("foo",), dts[0])
+        self.db.get_distinct_counts_totals(model, [1], dts[0], dts[1], rollup=3600)
+        union_key, union_version_key = self.db.make_union_keys(
+            model, 3600, series[0], series[1], 1, None
+        )
+        assert client.pttl(union_key) > 10_000
+        client.pexpire(union_key, 10_000)
+        client.pexpire(union_version_key, 10_000)
+
+        # Reading a cached union does not keep it alive.
+        self.db.get_distinct_counts_totals(model, [1], dts[0], dts[1], rollup=3600)
+        assert 0 < client.pttl(union_key) <= 10_000
+
+        # A union built from the previous one expires with it.
+        self.db.get_distinct_counts_totals(model, [1], dts[0], dts[2], rollup=3600)
+        extended_key, _ = self.db.make_union_keys(model, 3600, series[0], series[2], 1, None)
+        assert 0 < client.pttl(extended_key) <= 10_000
+
     def test_frequency_tables(self):
         now = datetime.now(timezone.utc)
         model = TSDBModel.frequent_issues_by_project
@@ -649,3 +729,37 @@ class RedisTSDBTest(TestCase):
             [b"eta", b"7"],
             [b"bar", b"7"],
         ]
+
+
+@pytest.mark.parametrize("method", ["get_range", "get_range_matrix"])
+def test_benchmark_issue_list_page(method, benchmark):
+    """
+    Stats of one page of the issue list: 100 groups over 24 hourly buckets.
+    """
+    with override_options(
+        {"redis.clusters": {"tsdb": {"hosts": {i - 6: {"db": i} for i in range(6, 9)}}}}
+    ):
+        db = RedisTSDB(rollups=((ONE_HOUR, 24),), vnodes=64, cluster="tsdb")
+
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(hours=23)
+    groups = list(range(1, 101))
+    for hour in range(24):
+        db.incr_multi(
+            [(TSDBModel.group, group_id) for group_id in groups[hour::3]],
+            end - timedelta(hours=hour),
+        )
+
+    def get_range():
+        points = db.get_range(TSDBModel.group, groups, start, end, rollup=ONE_HOUR)
+        return {key: sum(count for _, count in series) for key, series in points.items()}
+
+    def get_range_matrix():
+        return db.get_range_matrix(TSDBModel.group, groups, start, end, rollup=ONE_HOUR).sums()
+
+    try:
+        sums = benchmark(get_range if method == "get_range" else get_range_matrix)
+        assert sum(sums.values()) == sum(len(groups[hour::3]) for hour in range(24))
+    finally:
+        with db.cluster.all() as client:
+            client.flushdb()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Sequence
+from typing import Any
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from snuba_sdk import Column, Condition, Entity, Op, Query, Request
+
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.utils import snuba_query_cache
+from sentry.utils.snuba import SnubaRequest, get_cache_key
+from sentry.utils.snuba_query_cache import CachePolicy
+
+
+@pytest.fixture(autouse=True)
+def clear_flights():
+    snuba_query_cache.clear()
+    yield
+    snuba_query_cache.clear()
+
+
+def _make_request(project_id: int, referrer: str = "search") -> SnubaRequest:
+    return SnubaRequest(
+        request=Request(
+            dataset="events",
+            app_id="tests",
+            query=Query(
+                Entity("events"),
+                select=[Column("event_id")],
+                where=[Condition(Column("project_id"), Op.EQ, project_id)],
+            ),
+            tenant_ids={"referrer": referrer, "organization_id": 1},
+        ),
+        referrer=referrer,
+        forward=lambda x: x,
+        reverse=lambda x: x,
+    )
+
+
+class SnubaQueryCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.queried: list[int] = []
+
+    def _query(self, snuba_requests: Sequence[SnubaRequest]) -> list[dict[str, Any]]:
+        results = []
+        for snuba_request in snuba_requests:
+            self.queried.append(snuba_request.request.query.where[0].rhs)
+            results.append({"data": [{"version": len(self.queried)}]})
+        return results
+
+    def _get_results(self, snuba_requests: list[SnubaRequest]) -> list[Any]:
+        cache_keys = [get_cache_key(snuba_request.request) for snuba_request in snuba_requests]
+        results = snuba_query_cache.get_results(snuba_requests, cache_keys, self._query)
+        return [result["data"][0]["version"] for result in results]
+
+    def test_results_are_cached(self) -> None:
+        assert self._get_results([_make_request(1), _make_request(2)]) == [1, 2]
+        assert self._get_results([_make_request(2), _make_request(3), _make_request(1)]) == [
+            2,
+            3,
+            1,
+        ]
+        assert self.queried == [1, 2, 3]
+
+    @override_options(
+        {"snuba.query-cache.referrer-policies": {"search": {"ttl": 0, "stale_ttl": 60}}}
+    )
+    def test_stale_results_are_refreshed_once(self) -> None:
+        snuba_request = _make_request(1)
+        refresh_lock_key = f"{get_cache_key(snuba_request.request)}:refresh"
+
+        assert self._get_results([snuba_request]) == [1]
+
+        # Another caller is refreshing the result, so the stale one is served
+        assert cache.add(refresh_lock_key, 1)
+        assert self._get_results([snuba_request]) == [1]
+        assert self.queried == [1]
+
+        cache.delete(refresh_lock_key)
+        assert self._get_results([snuba_request]) == [2]
+        assert self.queried == [1, 1]
+        assert cache.get(refresh_lock_key) is None
+
+    @override_options({"snuba.query-cache.single-flight.enabled": True})
+    def test_concurrent_queries_are_coalesced(self) -> None:
+        querying = threading.Event()
+        release = threading.Event()
+
+        def query(snuba_requests: Sequence[SnubaRequest]) -> list[dict[str, Any]]:
+            querying.set()
+            release.wait(5)
+            return self._query(snuba_requests)
+
+        snuba_request = _make_request(1)
+        cache_keys = [get_cache_key(snuba_request.request)]
+        results = []
+
+        def get() -> None:
+            results.append(snuba_query_cache.get_results([snuba_request], cache_keys, query))
+
+        waiting = threading.Event()
+
+        class Flight(snuba_query_cache._Flight):
+            def __init__(self) -> None:
+                super().__init__()
+                wait = self.done.wait
+
+                def wait_for_flight(timeout: float | None = None) -> bool:
+                    waiting.set()
+                    return wait(timeout)
+
+                self.done.wait = wait_for_flight  # type: ignore[method-assign]
+
+        with mock.patch.object(snuba_query_cache, "_Flight", Flight):
+            first = threading.Thread(target=get)
+            first.start()
+            querying.wait(5)
+
+            # Only let the first query finish once the second caller waits for it
+            second = threading.Thread(target=get)
+            second.start()
+            waiting.wait(5)
+            release.set()
+        first.join()
+        second.join()
+
+        assert self.queried == [1]
+        assert results == [[{"data": [{"version": 1}]}], [{"data": [{"version": 1}]}]]
+
+    @override_options(
+        {
+            "snuba.query-cache.stale-ttl-seconds": 30,
+            "snuba.query-cache.referrer-policies": {"search": {"ttl": 300}},
+        }
+    )
+    def test_get_policy(self) -> None:
+        assert snuba_query_cache.get_policy("search") == CachePolicy(ttl=300, stale_ttl=30)
+        assert snuba_query_cache.get_policy(None) == CachePolicy(ttl=60, stale_ttl=30)
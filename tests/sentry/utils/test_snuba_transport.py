@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+
+from sentry.testutils.helpers.options import override_options
+from sentry.utils import json
+from sentry.utils.snuba import SnubaRequest, _snuba_query_async
+from sentry.utils.snuba_transport import AsyncTransport, DeadlineExceeded, HttpRequest
+
+
+class SnubaStub(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), SnubaStubHandler)
+        self.lock = threading.Lock()
+        self.in_flight: dict[str, int] = defaultdict(int)
+        self.max_in_flight: dict[str, int] = defaultdict(int)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+
+class SnubaStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: SnubaStub
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        referrer = self.headers["referer"]
+        body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+        with self.server.lock:
+            self.server.in_flight[referrer] += 1
+            self.server.max_in_flight[referrer] = max(
+                self.server.max_in_flight[referrer], self.server.in_flight[referrer]
+            )
+        try:
+            time.sleep(body.get("sleep", 0))
+        finally:
+            with self.server.lock:
+                self.server.in_flight[referrer] -= 1
+
+        response = json.dumps({"data": [{"path": self.path, "id": body["id"]}]}).encode()
+        self.send_response(body.get("status", 200))
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+@pytest.fixture
+def snuba_stub() -> Generator[SnubaStub, None, None]:
+    server = SnubaStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _make_request(id: int, referrer: str = "search", **kwargs: object) -> HttpRequest:
+    return HttpRequest(
+        method="POST",
+        path="/events/snql",
+        body=json.dumps({"id": id, **kwargs}),
+        headers={"referer": referrer},
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_request(snuba_stub: SnubaStub) -> None:
+    transport = AsyncTransport(snuba_stub.url)
+    responses = transport.bulk_request(
+        [_make_request(1, sleep=0.2), _make_request(2), _make_request(3, status=429)]
+    )
+
+    assert [json.loads(response.data)["data"][0]["id"] for response in responses] == [1, 2, 3]
+    assert [response.status for response in responses] == [200, 200, 429]
+
+
+@pytest.mark.django_db
+@override_options({"snuba.async-transport.max-concurrent-per-referrer": 2})
+def test_concurrency_is_capped_per_referrer(snuba_stub: SnubaStub) -> None:
+    transport = AsyncTransport(snuba_stub.url)
+    responses = transport.bulk_request(
+        [_make_request(i, sleep=0.1) for i in range(6)]
+        + [_make_request(i, referrer="other", sleep=0.1) for i in range(3)]
+    )
+
+    assert len(responses) == 9
+    assert snuba_stub.max_in_flight == {"search": 2, "other": 2}
+
+
+@pytest.mark.django_db
+def test_deadline(snuba_stub: SnubaStub) -> None:
+    transport = AsyncTransport(snuba_stub.url)
+    with pytest.raises(DeadlineExceeded):
+        transport.bulk_request([_make_request(1), _make_request(2, sleep=2)], timeout=0.5)
+
+    # The transport is still usable after a request was cancelled
+    (response,) = transport.bulk_request([_make_request(3)])
+    assert json.loads(response.data)["data"][0]["id"] == 3
+
+
+@mock.patch("sentry.utils.snuba.SNUBA_INFO", True)
+@mock.patch("sentry.utils.snuba.log_snuba_info")
+@mock.patch("sentry.utils.snuba.sentry_sdk.set_tag")
+@mock.patch("sentry.utils.snuba.snuba_transport.get_transport")
+def test_async_queries_are_prepared(
+    get_transport: mock.MagicMock, set_tag: mock.MagicMock, log_snuba_info: mock.MagicMock
+) -> None:
+    request = mock.MagicMock()
+    # Requests must have their debug flag set by the time they are serialized
+    request.serialize.side_effect = lambda: json.dumps({"debug": request.flags.debug})
+    response = mock.MagicMock()
+    get_transport.return_value.bulk_request.return_value = [response]
+
+    (result,) = _snuba_query_async(
+        [SnubaRequest(request=request, referrer=None, forward=lambda x: x, reverse=lambda x: x)]
+    )
+
+    assert result[:2] == ("unknown", response)
+    (http_request,) = get_transport.return_value.bulk_request.call_args[0][0]
+    assert json.loads(http_request.body) == {"debug": True}
+    set_tag.assert_called_with("query.referrer", "unknown")
+    assert log_snuba_info.call_count == 1